@@ -0,0 +1,100 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Copyright: See the LICENSE file.
+
+"""Measure the import time of factory_boy and its integrations.
+
+Each module is imported in a fresh interpreter, through ``python -X importtime``
+(Python 3.7+); the best of several runs is reported.
+
+Usage:
+    python benchmarks/importtime.py [--runs 5] [--budget 30] [module ...]
+"""
+
+from __future__ import print_function
+
+import argparse
+import os
+import subprocess
+import sys
+
+
+DEFAULT_MODULES = [
+    'factory',
+    'factory.alchemy',
+    'factory.django',
+    'factory.faker',
+    'factory.fuzzy',
+    'factory.mogo',
+    'factory.mongoengine',
+]
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def measure(module, runs):
+    """Return the best import time of a module and its dependencies, in microseconds.
+
+    This excludes the imports performed at interpreter startup.
+    """
+    return run_importtime('import %s' % module, runs) - run_importtime('pass', runs)
+
+
+def run_importtime(code, runs):
+    """Return the best total import time when running some code, in microseconds."""
+    timings = []
+    for _i in range(runs):
+        process = subprocess.Popen(
+            [sys.executable, '-X', 'importtime', '-c', code],
+            cwd=ROOT_DIR,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+        )
+        _stdout, stderr = process.communicate()
+        if process.returncode:
+            raise RuntimeError("Unable to run %r:\n%s" % (code, stderr.decode()))
+        timings.append(parse_importtime(stderr.decode()))
+    return min(timings)
+
+
+def parse_importtime(output):
+    """Compute the total import time from -X importtime output.
+
+    This is the sum of the cumulative times of all top-level imports,
+    i.e those which aren't nested within another import.
+    """
+    total = 0
+    for line in output.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        _self, cumulative, name = line[len('import time:'):].split('|')
+        # Nested imports are indented by 2 spaces per level.
+        if cumulative.strip().isdigit() and not name[1:].startswith(' '):
+            total += int(cumulative)
+    return total
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('modules', nargs='*', default=DEFAULT_MODULES, help="Modules to import")
+    parser.add_argument('--runs', type=int, default=5, help="Number of imports per module")
+    parser.add_argument('--budget', type=float, help="Fail if 'import factory' takes more milliseconds")
+    args = parser.parse_args(argv)
+
+    if sys.version_info < (3, 7):
+        parser.error("-X importtime requires Python 3.7+")
+
+    results = {}
+    for module in args.modules:
+        results[module] = measure(module, args.runs)
+        print("%-25s %8.1f ms" % (module, results[module] / 1000.0))
+
+    if args.budget is not None and 'factory' in results:
+        if results['factory'] > args.budget * 1000:
+            print("'import factory' exceeds its %.1f ms budget." % args.budget, file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,353 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Copyright: See the LICENSE file.
+
+"""Measure the throughput of factory_boy on a set of representative factories.
+
+Each scenario is timed through ``timeit``; the best of several runs is reported,
+as microseconds per call.
+Results can be saved to ``benchmarks/results/<version>.json``, and compared with
+those of a previous release: slowdowns above the threshold are flagged as
+regressions.
+
+Usage:
+    python benchmarks/throughput.py [--repeat 5] [--save] [--compare 2.9.2] [scenario ...]
+"""
+
+from __future__ import print_function
+
+import argparse
+import collections
+import datetime
+import json
+import os
+import platform
+import sys
+import time
+import timeit
+
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(ROOT_DIR, 'benchmarks', 'results')
+
+# Run the benchmarks against the checked-out tree.
+sys.path.insert(0, ROOT_DIR)
+
+import factory  # noqa: E402
+from factory import fuzzy  # noqa: E402
+
+
+# Minimal duration of a timed run, in seconds.
+MIN_DURATION = 0.2
+
+# Slowdown ratio above which a scenario is reported as a regression.
+DEFAULT_THRESHOLD = 1.2
+
+
+SCENARIOS = collections.OrderedDict()
+
+
+def scenario(name):
+    """Register a scenario.
+
+    The decorated function performs the setup, and returns the callable to time.
+    """
+    def decorator(setup):
+        SCENARIOS[name] = setup
+        return setup
+    return decorator
+
+
+class Object(object):
+    def __init__(self, **kwargs):
+        for key, value in kwargs.items():
+            setattr(self, key, value)
+
+
+class FlatFactory(factory.Factory):
+    class Meta:
+        model = Object
+
+    one = 1
+    two = 'two'
+    three = factory.Sequence(lambda n: n)
+    four = factory.LazyAttribute(lambda o: o.three * 2)
+    five = factory.SelfAttribute('two')
+
+
+@scenario('flat.build')
+def flat_build():
+    return FlatFactory.build
+
+
+@scenario('flat.create')
+def flat_create():
+    return FlatFactory.create
+
+
+@scenario('flat.stub')
+def flat_stub():
+    return FlatFactory.stub
+
+
+@scenario('flat.build_batch')
+def flat_build_batch():
+    return lambda: FlatFactory.build_batch(100)
+
+
+@scenario('subfactory.deep')
+def subfactory_deep():
+    class Level0Factory(FlatFactory):
+        pass
+
+    deepest = Level0Factory
+    for _i in range(5):
+        deepest = type(str('LevelFactory'), (FlatFactory,), {'child': factory.SubFactory(deepest)})
+    return deepest.build
+
+
+@scenario('traits')
+def traits():
+    class TraitFactory(FlatFactory):
+        class Params:
+            alpha = factory.Trait(one=10, two='alpha')
+            beta = factory.Trait(alpha=True, six=factory.LazyAttribute(lambda o: o.one + 1))
+            gamma = factory.Trait(three=factory.Sequence(lambda n: -n))
+            delta = factory.Trait(gamma=True, seven=factory.SelfAttribute('three'))
+            epsilon = factory.Trait(eight=8, nine=9, ten=10)
+
+    return lambda: TraitFactory.build(beta=True, delta=True, epsilon=True)
+
+
+@scenario('related.fanout')
+def related_fanout():
+    class ChildFactory(factory.Factory):
+        class Meta:
+            model = Object
+
+        name = factory.Sequence(lambda n: 'child%d' % n)
+        parent = None
+
+    related = {
+        'child%d' % i: factory.RelatedFactory(ChildFactory, 'parent')
+        for i in range(5)
+    }
+    ParentFactory = type(str('ParentFactory'), (FlatFactory,), related)
+    return ParentFactory.create
+
+
+@scenario('containers')
+def containers():
+    class ContainerFactory(FlatFactory):
+        mapping = factory.Dict({
+            'a': 1,
+            'b': factory.Sequence(lambda n: n),
+            'c': factory.SelfAttribute('..two'),
+        })
+        items = factory.List([
+            factory.Sequence(lambda n: n),
+            factory.Dict({'x': 1, 'y': 2}),
+            factory.List([1, 2, 3]),
+        ])
+
+    return ContainerFactory.build
+
+
+class FuzzyFactory(factory.Factory):
+    class Meta:
+        model = Object
+
+    text = fuzzy.FuzzyText(length=20)
+    integer = fuzzy.FuzzyInteger(0, 1000)
+    decimal = fuzzy.FuzzyDecimal(0, 1000)
+    float = fuzzy.FuzzyFloat(0, 1000)
+    choice = fuzzy.FuzzyChoice(['a', 'b', 'c', 'd'])
+    date = fuzzy.FuzzyDate(datetime.date(2000, 1, 1))
+
+
+@scenario('fuzzy')
+def fuzzy_build():
+    return FuzzyFactory.build
+
+
+@scenario('fuzzy.build_batch')
+def fuzzy_build_batch():
+    return lambda: FuzzyFactory.build_batch(100)
+
+
+@scenario('faker')
+def faker_build():
+    class FakerFactory(factory.Factory):
+        class Meta:
+            model = Object
+
+        name = factory.Faker('name')
+        email = factory.Faker('email')
+        address = factory.Faker('address')
+        date = factory.Faker('date_object')
+
+    return FakerFactory.build
+
+
+@scenario('django.create')
+def django_create():
+    factory_class = _setup_django()
+    return factory_class.create
+
+
+@scenario('django.create_batch')
+def django_create_batch():
+    factory_class = _setup_django()
+    return lambda: factory_class.create_batch(100)
+
+
+@scenario('alchemy.create')
+def alchemy_create():
+    factory_class = _setup_alchemy()
+    return factory_class.create
+
+
+@scenario('alchemy.create_batch')
+def alchemy_create_batch():
+    factory_class = _setup_alchemy()
+    return lambda: factory_class.create_batch(100)
+
+
+def _setup_django():
+    """Set up the test Django project on an in-memory SQLite database."""
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'tests.djapp.settings')
+    import django
+    from django.test import runner as django_test_runner
+    import factory.django
+
+    if not hasattr(_setup_django, 'done'):
+        django.setup()
+        django_test_runner.DiscoverRunner(verbosity=0).setup_databases()
+        _setup_django.done = True
+
+    from tests.djapp import models
+
+    class StandardFactory(factory.django.DjangoModelFactory):
+        class Meta:
+            model = models.StandardModel
+
+        foo = factory.Sequence(lambda n: 'foo%d' % n)
+
+    return StandardFactory
+
+
+def _setup_alchemy():
+    """Set up the test SQLAlchemy models on an in-memory SQLite database."""
+    import factory.alchemy
+    from tests.alchemyapp import models
+
+    class StandardFactory(factory.alchemy.SQLAlchemyModelFactory):
+        class Meta:
+            model = models.StandardModel
+            sqlalchemy_session = models.session
+            sqlalchemy_session_persistence = 'commit'
+
+        foo = factory.Sequence(lambda n: 'foo%d' % n)
+
+    return StandardFactory
+
+
+def measure(function, repeat):
+    """Return the best and mean durations of a call to function, in seconds."""
+    timer = timeit.Timer(function)
+    number = 1
+    while True:
+        duration = timer.timeit(number)
+        if duration >= MIN_DURATION:
+            break
+        number *= 10 if duration < MIN_DURATION / 10 else 2
+    timings = [duration / number for duration in timer.repeat(repeat, number)]
+    return {
+        'best': min(timings),
+        'mean': sum(timings) / len(timings),
+        'number': number,
+        'repeat': repeat,
+    }
+
+
+def load_results(reference):
+    """Load results from a version number (within RESULTS_DIR) or a path."""
+    path = reference
+    if not os.path.exists(path):
+        path = os.path.join(RESULTS_DIR, '%s.json' % reference)
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_results(results):
+    if not os.path.isdir(RESULTS_DIR):
+        os.makedirs(RESULTS_DIR)
+    path = os.path.join(RESULTS_DIR, '%s.json' % factory.__version__)
+    with open(path, 'w') as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+        f.write('\n')
+    return path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('scenarios', nargs='*', help="Scenarios to run (prefixes); defaults to all of them")
+    parser.add_argument('--repeat', type=int, default=5, help="Number of timed runs per scenario")
+    parser.add_argument('--list', action='store_true', help="List available scenarios")
+    parser.add_argument('--save', action='store_true', help="Save results to %s/<version>.json" % RESULTS_DIR)
+    parser.add_argument('--compare', metavar='VERSION', help="Compare with saved results (version or path)")
+    parser.add_argument(
+        '--threshold', type=float, default=DEFAULT_THRESHOLD,
+        help="Slowdown ratio reported as a regression (default: %(default)s)",
+    )
+    args = parser.parse_args(argv)
+
+    if args.list:
+        for name in SCENARIOS:
+            print(name)
+        return 0
+
+    names = [
+        name for name in SCENARIOS
+        if not args.scenarios or any(name.startswith(prefix) for prefix in args.scenarios)
+    ]
+    reference = load_results(args.compare)['results'] if args.compare else {}
+
+    results = collections.OrderedDict()
+    regressions = []
+    for name in names:
+        try:
+            function = SCENARIOS[name]()
+        except ImportError as e:
+            print("%-25s skipped (%s)" % (name, e))
+            continue
+
+        results[name] = measure(function, args.repeat)
+        line = "%-25s %10.1f us" % (name, results[name]['best'] * 1e6)
+        if name in reference:
+            ratio = results[name]['best'] / reference[name]['best']
+            line += "  x%.2f vs %s" % (ratio, args.compare)
+            if ratio > args.threshold:
+                line += "  REGRESSION"
+                regressions.append(name)
+        print(line)
+
+    if args.save:
+        path = save_results({
+            'version': factory.__version__,
+            'python': platform.python_version(),
+            'implementation': platform.python_implementation(),
+            'platform': platform.platform(),
+            'date': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+            'results': results,
+        })
+        print("Results saved to %s" % path)
+
+    if regressions:
+        print("Regressions: %s" % ', '.join(regressions), file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
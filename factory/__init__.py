@@ -45,6 +45,7 @@ from .declarations import (
 
 from .helpers import (
     debug,
+    profile,
 
     build,
     create,
@@ -68,15 +69,37 @@ from .helpers import (
 )
 
 # Backward compatibility; this should be removed soon.
-from . import alchemy
-from . import django
-from . import mogo
-from . import mongoengine
-
-
-__version__ = '2.9.3.dev0'
+# Where possible (Python 3.7+), those modules are only loaded on first access.
+import sys as _sys
+
+_LAZY_SUBMODULES = ('alchemy', 'django', 'mogo', 'mongoengine')
+_LAZY_ATTRIBUTES = {
+    'MogoFactory': ('mogo', 'MogoFactory'),
+    'DjangoModelFactory': ('django', 'DjangoModelFactory'),
+}
+
+if _sys.version_info >= (3, 7):
+    def __getattr__(name):
+        import importlib
+        if name in _LAZY_SUBMODULES:
+            return importlib.import_module('.' + name, __name__)
+        if name in _LAZY_ATTRIBUTES:
+            module_name, attribute = _LAZY_ATTRIBUTES[name]
+            return getattr(importlib.import_module('.' + module_name, __name__), attribute)
+        raise AttributeError("module %r has no attribute %r" % (__name__, name))
+
+    def __dir__():
+        return sorted(set(globals()) | set(_LAZY_SUBMODULES) | set(_LAZY_ATTRIBUTES))
+
+else:  # pragma: no cover
+    from . import alchemy
+    from . import django
+    from . import mogo
+    from . import mongoengine
+
+    MogoFactory = mogo.MogoFactory
+    DjangoModelFactory = django.DjangoModelFactory
+
+
+__version__ = '2.10.0.dev0'
 __author__ = 'Raphaël Barrois <raphael.barrois+fboy@polytechnique.org>'
-
-
-MogoFactory = mogo.MogoFactory
-DjangoModelFactory = django.DjangoModelFactory
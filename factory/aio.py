@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+# Copyright: See the LICENSE file.
+
+
+"""Create objects from asyncio code, e.g with asynchronous ORM sessions.
+
+Used by Factory.acreate() and Factory.acreate_batch(): declarations are
+resolved as usual, within a worker thread of the event loop's executor, so
+that the loop keeps running meanwhile.  Whenever a factory's ``_acreate()``,
+a post-generation declaration or ``_after_postgeneration()`` returns an
+awaitable, the worker thread hands it over to the event loop, and waits for
+its result.
+
+This module requires Python 3.5+.
+"""
+
+import asyncio
+import functools
+
+try:  # pragma: no cover
+    # Python >= 3.7
+    import contextvars
+except ImportError:  # pragma: no cover
+    contextvars = None
+
+from . import builder
+from . import compat
+from . import enums
+from . import errors
+
+
+# Python >= 3.7
+_get_running_loop = getattr(asyncio, 'get_running_loop', asyncio.get_event_loop)
+
+
+class AsyncStepBuilder(builder.StepBuilder):
+    """A StepBuilder running in a worker thread, on behalf of an event loop.
+
+    Attributes:
+    - loop: the event loop awaitables are run on
+    """
+    def __init__(self, factory_meta, extras, strategy, loop):
+        super(AsyncStepBuilder, self).__init__(factory_meta, extras, strategy)
+        self.loop = loop
+
+    def instantiate(self, step, args, kwargs):
+        if self.strategy != enums.CREATE_STRATEGY:
+            return super(AsyncStepBuilder, self).instantiate(step, args, kwargs)
+        model = self.factory_meta.get_model_class()
+        return self.complete(self.factory_meta.factory._acreate(model, *args, **kwargs))
+
+    def complete(self, value):
+        if not compat.is_awaitable(value):
+            return value
+        return asyncio.run_coroutine_threadsafe(_wait(value), self.loop).result()
+
+    def recurse(self, factory_meta, extras):
+        return self.__class__(factory_meta, extras, strategy=self.strategy, loop=self.loop)
+
+
+async def _wait(awaitable):
+    return await awaitable
+
+
+async def add(session, obj, persist=None):
+    """Add obj to an asyncio session, then await persist() if set.
+
+    Runs on the event loop: session proxies such as async_scoped_session
+    can't be used from a worker thread.
+    """
+    session.add(obj)
+    if persist is not None:
+        await persist()
+    return obj
+
+
+async def within(context, awaitable):
+    """Await an awaitable within a context manager, e.g mute_signals()."""
+    with context:
+        return await awaitable
+
+
+async def run_sync(function, *args):
+    """Call a synchronous function within a worker thread of the event loop's executor."""
+    loop = _get_running_loop()
+    call = functools.partial(function, *args)
+    if contextvars is not None:
+        # Context variables (e.g the current session) remain visible to
+        # the worker thread, and to the awaitables it hands over.
+        call = functools.partial(contextvars.copy_context().run, call)
+    return await loop.run_in_executor(None, call)
+
+
+def _check_abstract(factory_class):
+    if factory_class._meta.abstract:
+        raise errors.FactoryError(
+            "Cannot generate instances of abstract factory %(f)s; "
+            "Ensure %(f)s.Meta.model is set and %(f)s.Meta.abstract "
+            "is either not set or False." % dict(f=factory_class.__name__))
+
+
+def _create(factory_class, params, loop):
+    """Create an object; run within a worker thread."""
+    _check_abstract(factory_class)
+    step = AsyncStepBuilder(factory_class._meta, params, enums.CREATE_STRATEGY, loop=loop)
+    return step.build()
+
+
+async def generate(factory_class, params):
+    """Create an object without blocking the running event loop.
+
+    Args:
+        factory_class (factory.Factory): the factory to use
+        params (dict): attributes to use for generating the object
+    """
+    return await run_sync(_create, factory_class, params, _get_running_loop())
+
+
+async def generate_batch(factory_class, size, params):
+    """Create a batch of objects, at most ``Meta.async_concurrency`` at a time.
+
+    Sequence numbers are reserved upfront: they follow the order of the
+    returned list, whatever the order in which objects get created.
+
+    Args:
+        factory_class (factory.Factory): the factory to use
+        size (int): the number of objects to create
+        params (dict): attributes to use for generating the objects
+    """
+    _check_abstract(factory_class)
+    if '__sequence' in params:
+        sequences = [params['__sequence']] * size
+    else:
+        sequences = factory_class._meta.reserve_sequences(size)
+
+    semaphore = asyncio.Semaphore(factory_class._meta.async_concurrency)
+
+    async def create(sequence):
+        async with semaphore:
+            return await generate(factory_class, dict(params, __sequence=sequence))
+
+    return list(await asyncio.gather(*[create(sequence) for sequence in sequences]))
+
+
+async def generate_each(factory_class, size, params):
+    """Create a batch of objects through separate calls to factory_class.acreate()."""
+    objs = []
+    for _i in range(size):
+        objs.append(await factory_class.acreate(**params))
+    return objs
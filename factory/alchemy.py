@@ -4,6 +4,9 @@
 from __future__ import unicode_literals
 
 from . import base
+from . import compat
+from . import enums
+import threading
 import warnings
 
 SESSION_PERSISTENCE_COMMIT = 'commit'
@@ -15,6 +18,74 @@ VALID_SESSION_PERSISTENCE_TYPES = [
 ]
 
 
+_deferrals = threading.local()
+
+
+def _get_deferral(session):
+    """Find the innermost active deferred_persistence() for a session, if any."""
+    for deferral in reversed(getattr(_deferrals, 'stack', [])):
+        if deferral.session is session:
+            return deferral
+    return None
+
+
+class deferred_persistence(object):
+    """Defer the flush/commit of SQLAlchemy factories to the end of a block.
+
+    Within the block, factories using the given session don't flush or commit
+    it after each object; the strongest persistence they requested ('commit',
+    then 'flush') is applied once, when leaving the block without an error.
+
+    Args:
+        session: the session whose persistence should be deferred; it must be
+            the same object as the factories' ``sqlalchemy_session``.
+
+    Examples:
+        with deferred_persistence(session):
+            user = UserFactory()
+            GroupFactory.create_batch(3, owner=user)
+    """
+
+    def __init__(self, session):
+        self.session = session
+        self.persistence = None
+
+    def request(self, session_persistence):
+        """Record that a factory asked for the given persistence."""
+        if session_persistence == SESSION_PERSISTENCE_COMMIT or self.persistence is None:
+            self.persistence = session_persistence
+
+    def __enter__(self):
+        self.outer = _get_deferral(self.session)
+        self.persistence = None
+        if not hasattr(_deferrals, 'stack'):
+            _deferrals.stack = []
+        _deferrals.stack.append(self)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        _deferrals.stack.remove(self)
+        if exc_type is not None:
+            return
+
+        if self.outer is not None:
+            # Nested block: leave it to the outer one.
+            self.outer.request(self.persistence)
+        elif self.persistence == SESSION_PERSISTENCE_FLUSH:
+            self.session.flush()
+        elif self.persistence == SESSION_PERSISTENCE_COMMIT:
+            self.session.commit()
+
+
+def _get_relationships(model_class):
+    """List the names of the relationships of a mapped class."""
+    import sqlalchemy
+    mapper = sqlalchemy.inspect(model_class, raiseerr=False)
+    if mapper is None:
+        return set()
+    return set(mapper.relationships.keys())
+
+
 class SQLAlchemyOptions(base.FactoryOptions):
     def _check_sqlalchemy_session_persistence(self, meta, value):
         if value not in VALID_SESSION_PERSISTENCE_TYPES:
@@ -23,6 +94,11 @@ class SQLAlchemyOptions(base.FactoryOptions):
                 (meta, VALID_SESSION_PERSISTENCE_TYPES, value)
             )
 
+    def _check_sqlalchemy_batch_size(self, meta, value):
+        if value is not None and (isinstance(value, bool) or not isinstance(value, int) or value <= 0):
+            raise TypeError(
+                "%s.sqlalchemy_batch_size must be None or a positive integer, got %r" % (meta, value))
+
     def _check_force_flush(self, meta, value):
         if value:
             warnings.warn(
@@ -46,6 +122,14 @@ class SQLAlchemyOptions(base.FactoryOptions):
                 checker=self._check_sqlalchemy_session_persistence,
             ),
 
+            base.OptionDefault(
+                'sqlalchemy_batch_size',
+                None,
+                inherit=True,
+                checker=self._check_sqlalchemy_batch_size,
+            ),
+            base.OptionDefault('sqlalchemy_bulk_save', False, inherit=True),
+
             # DEPRECATED as of 2.8.0, remove in 3.0.0
             base.OptionDefault(
                 'force_flush',
@@ -55,6 +139,19 @@ class SQLAlchemyOptions(base.FactoryOptions):
             ),
         ]
 
+    def instantiate_batch(self, steps, arguments):
+        if (not steps or steps[0].builder.strategy != enums.CREATE_STRATEGY
+                or base.is_overridden(self.factory, SQLAlchemyModelFactory, '_create_batch')):
+            return super(SQLAlchemyOptions, self).instantiate_batch(steps, arguments)
+
+        # Call-time post-generation declarations count as well.
+        _pre, post, _plan = self.prepare_declarations(steps[0].builder.extras)
+        return self.factory._save_batch(
+            self.get_model_class(),
+            arguments,
+            bulk_save=self.sqlalchemy_bulk_save and not list(post),
+        )
+
 
 class SQLAlchemyModelFactory(base.Factory):
     """Factory for SQLAlchemy models. """
@@ -65,19 +162,98 @@ class SQLAlchemyModelFactory(base.Factory):
         abstract = True
 
     @classmethod
-    def _create(cls, model_class, *args, **kwargs):
-        """Create an instance of the model, and save it to the database."""
+    def _get_session(cls):
         session = cls._meta.sqlalchemy_session
-        session_persistence = cls._meta.sqlalchemy_session_persistence
-        if cls._meta.force_flush:
-            session_persistence = SESSION_PERSISTENCE_FLUSH
-
-        obj = model_class(*args, **kwargs)
         if session is None:
             raise RuntimeError("No session provided.")
-        session.add(obj)
-        if session_persistence == SESSION_PERSISTENCE_FLUSH:
+        return session
+
+    @classmethod
+    def _get_session_persistence(cls):
+        if cls._meta.force_flush:
+            return SESSION_PERSISTENCE_FLUSH
+        return cls._meta.sqlalchemy_session_persistence
+
+    @classmethod
+    def _persist(cls, session, session_persistence):
+        deferral = _get_deferral(session)
+        if deferral is not None:
+            deferral.request(session_persistence)
+        elif session_persistence == SESSION_PERSISTENCE_FLUSH:
             session.flush()
         elif session_persistence == SESSION_PERSISTENCE_COMMIT:
             session.commit()
+
+    @classmethod
+    def _create(cls, model_class, *args, **kwargs):
+        """Create an instance of the model, and save it to the database."""
+        session = cls._get_session()
+        obj = model_class(*args, **kwargs)
+        session.add(obj)
+        cls._persist(session, cls._get_session_persistence())
         return obj
+
+    @classmethod
+    def _acreate(cls, model_class, *args, **kwargs):
+        """Create an instance of the model, for acreate().
+
+        With an asyncio session (e.g ``sqlalchemy.ext.asyncio.AsyncSession``),
+        returns an awaitable adding the object to the session, then flushing
+        or committing it, on the event loop; otherwise, behaves as _create().
+        """
+        session = cls._get_session()
+        if not compat.is_coroutine_function(getattr(session, 'flush', None)):
+            return cls._create(model_class, *args, **kwargs)
+
+        from . import aio
+        obj = model_class(*args, **kwargs)
+        session_persistence = cls._get_session_persistence()
+        if session_persistence == SESSION_PERSISTENCE_FLUSH:
+            return aio.add(session, obj, session.flush)
+        elif session_persistence == SESSION_PERSISTENCE_COMMIT:
+            return aio.add(session, obj, session.commit)
+        return aio.add(session, obj)
+
+    @classmethod
+    def _create_batch(cls, model_class, arguments):
+        """Create a batch of instances, saving them once per chunk.
+
+        Instances are added to the session, then flushed or committed once for
+        every ``sqlalchemy_batch_size`` objects.
+        With ``sqlalchemy_bulk_save``, factories without post-generation
+        declarations save each chunk through ``session.bulk_save_objects()``.
+
+        Factories overriding _create() get it called for each row instead.
+        """
+        return cls._save_batch(
+            model_class,
+            arguments,
+            bulk_save=cls._meta.sqlalchemy_bulk_save and not list(cls._meta.post_declarations),
+        )
+
+    @classmethod
+    def _save_batch(cls, model_class, arguments, bulk_save):
+        """Save a batch of instances; bulk_save enables session.bulk_save_objects().
+
+        bulk_save_objects() ignores relationships: batches setting one are
+        added to the session instead.
+        """
+        if base.is_overridden(cls, SQLAlchemyModelFactory, '_create'):
+            return super(SQLAlchemyModelFactory, cls)._create_batch(model_class, arguments)
+
+        session = cls._get_session()
+        session_persistence = cls._get_session_persistence()
+        if bulk_save:
+            relationships = _get_relationships(model_class)
+            bulk_save = not any(name in relationships for _args, kwargs in arguments for name in kwargs)
+
+        objs = [model_class(*args, **kwargs) for args, kwargs in arguments]
+        chunk_size = cls._meta.sqlalchemy_batch_size or len(objs) or 1
+        for start in range(0, len(objs), chunk_size):
+            chunk = objs[start:start + chunk_size]
+            if bulk_save:
+                session.bulk_save_objects(chunk, return_defaults=True)
+            else:
+                session.add_all(chunk)
+            cls._persist(session, session_persistence)
+        return objs
@@ -4,13 +4,18 @@
 from __future__ import unicode_literals
 
 import collections
+import functools
+import itertools
 import logging
+import threading
 import warnings
 
 from . import builder
+from . import compat
 from . import declarations
 from . import enums
 from . import errors
+from . import snapshots
 from . import utils
 
 logger = logging.getLogger('factory.generate')
@@ -105,6 +110,17 @@ class BaseMeta:
     strategy = enums.CREATE_STRATEGY
 
 
+def is_overridden(factory, base_factory, method_name):
+    """Whether a factory overrides a classmethod of one of its base factories.
+
+    Decorators setting ``__wrapped__`` (e.g django.mute_signals) are seen through.
+    """
+    method = getattr(factory, method_name).__func__
+    while hasattr(method, '__wrapped__'):
+        method = method.__wrapped__
+    return method is not getattr(base_factory, method_name).__func__
+
+
 class OptionDefault(object):
     """The default for an option.
 
@@ -149,6 +165,7 @@ class FactoryOptions(object):
         self.parameters_dependencies = {}
         self.pre_declarations = builder.DeclarationSet()
         self.post_declarations = builder.DeclarationSet()
+        self._declarations_cache = builder.DeclarationsCache(self.pre_declarations, self.post_declarations)
 
         self._counter = None
         self.counter_reference = None
@@ -173,8 +190,27 @@ class FactoryOptions(object):
             OptionDefault('inline_args', (), inherit=True),
             OptionDefault('exclude', (), inherit=True),
             OptionDefault('rename', {}, inherit=True),
+            OptionDefault('resolution', enums.LAZY_RESOLUTION, inherit=True, checker=self._check_resolution),
+            OptionDefault('sequence_backend', None, inherit=True),
+            OptionDefault('async_concurrency', 1, inherit=True, checker=self._check_async_concurrency),
+            OptionDefault(
+                'postgeneration_concurrency', 1, inherit=True, checker=self._check_postgeneration_concurrency),
         ]
 
+    def _check_resolution(self, meta, value):
+        if value not in (enums.LAZY_RESOLUTION, enums.COMPILED_RESOLUTION):
+            raise TypeError(
+                "%s.resolution must be one of %r, got %r"
+                % (meta, [enums.LAZY_RESOLUTION, enums.COMPILED_RESOLUTION], value))
+
+    def _check_async_concurrency(self, meta, value):
+        if not isinstance(value, int) or value < 1:
+            raise TypeError("%s.async_concurrency must be a positive integer, got %r" % (meta, value))
+
+    def _check_postgeneration_concurrency(self, meta, value):
+        if not isinstance(value, int) or value < 1:
+            raise TypeError("%s.postgeneration_concurrency must be a positive integer, got %r" % (meta, value))
+
     def _fill_from_meta(self, meta, base_meta):
         # Exclude private/protected fields from the meta
         if meta is None:
@@ -231,6 +267,7 @@ class FactoryOptions(object):
         self._check_parameter_dependencies(self.parameters)
 
         self.pre_declarations, self.post_declarations = builder.parse_declarations(self.declarations)
+        self._declarations_cache = builder.DeclarationsCache(self.pre_declarations, self.post_declarations)
 
     def _get_counter_reference(self):
         """Identify which factory should be used for a shared counter."""
@@ -252,11 +289,20 @@ class FactoryOptions(object):
         if self._counter is not None:
             return
 
-        if self.counter_reference is self:
-            self._counter = _Counter(seq=self.factory._setup_next_sequence())
-        else:
-            self.counter_reference._initialize_counter()
-            self._counter = self.counter_reference._counter
+        with _COUNTER_INIT_LOCK:
+            if self._counter is not None:
+                # Initialized by another thread.
+                return
+
+            if self.counter_reference is self:
+                seq = self.factory._setup_next_sequence()
+                if self.sequence_backend is None:
+                    self._counter = _Counter(seq=seq)
+                else:
+                    self._counter = self.sequence_backend.get_counter(self.factory, seq)
+            else:
+                self.counter_reference._initialize_counter()
+                self._counter = self.counter_reference._counter
 
     def next_sequence(self):
         """Retrieve a new sequence ID.
@@ -269,6 +315,18 @@ class FactoryOptions(object):
         self._initialize_counter()
         return self._counter.next()
 
+    def reserve_sequences(self, size):
+        """Reserve a block of consecutive sequence IDs.
+
+        The block is drawn from the same counter as next_sequence(), shared
+        along the counter_reference chain.
+
+        Returns:
+            range: the ``size`` reserved sequence IDs
+        """
+        self._initialize_counter()
+        return self._counter.reserve(size)
+
     def reset_sequence(self, value=None, force=False):
         self._initialize_counter()
 
@@ -281,6 +339,23 @@ class FactoryOptions(object):
             value = self.counter_reference.factory._setup_next_sequence()
         self._counter.reset(value)
 
+    def prepare_declarations(self, extras):
+        """Merge call-time declarations with the factory's declarations.
+
+        Args:
+            extras (dict): the call-time declarations
+
+        Returns:
+            (DeclarationSet, DeclarationSet, ResolutionPlan or None): the pre-
+                and post-declarations to use, which should be considered
+                read-only, and the plan for resolving the pre-declarations
+                when using compiled resolution.
+        """
+        if self.resolution == enums.COMPILED_RESOLUTION:
+            return self._declarations_cache.parse_with_plan(extras)
+        pre, post = self._declarations_cache.parse(extras)
+        return pre, post, None
+
     def prepare_arguments(self, attributes):
         """Convert an attributes dict to a (args, kwargs) tuple."""
         kwargs = dict(attributes)
@@ -316,13 +391,43 @@ class FactoryOptions(object):
             assert step.builder.strategy == enums.STUB_STRATEGY
             return StubObject(**kwargs)
 
+    def instantiate_batch(self, steps, arguments):
+        """Instantiate a whole batch at once.
+
+        Args:
+            steps (BuildStep list): the steps for each instance of the batch
+            arguments ((args, kwargs) list): the prepared arguments for each
+                instance, in the same order as steps
+        """
+        if not steps:
+            return []
+        model = self.get_model_class()
+        strategy = steps[0].builder.strategy
+
+        if strategy == enums.BUILD_STRATEGY:
+            return self.factory._build_batch(model, arguments)
+        elif strategy == enums.CREATE_STRATEGY:
+            return self.factory._create_batch(model, arguments)
+        else:
+            assert strategy == enums.STUB_STRATEGY
+            return [StubObject(**kwargs) for _args, kwargs in arguments]
+
     def use_postgeneration_results(self, step, instance, results):
-        self.factory._after_postgeneration(
+        return self.factory._after_postgeneration(
             instance,
             create=step.builder.strategy == enums.CREATE_STRATEGY,
             results=results,
         )
 
+    def use_batch_postgeneration_results(self, steps, instances, results):
+        if not steps:
+            return None
+        return self.factory._after_batch_postgeneration(
+            instances,
+            create=steps[0].builder.strategy == enums.CREATE_STRATEGY,
+            results=results,
+        )
+
     def _is_declaration(self, name, value):
         """Determines if a class attribute is a field value declaration.
 
@@ -387,24 +492,77 @@ class FactoryOptions(object):
 # Factory base classes
 
 
+# Guards the lazy initialization of sequence counters; reentrant, since
+# initializing a counter may initialize that of the counter_reference.
+_COUNTER_INIT_LOCK = threading.RLock()
+
+
 class _Counter(object):
-    """Simple, naive counter.
+    """Thread-safe sequence counter.
+
+    Values are drawn from an itertools.count(), whose next() is atomic: the
+    common path takes no lock. Operations replacing the count (reset(),
+    reserve()) hold the lock; a next() call racing with them notices the swap,
+    and draws a value again from the new count, under the lock (the value
+    drawn first is skipped).
+
+    No await happens within those methods, so they are atomic for asyncio tasks.
 
     Attributes:
-        for_class (obj): the class this counter related to
-        seq (int): the next value
+        _count (iterator): the source of sequence numbers
+        _lock (threading.Lock): held while replacing _count
     """
 
     def __init__(self, seq):
-        self.seq = seq
+        self._lock = threading.Lock()
+        self._count = itertools.count(seq)
 
     def next(self):
-        value = self.seq
-        self.seq += 1
-        return value
+        count = self._count
+        value = next(count)
+        if count is self._count:
+            return value
+        # The count was replaced while drawing the value: start over.
+        with self._lock:
+            return next(self._count)
+
+    def reserve(self, size):
+        """Reserve ``size`` consecutive values; returns them as a range."""
+        if size <= 0:
+            return compat.lazy_range(0)
+
+        with self._lock:
+            count = self._count
+            # Concurrent next() calls must not draw from the old count
+            # past the start of the block.
+            self._count = _PendingCount(self._lock)
+            start = next(count)
+            self._count = itertools.count(start + size)
+        return compat.lazy_range(start, start + size)
 
     def reset(self, next_value=0):
-        self.seq = next_value
+        with self._lock:
+            self._count = itertools.count(next_value)
+
+
+class _PendingCount(object):
+    """Stands for a count being replaced; next() waits for the replacement.
+
+    The returned value is meaningless: _Counter.next() will notice that the
+    count was replaced, and draw another value.
+    """
+
+    def __init__(self, lock):
+        self.lock = lock
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        with self.lock:
+            return None
+
+    next = __next__  # Python 2
 
 
 class BaseFactory(object):
@@ -504,6 +662,80 @@ class BaseFactory(object):
         step = builder.StepBuilder(cls._meta, params, strategy)
         return step.build()
 
+    @classmethod
+    def _generate_snapshot(cls, strategy, seed, params):
+        """Generate an object from the cached template for those params.
+
+        Args:
+            strategy: the strategy to use; either BUILD_STRATEGY or STUB_STRATEGY
+            seed: if set, the random seed to use when building the template
+            params (dict): attributes to use for generating the object
+        """
+        if strategy not in (enums.BUILD_STRATEGY, enums.STUB_STRATEGY):
+            raise errors.UnsupportedStrategy(
+                "Snapshots don't support the %r strategy on %r." % (strategy, cls))
+
+        key = snapshots._SNAPSHOTS.get_key(cls, strategy, seed, params)
+        if key is None:
+            # Unhashable overrides: no caching.
+            return snapshots.generate_seeded(cls, strategy, params, seed)
+
+        obj = snapshots._SNAPSHOTS.get(key, params)
+        if obj is None:
+            obj = snapshots.generate_seeded(cls, strategy, params, seed)
+            snapshots._SNAPSHOTS.set(key, obj, params)
+            return obj
+
+        sequence = cls._meta.next_sequence()
+        if snapshots.patch_sequences(cls._meta, strategy, obj, params, sequence):
+            return obj
+        # The copy can't be updated, e.g an immutable object: stop caching it.
+        snapshots._SNAPSHOTS.reject(key)
+        return snapshots.generate_seeded(cls, strategy, dict(params, __sequence=sequence), seed)
+
+    @classmethod
+    def _overrides(cls, *method_names):
+        """Whether any of those classmethods is overridden by a subclass."""
+        return any(is_overridden(cls, BaseFactory, method_name) for method_name in method_names)
+
+    @classmethod
+    def _generate_batch(cls, strategy, size, params):
+        """generate a batch of objects.
+
+        Args:
+            strategy: the strategy to use
+            size (int): the number of objects to generate
+            params (dict): attributes to use for generating the objects
+        """
+        if cls._meta.abstract:
+            raise errors.FactoryError(
+                "Cannot generate instances of abstract factory %(f)s; "
+                "Ensure %(f)s.Meta.model is set and %(f)s.Meta.abstract "
+                "is either not set or False." % dict(f=cls.__name__))
+
+        step = builder.StepBuilder(cls._meta, params, strategy)
+        return step.build_batch(size)
+
+    @classmethod
+    def _generate_iter(cls, strategy, size, chunk_size, params):
+        """Lazily generate objects.
+
+        Args:
+            strategy: the strategy to use
+            size (int or None): the number of objects to generate, None for
+                an endless stream
+            chunk_size (int): the number of objects to instantiate together
+            params (dict): attributes to use for generating the objects
+        """
+        if cls._meta.abstract:
+            raise errors.FactoryError(
+                "Cannot generate instances of abstract factory %(f)s; "
+                "Ensure %(f)s.Meta.model is set and %(f)s.Meta.abstract "
+                "is either not set or False." % dict(f=cls.__name__))
+
+        step = builder.StepBuilder(cls._meta, params, strategy)
+        return step.iter_batch(size, chunk_size=chunk_size)
+
     @classmethod
     def _after_postgeneration(cls, instance, create, results=None):
         """Hook called after post-generation declarations have been handled.
@@ -515,6 +747,21 @@ class BaseFactory(object):
         """
         pass
 
+    @classmethod
+    def _after_batch_postgeneration(cls, instances, create, results):
+        """Hook called once post-generation declarations of a batch have been handled.
+
+        By default, calls :meth:`_after_postgeneration` for each instance.
+
+        Args:
+            instances (object list): the generated objects
+            create (bool): whether the strategy was 'build' or 'create'
+            results (dict list): result of post-generation declarations,
+                for each instance
+        """
+        for instance, instance_results in zip(instances, results):
+            cls._after_postgeneration(instance, create=create, results=instance_results)
+
     @classmethod
     def _build(cls, model_class, *args, **kwargs):
         """Actually build an instance of the model_class.
@@ -545,6 +792,53 @@ class BaseFactory(object):
         """
         return model_class(*args, **kwargs)
 
+    @classmethod
+    def _acreate(cls, model_class, *args, **kwargs):
+        """Create an instance of the model_class, for acreate() and acreate_batch().
+
+        Customization point for asynchronous ORMs: it may return either the
+        instance, or an awaitable resolving to it; it is called from a worker
+        thread, and awaitables are run on the caller's event loop.
+        By default, calls :meth:`_create`.
+
+        Args:
+            model_class (type): the class for which an instance should be
+                created
+            args (tuple): arguments to use when creating the class
+            kwargs (dict): keyword arguments to use when creating the class
+        """
+        return cls._create(model_class, *args, **kwargs)
+
+    @classmethod
+    def _build_batch(cls, model_class, arguments):
+        """Actually build a batch of instances of the model_class.
+
+        Customization point, will be called once the args and kwargs of every
+        instance of the batch have been computed; by default, calls
+        :meth:`_build` for each of them.
+
+        Args:
+            model_class (type): the class for which instances should be built
+            arguments ((tuple, dict) list): the args and kwargs to use for
+                each instance
+        """
+        return [cls._build(model_class, *args, **kwargs) for args, kwargs in arguments]
+
+    @classmethod
+    def _create_batch(cls, model_class, arguments):
+        """Actually create a batch of instances of the model_class.
+
+        Customization point, will be called once the args and kwargs of every
+        instance of the batch have been computed; by default, calls
+        :meth:`_create` for each of them.
+
+        Args:
+            model_class (type): the class for which instances should be created
+            arguments ((tuple, dict) list): the args and kwargs to use for
+                each instance
+        """
+        return [cls._create(model_class, *args, **kwargs) for args, kwargs in arguments]
+
     @classmethod
     def build(cls, **kwargs):
         """Build an instance of the associated class, with overriden attrs."""
@@ -560,7 +854,38 @@ class BaseFactory(object):
         Returns:
             object list: the built instances
         """
-        return [cls.build(**kwargs) for _ in range(size)]
+        if cls._overrides('build', '_generate'):
+            # Keep calling the custom methods once per instance.
+            return [cls.build(**kwargs) for _ in range(size)]
+        return cls._generate_batch(enums.BUILD_STRATEGY, size, kwargs)
+
+    @classmethod
+    def iter_build(cls, size=None, chunk_size=1, **kwargs):
+        """Lazily build instances of the given class, with overriden attrs.
+
+        Args:
+            size (int or None): the number of instances to build; None for
+                an endless stream
+            chunk_size (int): the number of instances to build together
+
+        Returns:
+            object iterator: the built instances
+        """
+        return cls._generate_iter(enums.BUILD_STRATEGY, size, chunk_size, kwargs)
+
+    @classmethod
+    def build_snapshot(cls, snapshot_seed=None, **kwargs):
+        """Build an instance from a cached template, with overriden attrs.
+
+        The first call with a given set of overrides builds an instance as
+        build() would; later calls return deep copies of it, whose Sequence
+        fields are computed from a new sequence number.
+
+        Args:
+            snapshot_seed: if set, factory.random is reseeded with it while
+                building the template; it is part of the cache key.
+        """
+        return cls._generate_snapshot(enums.BUILD_STRATEGY, snapshot_seed, kwargs)
 
     @classmethod
     def create(cls, **kwargs):
@@ -577,7 +902,85 @@ class BaseFactory(object):
         Returns:
             object list: the created instances
         """
-        return [cls.create(**kwargs) for _ in range(size)]
+        if cls._overrides('create', '_generate'):
+            # Keep calling the custom methods once per instance.
+            return [cls.create(**kwargs) for _ in range(size)]
+        return cls._generate_batch(enums.CREATE_STRATEGY, size, kwargs)
+
+    @classmethod
+    def iter_create(cls, size=None, chunk_size=1, **kwargs):
+        """Lazily create instances of the given class, with overriden attrs.
+
+        Args:
+            size (int or None): the number of instances to create; None for
+                an endless stream
+            chunk_size (int): the number of instances to create together
+
+        Returns:
+            object iterator: the created instances
+        """
+        return cls._generate_iter(enums.CREATE_STRATEGY, size, chunk_size, kwargs)
+
+    @classmethod
+    def _agenerate(cls, params):
+        """Create an object from asyncio code.
+
+        Factories overriding create() or _generate() get create() called
+        within a worker thread instead.
+
+        Args:
+            params (dict): attributes to use for generating the object
+
+        Returns:
+            awaitable: resolves to the created instance
+        """
+        from . import aio
+        if cls._overrides('create', '_generate'):
+            return aio.run_sync(functools.partial(cls.create, **params))
+        return aio.generate(cls, params)
+
+    @classmethod
+    def _agenerate_batch(cls, size, params):
+        """Create a batch of objects from asyncio code.
+
+        Args:
+            size (int): the number of objects to create
+            params (dict): attributes to use for generating the objects
+
+        Returns:
+            awaitable: resolves to the list of created instances
+        """
+        from . import aio
+        return aio.generate_batch(cls, size, params)
+
+    @classmethod
+    def acreate(cls, **kwargs):
+        """Create an instance of the associated class from asyncio code, with overriden attrs.
+
+        Requires Python 3.5+.
+
+        Returns:
+            awaitable: resolves to the created instance
+        """
+        return cls._agenerate(kwargs)
+
+    @classmethod
+    def acreate_batch(cls, size, **kwargs):
+        """Create a batch of instances from asyncio code, with overriden attrs.
+
+        At most ``Meta.async_concurrency`` instances are created concurrently.
+        Requires Python 3.5+.
+
+        Args:
+            size (int): the number of instances to create
+
+        Returns:
+            awaitable: resolves to the list of created instances
+        """
+        if cls._overrides('acreate', '_agenerate', 'create', '_generate'):
+            from . import aio
+            return aio.generate_each(cls, size, kwargs)
+        return cls._agenerate_batch(size, kwargs)
 
     @classmethod
     def stub(cls, **kwargs):
@@ -588,6 +991,14 @@ class BaseFactory(object):
         """
         return cls._generate(enums.STUB_STRATEGY, kwargs)
 
+    @classmethod
+    def stub_snapshot(cls, snapshot_seed=None, **kwargs):
+        """Stub an instance from a cached template, with overriden attrs.
+
+        See build_snapshot().
+        """
+        return cls._generate_snapshot(enums.STUB_STRATEGY, snapshot_seed, kwargs)
+
     @classmethod
     def stub_batch(cls, size, **kwargs):
         """Stub a batch of instances of the given class, with overriden attrs.
@@ -598,7 +1009,24 @@ class BaseFactory(object):
         Returns:
             object list: the stubbed instances
         """
-        return [cls.stub(**kwargs) for _ in range(size)]
+        if cls._overrides('stub', '_generate'):
+            # Keep calling the custom methods once per instance.
+            return [cls.stub(**kwargs) for _ in range(size)]
+        return cls._generate_batch(enums.STUB_STRATEGY, size, kwargs)
+
+    @classmethod
+    def iter_stub(cls, size=None, chunk_size=1, **kwargs):
+        """Lazily stub instances of the given class, with overriden attrs.
+
+        Args:
+            size (int or None): the number of instances to stub; None for
+                an endless stream
+            chunk_size (int): the number of instances to stub together
+
+        Returns:
+            object iterator: the stubbed instances
+        """
+        return cls._generate_iter(enums.STUB_STRATEGY, size, chunk_size, kwargs)
 
     @classmethod
     def generate(cls, strategy, **kwargs):
@@ -700,10 +1128,38 @@ class StubFactory(Factory):
     def build(cls, **kwargs):
         return cls.stub(**kwargs)
 
+    @classmethod
+    def build_batch(cls, size, **kwargs):
+        return cls.stub_batch(size, **kwargs)
+
+    @classmethod
+    def iter_build(cls, size=None, chunk_size=1, **kwargs):
+        return cls.iter_stub(size, chunk_size=chunk_size, **kwargs)
+
+    @classmethod
+    def build_snapshot(cls, snapshot_seed=None, **kwargs):
+        return cls.stub_snapshot(snapshot_seed, **kwargs)
+
     @classmethod
     def create(cls, **kwargs):
         raise errors.UnsupportedStrategy()
 
+    @classmethod
+    def create_batch(cls, size, **kwargs):
+        raise errors.UnsupportedStrategy()
+
+    @classmethod
+    def iter_create(cls, size=None, chunk_size=1, **kwargs):
+        raise errors.UnsupportedStrategy()
+
+    @classmethod
+    def acreate(cls, **kwargs):
+        raise errors.UnsupportedStrategy()
+
+    @classmethod
+    def acreate_batch(cls, size, **kwargs):
+        raise errors.UnsupportedStrategy()
+
 
 class BaseDictFactory(Factory):
     """Factory for dictionary-like classes."""
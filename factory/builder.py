@@ -1,10 +1,13 @@
 """Build factory instances."""
 
 import collections
+import functools
 
 from . import declarations
 from . import enums
 from . import errors
+from . import hooks
+from . import profiling
 from . import utils
 
 
@@ -65,7 +68,11 @@ class DeclarationSet(object):
         return enums.SPLITTER.join((root, subkey))
 
     def copy(self):
-        return self.__class__(self.as_dict())
+        clone = self.__class__()
+        clone.declarations = dict(self.declarations)
+        for root, context in self.contexts.items():
+            clone.contexts[root] = dict(context)
+        return clone
 
     def update(self, values):
         """Add new declarations to this set/
@@ -149,6 +156,8 @@ class FakePostGenerationDeclaration(declarations.PostGenerationDeclaration):
 
     Used to disable post-generation when the user has overridden a method.
     """
+    concurrent = True
+
     def __init__(self, value):
         self.value = value
 
@@ -156,13 +165,23 @@ class FakePostGenerationDeclaration(declarations.PostGenerationDeclaration):
         return self.value
 
 
-def parse_declarations(decls, base_pre=None, base_post=None):
-    pre_declarations = base_pre.copy() if base_pre else DeclarationSet()
-    post_declarations = base_post.copy() if base_post else DeclarationSet()
+def route_declarations(decls, pre_declarations, post_declarations):
+    """Decide where each call-time declaration should be injected.
+
+    Args:
+        decls (dict(name => value)): the call-time declarations
+        pre_declarations (DeclarationSet): the base pre-declarations
+        post_declarations (DeclarationSet): the base post-declarations
+
+    Returns:
+        (key, is_post, target) list: for each key of decls, whether it goes to
+            the post-declarations, and the name to use there.
+    """
+    routes = []
+    new_post_roots = set()
+    extra_maybenonpost = []
 
     # Inject extra declarations, splitting between known-to-be-post and undetermined
-    extra_post = {}
-    extra_maybenonpost = {}
     for k, v in decls.items():
         if isinstance(v, declarations.PostGenerationDeclaration):
             if k in pre_declarations:
@@ -172,36 +191,213 @@ def parse_declarations(decls, base_pre=None, base_post=None):
                     "PostGenerationDeclaration %s=%r shadows declaration %r"
                     % (k, v, pre_declarations[k])
                 )
-            extra_post[k] = v
+            routes.append((k, True, k))
+            root, subkey = DeclarationSet.split(k)
+            if subkey is None:
+                new_post_roots.add(root)
         elif k in post_declarations:
             # Passing in a scalar value to a PostGenerationDeclaration
             # Set it as `key__`
-            magic_key = post_declarations.join(k, '')
-            extra_post[magic_key] = v
+            routes.append((k, True, post_declarations.join(k, '')))
         else:
-            extra_maybenonpost[k] = v
+            extra_maybenonpost.append(k)
+
+    # Fill in extra post-declaration context; anything else is pre_declarations
+    for k in extra_maybenonpost:
+        root = DeclarationSet.split(k)[0]
+        routes.append((k, root in post_declarations or root in new_post_roots, k))
+
+    return routes
+
+
+def parse_declarations(decls, base_pre=None, base_post=None):
+    pre_declarations = base_pre.copy() if base_pre else DeclarationSet()
+    post_declarations = base_post.copy() if base_post else DeclarationSet()
 
-    # Start with adding new post-declarations
-    post_declarations.update(extra_post)
+    routes = route_declarations(decls, pre_declarations, post_declarations)
 
-    # Fill in extra post-declaration context
-    post_overrides = post_declarations.filter(extra_maybenonpost)
     post_declarations.update({
-        k: v
-        for k, v in extra_maybenonpost.items()
-        if k in post_overrides
+        target: decls[k]
+        for k, is_post, target in routes
+        if is_post
     })
-
-    # Anything else is pre_declarations
     pre_declarations.update({
-        k: v
-        for k, v in extra_maybenonpost.items()
-        if k not in post_overrides
+        target: decls[k]
+        for k, is_post, target in routes
+        if not is_post
     })
 
     return pre_declarations, post_declarations
 
 
+def _declaration_kind(value):
+    if isinstance(value, declarations.PostGenerationDeclaration):
+        return 'post'
+    elif isinstance(value, declarations.BaseDeclaration):
+        return 'declaration'
+    else:
+        return 'value'
+
+
+class ResolutionPlan(object):
+    """A flat evaluation plan for a set of pre-declarations.
+
+    Used for compiled resolution (``class Meta: resolution = 'compiled'``).
+
+    Attributes:
+        values (str list): fields holding raw values, which need no evaluation
+        order (str list): fields holding declarations, in evaluation order.
+            Declarations whose dependencies can be analysed (SelfAttribute,
+            Maybe) come after those dependencies; any other dependency is
+            resolved lazily, when first accessed.
+    """
+
+    def __init__(self, declaration_set):
+        self.values = []
+        dependencies = {}
+        fields = []
+        for name in declaration_set:
+            value = declaration_set.declarations[name]
+            if isinstance(value, declarations.BaseDeclaration):
+                fields.append(name)
+                dependencies[name] = self.get_dependencies(value, declaration_set)
+            else:
+                self.values.append(name)
+
+        self.order = []
+        resolved = set(self.values)
+        visiting = set()
+
+        def visit(name):
+            # Cycles are left to the Resolver, which will report them on evaluation.
+            if name in resolved or name in visiting:
+                return
+            visiting.add(name)
+            for dependency in dependencies[name]:
+                visit(dependency)
+            visiting.discard(name)
+            resolved.add(name)
+            self.order.append(name)
+
+        for name in fields:
+            visit(name)
+
+    @classmethod
+    def get_dependencies(cls, declaration, declaration_set):
+        """List the fields of declaration_set a declaration is known to depend upon."""
+        if isinstance(declaration, declarations.SelfAttribute):
+            if declaration.depth > 1:
+                # Points to a parent object.
+                return []
+            root = declaration.attribute_name.split('.', 1)[0]
+            return [root] if root in declaration_set else []
+
+        elif isinstance(declaration, declarations.Maybe):
+            if isinstance(declaration.decider, declarations.BaseDeclaration):
+                found = cls.get_dependencies(declaration.decider, declaration_set)
+            elif declaration.decider in declaration_set:
+                found = [declaration.decider]
+            else:
+                found = []
+            for target in (declaration.yes, declaration.no):
+                if isinstance(target, declarations.BaseDeclaration):
+                    found.extend(cls.get_dependencies(target, declaration_set))
+            return found
+
+        return []
+
+    def get_values(self, declaration_set):
+        """Extract the raw values from a DeclarationSet matching this plan."""
+        return {name: declaration_set.declarations[name] for name in self.values}
+
+    def __repr__(self):
+        return '<ResolutionPlan: values=%r, order=%r>' % (self.values, self.order)
+
+
+class DeclarationsCache(object):
+    """Memoize the parsing of call-time declarations for a factory.
+
+    Call-time declarations sharing the same names (e.g ``UserFactory(company=c)``
+    in a loop) are always dispatched in the same way; that dispatching is computed,
+    and validated, only once per set of names.
+
+    Attributes:
+        base_pre (DeclarationSet): the factory's pre-declarations
+        base_post (DeclarationSet): the factory's post-declarations
+        routes (dict(frozenset => list)): the known dispatching plans,
+            as computed by route_declarations()
+        plans (dict(frozenset => ResolutionPlan)): the known resolution plans,
+            for compiled resolution
+    """
+
+    def __init__(self, base_pre, base_post):
+        self.base_pre = base_pre
+        self.base_post = base_post
+        self.routes = {}
+        self.plans = {}
+
+    def get_shape(self, decls):
+        """Compute the part of call-time declarations that drives their routing."""
+        return frozenset(
+            (k, _declaration_kind(v))
+            for k, v in decls.items()
+        )
+
+    def parse(self, decls):
+        """Equivalent to parse_declarations(decls, self.base_pre, self.base_post).
+
+        The returned DeclarationSet objects must not be altered: if no call-time
+        declaration targets them, they are the base declarations themselves.
+        """
+        return self._parse(decls, self.get_shape(decls))
+
+    def parse_with_plan(self, decls):
+        """Parse call-time declarations, and retrieve the matching ResolutionPlan.
+
+        Returns:
+            (DeclarationSet, DeclarationSet, ResolutionPlan): the pre- and
+                post-declarations, and the plan for resolving the former.
+        """
+        shape = self.get_shape(decls)
+        pre, post = self._parse(decls, shape)
+        plan = self.plans.get(shape)
+        if plan is None:
+            plan = self.plans[shape] = ResolutionPlan(pre)
+        return pre, post, plan
+
+    def _parse(self, decls, shape):
+        routes = self.routes.get(shape)
+        if routes is None:
+            # First call with those names: perform (and validate) a full parsing.
+            pre, post = parse_declarations(decls, base_pre=self.base_pre, base_post=self.base_post)
+            self.routes[shape] = [
+                (k, is_post) + tuple(DeclarationSet.split(target))
+                for k, is_post, target in route_declarations(decls, self.base_pre, self.base_post)
+            ]
+            return pre, post
+
+        pre = post = None
+        for k, is_post, root, subkey in routes:
+            if is_post:
+                if post is None:
+                    post = self.base_post.copy()
+                target = post
+            else:
+                if pre is None:
+                    pre = self.base_pre.copy()
+                target = pre
+
+            if subkey is None:
+                target.declarations[root] = decls[k]
+            else:
+                target.contexts[root][subkey] = decls[k]
+
+        return (
+            self.base_pre if pre is None else pre,
+            self.base_post if post is None else post,
+        )
+
+
 class BuildStep(object):
     def __init__(self, builder, sequence, parent_step=None):
         self.builder = builder
@@ -210,12 +406,22 @@ class BuildStep(object):
         self.parent_step = parent_step
         self.stub = None
 
-    def resolve(self, declarations):
-        self.stub = Resolver(
-            declarations=declarations,
-            step=self,
-            sequence=self.sequence,
-        )
+    def resolve(self, declarations, plan=None):
+        if plan is None:
+            self.stub = Resolver(
+                declarations=declarations,
+                step=self,
+                sequence=self.sequence,
+            )
+        else:
+            self.stub = Resolver(
+                declarations=declarations,
+                step=self,
+                sequence=self.sequence,
+                values=plan.get_values(declarations),
+            )
+            for field_name in plan.order:
+                getattr(self.stub, field_name)
 
         for field_name in declarations:
             self.attributes[field_name] = getattr(self.stub, field_name)
@@ -241,21 +447,31 @@ class StepBuilder(object):
     - extras: the passed-in kwargs for this branch
     - factory: the factory class being built
     - strategy: the strategy to use
+    - batch_size: the size of the chunk being resolved, if any
+    - batch_values: values pre-generated for the chunk being resolved
     """
     def __init__(self, factory_meta, extras, strategy):
         self.factory_meta = factory_meta
         self.strategy = strategy
         self.extras = extras
         self.force_init_sequence = extras.pop('__sequence', None)
+        self.batch_size = None
+        self.batch_values = None
 
     def build(self, parent_step=None, force_sequence=None):
         """Build a factory instance."""
-        # TODO: Handle "batch build" natively
-        pre, post = parse_declarations(
-            self.extras,
-            base_pre=self.factory_meta.pre_declarations,
-            base_post=self.factory_meta.post_declarations,
-        )
+        profiler = profiling.current
+        if profiler is None:
+            return self._build(parent_step, force_sequence)
+
+        profiler.start(self.factory_meta.factory, profiling.KIND_GENERATE, self.strategy)
+        try:
+            return self._build(parent_step, force_sequence)
+        finally:
+            profiler.stop()
+
+    def _build(self, parent_step, force_sequence):
+        pre, post, plan = self.factory_meta.prepare_declarations(self.extras)
 
         if force_sequence is not None:
             sequence = force_sequence
@@ -264,40 +480,292 @@ class StepBuilder(object):
         else:
             sequence = self.factory_meta.next_sequence()
 
+        hooked = hooks.enabled
+        if hooked:
+            start = hooks.timer()
+            hooks.send(hooks.PRE_RESOLVE, factory=self.factory_meta.factory, strategy=self.strategy, sequence=sequence)
+
+        step = self.resolve(pre, plan=plan, sequence=sequence, parent_step=parent_step)
+
+        args, kwargs = self.factory_meta.prepare_arguments(step.attributes)
+
+        profiler = profiling.current
+        if profiler is not None:
+            profiler.start(self.factory_meta.factory, profiling.KIND_INSTANTIATE, self.strategy)
+        try:
+            instance = self.instantiate(
+                step=step,
+                args=args,
+                kwargs=kwargs,
+            )
+        finally:
+            if profiler is not None:
+                profiler.stop()
+
+        if hooked:
+            hooks.send(
+                hooks.POST_INSTANTIATE,
+                factory=self.factory_meta.factory,
+                strategy=self.strategy,
+                sequence=sequence,
+                instance=instance,
+                elapsed=hooks.timer() - start,
+            )
+
+        self.postgenerate(post, step=step, instance=instance)
+
+        if hooked:
+            hooks.send(
+                hooks.POST_POSTGENERATION,
+                factory=self.factory_meta.factory,
+                strategy=self.strategy,
+                sequence=sequence,
+                instance=instance,
+                elapsed=hooks.timer() - start,
+            )
+        return instance
+
+    def build_batch(self, size):
+        """Build a batch of factory instances.
+
+        Declarations are parsed once for the whole batch, and the sequence
+        numbers are drawn before any instance is generated; all resolved
+        arguments are then handed to the instantiation layer together.
+        """
+        pre, post, plan = self.factory_meta.prepare_declarations(self.extras)
+        return self.build_chunk(pre, post, plan, self.get_sequences(size))
+
+    def iter_batch(self, size=None, chunk_size=1):
+        """Lazily build factory instances.
+
+        Declarations are parsed once, as for build_batch(); instances are then
+        built and instantiated by chunks of ``chunk_size``, drawing sequence
+        numbers only when the chunk is needed.
+
+        Args:
+            size (int or None): the number of instances to build, None for
+                an endless stream
+            chunk_size (int): the number of instances to build together
+
+        Returns:
+            iterator: the built instances, one at a time.
+        """
+        if chunk_size <= 0:
+            raise ValueError("chunk_size must be a positive integer, got %r." % (chunk_size,))
+        return self._iter_batch(size, chunk_size)
+
+    def _iter_batch(self, size, chunk_size):
+        pre, post, plan = self.factory_meta.prepare_declarations(self.extras)
+
+        remaining = size
+        while remaining is None or remaining > 0:
+            count = chunk_size if remaining is None else min(chunk_size, remaining)
+            for instance in self.build_chunk(pre, post, plan, self.get_sequences(count)):
+                yield instance
+            if remaining is not None:
+                remaining -= count
+
+    def get_sequences(self, size):
+        """Draw the sequence numbers for a batch of ``size`` instances."""
+        if self.force_init_sequence is not None:
+            return [self.force_init_sequence] * size
+        return self.factory_meta.reserve_sequences(size)
+
+    def build_chunk(self, pre, post, plan, sequences):
+        """Build one instance per sequence number, with already parsed declarations."""
+        profiler = profiling.current
+        if profiler is None:
+            return self._build_chunk(pre, post, plan, sequences)
+
+        profiler.start(self.factory_meta.factory, profiling.KIND_GENERATE, '%s_batch' % self.strategy)
+        try:
+            return self._build_chunk(pre, post, plan, sequences)
+        finally:
+            profiler.stop()
+
+    def _build_chunk(self, pre, post, plan, sequences):
+        factory = self.factory_meta.factory
+        hooked = hooks.enabled
+        if hooked:
+            batch_start = hooks.timer()
+            starts = []
+            hooks.send(hooks.BATCH_START, factory=factory, strategy=self.strategy, size=len(sequences))
+
+        steps = []
+        arguments = []
+        self.batch_size = len(sequences)
+        self.batch_values = {}
+        try:
+            for sequence in sequences:
+                if hooked:
+                    starts.append(hooks.timer())
+                    hooks.send(hooks.PRE_RESOLVE, factory=factory, strategy=self.strategy, sequence=sequence)
+                step = self.resolve(pre, plan=plan, sequence=sequence)
+                steps.append(step)
+                arguments.append(self.factory_meta.prepare_arguments(step.attributes))
+        finally:
+            # Leftover pre-generated values are never reused.
+            self.batch_size = None
+            self.batch_values = None
+
+        profiler = profiling.current
+        if profiler is not None:
+            profiler.start(self.factory_meta.factory, profiling.KIND_INSTANTIATE, '%s_batch' % self.strategy)
+        try:
+            instances = self.factory_meta.instantiate_batch(
+                steps=steps,
+                arguments=arguments,
+            )
+        finally:
+            if profiler is not None:
+                profiler.stop()
+
+        if not hooked:
+            results = [
+                self.run_postgeneration(post, step=step, instance=instance)
+                for step, instance in zip(steps, instances)
+            ]
+            self.complete(self.factory_meta.use_batch_postgeneration_results(
+                steps=steps,
+                instances=instances,
+                results=results,
+            ))
+            return instances
+
+        for step, instance, start in zip(steps, instances, starts):
+            hooks.send(
+                hooks.POST_INSTANTIATE,
+                factory=factory,
+                strategy=self.strategy,
+                sequence=step.sequence,
+                instance=instance,
+                elapsed=hooks.timer() - start,
+            )
+        results = []
+        for step, instance, start in zip(steps, instances, starts):
+            results.append(self.run_postgeneration(post, step=step, instance=instance))
+            hooks.send(
+                hooks.POST_POSTGENERATION,
+                factory=factory,
+                strategy=self.strategy,
+                sequence=step.sequence,
+                instance=instance,
+                elapsed=hooks.timer() - start,
+            )
+        self.complete(self.factory_meta.use_batch_postgeneration_results(
+            steps=steps,
+            instances=instances,
+            results=results,
+        ))
+        hooks.send(
+            hooks.BATCH_END,
+            factory=factory,
+            strategy=self.strategy,
+            size=len(sequences),
+            instances=instances,
+            elapsed=hooks.timer() - batch_start,
+        )
+        return instances
+
+    def next_batch_value(self, key, generate):
+        """Fetch the next value of a block generated for the current chunk.
+
+        Args:
+            key: identifies the block, typically the declaration itself
+            generate (callable): called with the chunk size to build a block
+                of values, whenever no value is left for ``key``.
+        """
+        values = self.batch_values.get(key)
+        if values is None:
+            values = self.batch_values[key] = iter(generate(self.batch_size))
+        try:
+            return next(values)
+        except StopIteration:
+            # More than one value per instance: draw another block.
+            values = self.batch_values[key] = iter(generate(self.batch_size))
+            return next(values)
+
+    def resolve(self, declarations, plan, sequence, parent_step=None):
+        """Compute the values of all pre-declarations for a new BuildStep."""
         step = BuildStep(
             builder=self,
             sequence=sequence,
             parent_step=parent_step,
         )
-        step.resolve(pre)
-
-        args, kwargs = self.factory_meta.prepare_arguments(step.attributes)
+        step.resolve(declarations, plan=plan)
+        return step
 
-        instance = self.factory_meta.instantiate(
+    def postgenerate(self, declarations, step, instance):
+        """Run post-generation declarations against a freshly built instance."""
+        results = self.run_postgeneration(declarations, step=step, instance=instance)
+        self.complete(self.factory_meta.use_postgeneration_results(
+            instance=instance,
             step=step,
-            args=args,
-            kwargs=kwargs,
-        )
+            results=results,
+        ))
+
+    def run_postgeneration(self, declarations, step, instance):
+        """Call the post-generation declarations of an instance; returns their results by name.
 
+        With ``Meta.postgeneration_concurrency``, consecutive declarations flagged
+        as ``concurrent`` (e.g RelatedFactory) run together in a thread pool;
+        any other declaration waits for all previous ones, and is waited for.
+        """
+        concurrency = self.factory_meta.postgeneration_concurrency
         postgen_results = {}
-        for declaration_name in post.sorted():
-            declaration = post[declaration_name]
-            postgen_context = PostGenerationContext(
-                value_provided='' in declaration.context,
-                value=declaration.context.get(''),
-                extra={k: v for k, v in declaration.context.items() if k != ''},
-            )
-            postgen_results[declaration_name] = declaration.declaration.call(
+        group = []
+        for declaration_name in declarations.sorted():
+            declaration = declarations[declaration_name]
+            if concurrency > 1 and declaration.declaration.concurrent:
+                group.append(declaration)
+                continue
+            if group:
+                self.postgenerate_concurrently(group, step, instance, concurrency, postgen_results)
+                group = []
+            postgen_results[declaration_name] = self.call_postgeneration(declaration, step, instance)
+        if group:
+            self.postgenerate_concurrently(group, step, instance, concurrency, postgen_results)
+        return postgen_results
+
+    def postgenerate_concurrently(self, group, step, instance, concurrency, postgen_results):
+        """Run independent post-generation declarations, at most ``concurrency`` at a time."""
+        results = utils.run_concurrently(
+            [functools.partial(self.call_postgeneration, declaration, step, instance) for declaration in group],
+            concurrency,
+        )
+        for declaration, result in zip(group, results):
+            postgen_results[declaration.name] = result
+
+    def call_postgeneration(self, declaration, step, instance):
+        """Call a post-generation declaration (a DeclarationWithContext)."""
+        postgen_context = PostGenerationContext(
+            value_provided='' in declaration.context,
+            value=declaration.context.get(''),
+            extra={k: v for k, v in declaration.context.items() if k != ''},
+        )
+        profiler = profiling.current
+        if profiler is not None:
+            profiler.start(self.factory_meta.factory, profiling.KIND_POSTGENERATION, declaration.name)
+        try:
+            return self.complete(declaration.declaration.call(
                 instance=instance,
                 step=step,
                 context=postgen_context,
-            )
-        self.factory_meta.use_postgeneration_results(
-            instance=instance,
-            step=step,
-            results=postgen_results,
-        )
-        return instance
+            ))
+        finally:
+            if profiler is not None:
+                profiler.stop()
+
+    def instantiate(self, step, args, kwargs):
+        """Instantiate the model from the resolved arguments of a step."""
+        return self.factory_meta.instantiate(step=step, args=args, kwargs=kwargs)
+
+    def complete(self, value):
+        """Finalize the value returned by a hook or post-generation declaration.
+
+        Returned as is; asynchronous builders wait for awaitables instead.
+        """
+        return value
 
     def recurse(self, factory_meta, extras):
         """Recurse into a sub-factory call."""
@@ -316,19 +784,28 @@ class Resolver(object):
         __values (dict): maps attribute name to computed value
         __pending (str list): names of the attributes whose value is being
             computed. This allows to detect cyclic lazy attribute definition.
+        __pending_names (str set): the same names, for fast lookups.
         __step (BuildStep): the BuildStep related to this resolver.
             This allows to have the value of a field depend on the value of
             another field
+        __compiled (bool): whether computed values should also be stored
+            as plain attributes, so that later lookups are direct.
     """
 
     __initialized = False
 
-    def __init__(self, declarations, step, sequence):
+    def __init__(self, declarations, step, sequence, values=None):
         self.__declarations = declarations
         self.__step = step
 
         self.__values = {}
         self.__pending = []
+        self.__pending_names = set()
+
+        self.__compiled = values is not None
+        if self.__compiled:
+            self.__values.update(values)
+            self.__dict__.update(values)
 
         self.__initialized = True
 
@@ -345,7 +822,7 @@ class Resolver(object):
         This will compute it if needed, unless it is already on the list of
         attributes being computed.
         """
-        if name in self.__pending:
+        if name in self.__pending_names:
             raise errors.CyclicDefinitionError(
                 "Cyclic lazy attribute definition for %r; cycle found in %r." %
                 (name, self.__pending))
@@ -356,6 +833,10 @@ class Resolver(object):
             value = declaration.declaration
             if isinstance(value, declarations.BaseDeclaration):
                 self.__pending.append(name)
+                self.__pending_names.add(name)
+                profiler = profiling.current
+                if profiler is not None:
+                    profiler.start(self.__step.builder.factory_meta.factory, profiling.KIND_ATTRIBUTE, name)
                 try:
                     value = value.evaluate(
                         instance=self,
@@ -363,10 +844,15 @@ class Resolver(object):
                         extra=declaration.context,
                     )
                 finally:
+                    if profiler is not None:
+                        profiler.stop()
                     last = self.__pending.pop()
+                    self.__pending_names.discard(last)
                 assert name == last
 
             self.__values[name] = value
+            if self.__compiled:
+                self.__dict__[name] = value
             return value
         else:
             raise AttributeError(
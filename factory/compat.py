@@ -5,7 +5,9 @@
 """Compatibility tools"""
 
 import datetime
+import inspect
 import sys
+import time
 
 PY2 = (sys.version_info[0] == 2)
 
@@ -15,6 +17,8 @@ if PY2:  # pragma: no cover
 
     from StringIO import StringIO as BytesIO  # noqa
 
+    lazy_range = xrange  # noqa
+
     def force_text(str_or_unicode):
         if isinstance(str_or_unicode, unicode):  # noqa
             return str_or_unicode
@@ -26,10 +30,19 @@ else:  # pragma: no cover
 
     from io import BytesIO  # noqa
 
+    lazy_range = range
+
     def force_text(text):
         return text
 
 
+# Python >= 3.3
+perf_counter = getattr(time, 'perf_counter', time.time)
+
+# Python >= 3.5
+is_awaitable = getattr(inspect, 'isawaitable', lambda obj: False)
+is_coroutine_function = getattr(inspect, 'iscoroutinefunction', lambda obj: False)
+
 try:  # pragma: no cover
     # Python >= 3.2
     UTC = datetime.timezone.utc
@@ -0,0 +1,235 @@
+# -*- coding: utf-8 -*-
+# Copyright: See the LICENSE file.
+
+
+"""Sequence counters shared between processes.
+
+By default, each process has its own sequence counters; processes seeding the
+same database (e.g pytest-xdist workers) then generate the same sequences.
+A factory declaring ``class Meta: sequence_backend = SQLiteCounterBackend(path)``
+draws its sequence numbers from a SQLite file instead: each process reserves
+disjoint blocks of numbers from it.
+
+Each counter also stores an epoch, increased whenever it is reset or cleared:
+processes notice the change, and drop the numbers left in their block.  So
+that most sequence numbers are served from memory, processes look at the
+file's modification time at most once per ``check_interval`` seconds, and
+only read the epoch once it changed: a reset is seen by other processes
+after ``check_interval`` seconds, or at their next block boundary.
+"""
+
+from __future__ import unicode_literals
+
+import os
+import sqlite3
+import threading
+import time
+
+from . import compat
+
+
+DEFAULT_BLOCK_SIZE = 100
+DEFAULT_CHECK_INTERVAL = 0.1
+
+# Python >= 3.3
+_monotonic = getattr(time, 'monotonic', time.time)
+
+
+class SQLiteCounterBackend(object):
+    """Store the next sequence number of each factory in a SQLite database.
+
+    Reservations run within an immediate transaction: SQLite's file locking
+    makes them atomic across processes of the same machine.
+
+    Each row holds the next value of a counter (NULL once cleared), and its
+    epoch, increased by every reset() or clear().
+
+    Attributes:
+        path (str): the path to the SQLite database; created if needed
+        block_size (int): the number of sequences reserved by a process
+            whenever it runs out of them
+        timeout (float): how long to wait for a lock held by another process,
+            in seconds
+        check_interval (float): how often processes look for a reset of the
+            counters they hold a block of, in seconds
+    """
+
+    TABLE = 'factory_sequences'
+
+    def __init__(self, path, block_size=DEFAULT_BLOCK_SIZE, timeout=30, check_interval=DEFAULT_CHECK_INTERVAL):
+        self.path = path
+        self.block_size = block_size
+        self.timeout = timeout
+        self.check_interval = check_interval
+        self._local = threading.local()
+
+    def _connect(self):
+        # A connection per update: updates are rare, and connections
+        # can't be shared between threads, nor survive a fork.
+        connection = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+        connection.execute(
+            'CREATE TABLE IF NOT EXISTS %s '
+            '(name TEXT PRIMARY KEY, next_value INTEGER, epoch INTEGER NOT NULL DEFAULT 0)' % self.TABLE)
+        return connection
+
+    def _get_reader(self):
+        """A connection for get_epoch(), kept for the current thread and process."""
+        if getattr(self._local, 'pid', None) != os.getpid():
+            self._local.connection = self._connect()
+            self._local.pid = os.getpid()
+        return self._local.connection
+
+    def _update(self, name, compute, new_epoch=False):
+        """Atomically replace the next value for name by compute(current value or None).
+
+        Args:
+            new_epoch (bool): whether to increase the counter's epoch
+
+        Returns:
+            (int, int): the value returned by compute(), and the counter's epoch
+        """
+        connection = self._connect()
+        try:
+            connection.execute('BEGIN IMMEDIATE')
+            try:
+                row = connection.execute(
+                    'SELECT next_value, epoch FROM %s WHERE name = ?' % self.TABLE, (name,)).fetchone()
+                current, epoch = row or (None, 0)
+                value = compute(current)
+                if new_epoch:
+                    epoch += 1
+                connection.execute(
+                    'INSERT OR REPLACE INTO %s (name, next_value, epoch) VALUES (?, ?, ?)' % self.TABLE,
+                    (name, value, epoch))
+            except Exception:
+                connection.execute('ROLLBACK')
+                raise
+            connection.execute('COMMIT')
+        finally:
+            connection.close()
+        return value, epoch
+
+    def reserve(self, name, size, initial):
+        """Reserve ``size`` consecutive sequence numbers for name.
+
+        Args:
+            name (str): the counter name
+            size (int): the number of values to reserve
+            initial (int): the first value, if the counter doesn't exist yet
+
+        Returns:
+            (int, int): the first reserved value, and the counter's epoch
+        """
+        stop, epoch = self._update(name, lambda current: (initial if current is None else current) + size)
+        return stop - size, epoch
+
+    def get_file_version(self):
+        """A cheap signature of the database file, changing with every write; None if it doesn't exist."""
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        return (getattr(stat, 'st_mtime_ns', stat.st_mtime), stat.st_size, stat.st_ino)
+
+    def get_epoch(self, name):
+        """Retrieve the current epoch of a counter; 0 if it doesn't exist yet."""
+        row = self._get_reader().execute('SELECT epoch FROM %s WHERE name = ?' % self.TABLE, (name,)).fetchone()
+        return 0 if row is None else row[0]
+
+    def reset(self, name, next_value):
+        """Set the next sequence number for name, for all processes."""
+        self._update(name, lambda current: next_value, new_epoch=True)
+
+    def clear(self):
+        """Drop all stored counters; they start again from their initial value."""
+        connection = self._connect()
+        try:
+            connection.execute('UPDATE %s SET next_value = NULL, epoch = epoch + 1' % self.TABLE)
+        finally:
+            connection.close()
+
+    def get_counter(self, factory, initial):
+        """Build the counter for a factory, as used by FactoryOptions."""
+        return SharedCounter(self, get_counter_name(factory), initial)
+
+
+def get_counter_name(factory):
+    """Name a factory's counter; the same in every process."""
+    return '%s.%s' % (factory.__module__, getattr(factory, '__qualname__', factory.__name__))
+
+
+class SharedCounter(object):
+    """A sequence counter drawing blocks of values from a backend.
+
+    Implements the same interface as base._Counter: values are served from the
+    current block, reserved from the backend whenever it runs out, or once the
+    counter's epoch changed (i.e it was reset, possibly by another process);
+    the epoch is checked at most once per ``backend.check_interval``.
+
+    Attributes:
+        backend (SQLiteCounterBackend): where blocks are reserved
+        name (str): the counter name, within the backend
+        initial (int): the first value, if the backend has none yet
+    """
+
+    def __init__(self, backend, name, initial):
+        self.backend = backend
+        self.name = name
+        self.initial = initial
+        self._lock = threading.Lock()
+        # The current block is [_next, _stop), reserved during _epoch
+        self._next = self._stop = 0
+        self._epoch = None
+        # The backend's file version when _epoch was last checked, and the
+        # time of the last check
+        self._file_version = None
+        self._checked_at = None
+        self._pid = os.getpid()
+
+    def next(self):
+        return self.reserve(1)[0]
+
+    def reserve(self, size):
+        """Reserve ``size`` consecutive values; returns them as a range."""
+        if size <= 0:
+            return compat.lazy_range(0)
+
+        with self._lock:
+            if self._pid != os.getpid():
+                # A forked process mustn't reuse its parent's block.
+                self._next = self._stop = 0
+                self._pid = os.getpid()
+
+            if self._stop - self._next >= size and self._should_check():
+                file_version = self.backend.get_file_version()
+                if file_version != self._file_version:
+                    # The database was written to: check whether the counter was reset.
+                    self._file_version = file_version
+                    if self.backend.get_epoch(self.name) != self._epoch:
+                        self._next = self._stop = 0
+
+            if self._stop - self._next < size:
+                if size > self.backend.block_size:
+                    # Too large for a block: keep the current one for later calls.
+                    start, _epoch = self.backend.reserve(self.name, size, self.initial)
+                    return compat.lazy_range(start, start + size)
+                self._next, self._epoch = self.backend.reserve(self.name, self.backend.block_size, self.initial)
+                self._stop = self._next + self.backend.block_size
+                # The block's epoch is current: restart the check interval.
+                self._checked_at = _monotonic()
+
+            start = self._next
+            self._next += size
+            return compat.lazy_range(start, start + size)
+
+    def _should_check(self):
+        now = _monotonic()
+        if self._checked_at is not None and now - self._checked_at < self.backend.check_interval:
+            return False
+        self._checked_at = now
+        return True
+
+    def reset(self, next_value=0):
+        with self._lock:
+            self.backend.reset(self.name, next_value)
+            self._next = self._stop = 0
@@ -3,7 +3,6 @@
 
 from __future__ import unicode_literals
 
-import itertools
 import logging
 
 from . import enums
@@ -55,7 +54,8 @@ class LazyFunction(BaseDeclaration):
         self.function = function
 
     def evaluate(self, instance, step, extra):
-        logger.debug("LazyFunction: Evaluating %s on %s", utils.log_repr(self.function), utils.log_repr(step))
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("LazyFunction: Evaluating %s on %s", utils.log_repr(self.function), utils.log_repr(step))
         return self.function()
 
 
@@ -72,7 +72,8 @@ class LazyAttribute(BaseDeclaration):
         self.function = function
 
     def evaluate(self, instance, step, extra):
-        logger.debug("LazyAttribute: Evaluating %s on %s", utils.log_repr(self.function), utils.log_repr(instance))
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("LazyAttribute: Evaluating %s on %s", utils.log_repr(self.function), utils.log_repr(instance))
         return self.function(instance)
 
 
@@ -138,7 +139,8 @@ class SelfAttribute(BaseDeclaration):
         else:
             target = instance
 
-        logger.debug("SelfAttribute: Picking attribute %r on %s", self.attribute_name, utils.log_repr(target))
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("SelfAttribute: Picking attribute %r on %s", self.attribute_name, utils.log_repr(target))
         return deepgetattr(target, self.attribute_name, self.default)
 
     def __repr__(self):
@@ -157,17 +159,15 @@ class Iterator(BaseDeclaration):
     Attributes:
         iterator (iterable): the iterator whose value should be used.
         getter (callable or None): a function to parse returned values
+        max_buffer (int or None): the maximum number of values kept in memory
+            for replaying non-reiterable iterators.
     """
 
-    def __init__(self, iterator, cycle=True, getter=None):
+    def __init__(self, iterator, cycle=True, getter=None, max_buffer=None):
         super(Iterator, self).__init__()
         self.getter = getter
         self.iterator = None
-
-        if cycle:
-            self.iterator_builder = lambda: utils.ResetableIterator(itertools.cycle(iterator))
-        else:
-            self.iterator_builder = lambda: utils.ResetableIterator(iterator)
+        self.iterator_builder = lambda: utils.ResetableIterator(iterator, cycle=cycle, max_buffer=max_buffer)
 
     def evaluate(self, instance, step, extra):
         # Begin unrolling as late as possible.
@@ -175,7 +175,8 @@ class Iterator(BaseDeclaration):
         if self.iterator is None:
             self.iterator = self.iterator_builder()
 
-        logger.debug("Iterator: Fetching next value from %s", utils.log_repr(self.iterator))
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Iterator: Fetching next value from %s", utils.log_repr(self.iterator))
         value = next(iter(self.iterator))
         if self.getter is None:
             return value
@@ -203,7 +204,8 @@ class Sequence(BaseDeclaration):
         self.type = type
 
     def evaluate(self, instance, step, extra):
-        logger.debug("Sequence: Computing next value of %r for seq=%s", self.function, step.sequence)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Sequence: Computing next value of %r for seq=%s", self.function, step.sequence)
         return self.function(self.type(step.sequence))
 
 
@@ -217,9 +219,10 @@ class LazyAttributeSequence(Sequence):
             of counter for the 'function' attribute.
     """
     def evaluate(self, instance, step, extra):
-        logger.debug(
-            "LazyAttributeSequence: Computing next value of %r for seq=%s, obj=%s",
-            self.function, step.sequence, utils.log_repr(instance))
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "LazyAttributeSequence: Computing next value of %r for seq=%s, obj=%s",
+                self.function, step.sequence, utils.log_repr(instance))
         return self.function(instance, self.type(step.sequence))
 
 
@@ -385,12 +388,13 @@ class SubFactory(ParameteredAttribute):
                 for the step.
         """
         subfactory = self.get_factory()
-        logger.debug(
-            "SubFactory: Instantiating %s.%s(%s), create=%r",
-            subfactory.__module__, subfactory.__name__,
-            utils.log_pprint(kwargs=params),
-            step,
-        )
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "SubFactory: Instantiating %s.%s(%s), create=%r",
+                subfactory.__module__, subfactory.__name__,
+                utils.log_pprint(kwargs=params),
+                step,
+            )
         force_sequence = step.sequence if self.FORCE_SEQUENCE else None
         return step.recurse(subfactory, params, force_sequence=force_sequence)
 
@@ -535,7 +539,15 @@ class Trait(Parameter):
 
 
 class PostGenerationDeclaration(utils.OrderedBase):
-    """Declarations to be called once the model object has been generated."""
+    """Declarations to be called once the model object has been generated.
+
+    Attributes:
+        concurrent (bool): whether the declaration only depends on the generated
+            object, and may thus run alongside other concurrent declarations
+            (with ``Meta.postgeneration_concurrency``)
+    """
+
+    concurrent = False
 
     def call(self, instance, step, context):  # pragma: no cover
         """Call this hook; no return value is expected.
@@ -556,15 +568,16 @@ class PostGeneration(PostGenerationDeclaration):
         self.function = function
 
     def call(self, instance, step, context):
-        logger.debug(
-            "PostGeneration: Calling %s.%s(%s)",
-            self.function.__module__,
-            self.function.__name__,
-            utils.log_pprint(
-                (instance, step),
-                context._asdict(),
-            ),
-        )
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "PostGeneration: Calling %s.%s(%s)",
+                self.function.__module__,
+                self.function.__name__,
+                utils.log_pprint(
+                    (instance, step),
+                    context._asdict(),
+                ),
+            )
         create = step.builder.strategy == enums.CREATE_STRATEGY
         return self.function(
             instance, create, context.value, **context.extra)
@@ -580,6 +593,8 @@ class RelatedFactory(PostGenerationDeclaration):
             calling the related factory
     """
 
+    concurrent = True
+
     def __init__(self, factory, factory_related_name='', **defaults):
         super(RelatedFactory, self).__init__()
 
@@ -596,11 +611,12 @@ class RelatedFactory(PostGenerationDeclaration):
 
         if context.value_provided:
             # The user passed in a custom value
-            logger.debug(
-                "RelatedFactory: Using provided %s instead of generating %s.%s.",
-                utils.log_repr(context.value),
-                factory.__module__, factory.__name__,
-            )
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    "RelatedFactory: Using provided %s instead of generating %s.%s.",
+                    utils.log_repr(context.value),
+                    factory.__module__, factory.__name__,
+                )
             return context.value
 
         passed_kwargs = dict(self.defaults)
@@ -608,12 +624,13 @@ class RelatedFactory(PostGenerationDeclaration):
         if self.name:
             passed_kwargs[self.name] = instance
 
-        logger.debug(
-            "RelatedFactory: Generating %s.%s(%s)",
-            factory.__module__,
-            factory.__name__,
-            utils.log_pprint((step,), passed_kwargs),
-        )
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "RelatedFactory: Generating %s.%s(%s)",
+                factory.__module__,
+                factory.__name__,
+                utils.log_pprint((step,), passed_kwargs),
+            )
         return step.recurse(factory, passed_kwargs)
 
 
@@ -657,10 +674,11 @@ class PostGenerationMethodCall(PostGenerationDeclaration):
         kwargs = dict(self.method_kwargs)
         kwargs.update(context.extra)
         method = getattr(instance, self.method_name)
-        logger.debug(
-            "PostGenerationMethodCall: Calling %s.%s(%s)",
-            utils.log_repr(instance),
-            self.method_name,
-            utils.log_pprint(args, kwargs),
-        )
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "PostGenerationMethodCall: Calling %s.%s(%s)",
+                utils.log_repr(instance),
+                self.method_name,
+                utils.log_pprint(args, kwargs),
+            )
         return method(*args, **kwargs)
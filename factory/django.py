@@ -10,13 +10,12 @@ from __future__ import unicode_literals
 import os
 import logging
 import functools
+import operator
 
 try:
     import django
-    from django.core import files as django_files
 except ImportError as e:  # pragma: no cover
     django = None
-    django_files = None
     import_failure = e
 
 
@@ -30,10 +29,13 @@ logger = logging.getLogger('factory.generate')
 
 DEFAULT_DB_ALIAS = 'default'  # Same as django.db.DEFAULT_DB_ALIAS
 
+# Maximum number of lookups sent in a single query by batched get_or_create.
+GET_OR_CREATE_LOOKUP_BATCH_SIZE = 500
+
 
 def require_django():
     """Simple helper to ensure Django is available."""
-    if django_files is None:  # pragma: no cover
+    if django is None:  # pragma: no cover
         raise import_failure
 
 
@@ -64,11 +66,99 @@ def _lazy_load_get_model():
     _LAZY_LOADS['get_model'] = _get_model
 
 
+class _TransactionToken(object):
+    """Tracks whether a transaction (or savepoint) is still open.
+
+    This relies on Django's on_commit() bookkeeping: callbacks registered within
+    a transaction or savepoint are discarded when it is rolled back, and called
+    once the outermost transaction commits.
+    Committed entries are dropped as well: the rows may then be deleted by other
+    means, e.g when TransactionTestCase flushes the tables.
+    """
+
+    def __init__(self, using):
+        self.using = using
+        self.committed = False
+
+    def __call__(self):
+        # Called by Django on commit.
+        self.committed = True
+
+    def is_valid(self):
+        if self.committed:
+            return False
+        from django.db import transaction
+        connection = transaction.get_connection(self.using)
+        return any(hook[1] is self for hook in connection.run_on_commit)
+
+
+class GetOrCreateCache(object):
+    """A process-local identity map for django_get_or_create lookups.
+
+    Attributes:
+        entries (dict): maps (model, database, lookup) to an (instance, token)
+            tuple; an entry is dropped once its token is no longer valid, i.e
+            when the transaction it was fetched in has been rolled back.
+        tokens (dict): the current _TransactionToken for each transaction state
+    """
+
+    def __init__(self):
+        self.entries = {}
+        self.tokens = {}
+
+    def get(self, key):
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        instance, token = entry
+        if not token.is_valid():
+            del self.entries[key]
+            return None
+        return instance
+
+    def set(self, key, instance, using):
+        token = self._get_token(using)
+        if token is not None:
+            self.entries[key] = (instance, token)
+
+    def clear(self):
+        self.entries.clear()
+        self.tokens.clear()
+
+    def _get_token(self, using):
+        from django.db import transaction
+        connection = transaction.get_connection(using)
+
+        if not connection.in_atomic_block:
+            # Autocommit: nothing bounds the lifetime of the rows.
+            # Manual transaction management: we can't track rollbacks.
+            return None
+
+        state = (using, id(connection), tuple(connection.savepoint_ids))
+        token = self.tokens.get(state)
+        if token is None or not token.is_valid():
+            token = _TransactionToken(using)
+            transaction.on_commit(token, using=using)
+            self.tokens[state] = token
+        return token
+
+
+_GET_OR_CREATE_CACHE = GetOrCreateCache()
+
+
+def clear_get_or_create_cache():
+    """Forget all objects remembered for django_get_or_create_cache factories."""
+    _GET_OR_CREATE_CACHE.clear()
+
+
 class DjangoOptions(base.FactoryOptions):
     def _build_default_options(self):
         return super(DjangoOptions, self)._build_default_options() + [
             base.OptionDefault('django_get_or_create', (), inherit=True),
             base.OptionDefault('database', DEFAULT_DB_ALIAS, inherit=True),
+            base.OptionDefault('django_bulk_create', False, inherit=True),
+            base.OptionDefault('django_bulk_create_batch_size', None, inherit=True),
+            base.OptionDefault('django_get_or_create_cache', False, inherit=True),
         ]
 
     def _get_counter_reference(self):
@@ -149,11 +239,40 @@ class DjangoModelFactory(base.Factory):
                     "Unable to find initialization value for '%s' in factory %s" %
                     (field, cls.__name__))
             key_fields[field] = kwargs.pop(field)
-        key_fields['defaults'] = kwargs
 
+        cache_key = None if args else cls._get_or_create_cache_key(model_class, key_fields)
+        if cache_key is not None:
+            instance = _GET_OR_CREATE_CACHE.get(cache_key)
+            if instance is not None:
+                return instance
+
+        key_fields['defaults'] = kwargs
         instance, _created = manager.get_or_create(*args, **key_fields)
+
+        if cache_key is not None:
+            _GET_OR_CREATE_CACHE.set(cache_key, instance, using=cls._meta.database)
         return instance
 
+    @classmethod
+    def _get_or_create_cache_key(cls, model_class, values):
+        """Compute the identity cache key for a get_or_create lookup.
+
+        Returns None if the identity cache is disabled, or can't handle the lookup.
+        """
+        if not cls._meta.django_get_or_create_cache:
+            return None
+        key = (
+            model_class,
+            cls._meta.database,
+            tuple((name, values[name]) for name in cls._meta.django_get_or_create),
+        )
+        try:
+            hash(key)
+        except TypeError:
+            # Unsaved or unhashable lookup values.
+            return None
+        return key
+
     @classmethod
     def _create(cls, model_class, *args, **kwargs):
         """Create an instance of the model, and save it to the database."""
@@ -164,6 +283,134 @@ class DjangoModelFactory(base.Factory):
 
         return manager.create(*args, **kwargs)
 
+    @classmethod
+    def _get_or_create_keys(cls, model_class, arguments):
+        """Compute the get_or_create lookup of each item of a batch.
+
+        Returns:
+            (Field list, tuple list): the lookup fields, and the lookup values of
+                each item; or None if they can't be handled in batch (relations,
+                positional arguments, ...).
+        """
+        from django.core.exceptions import FieldDoesNotExist
+
+        fields = []
+        for name in cls._meta.django_get_or_create:
+            try:
+                field = model_class._meta.get_field(name)
+            except FieldDoesNotExist:
+                # 'pk', or a custom lookup
+                return None
+            if field.is_relation:
+                return None
+            fields.append(field)
+
+        keys = []
+        for args, kwargs in arguments:
+            if args or any(field.name not in kwargs for field in fields):
+                return None
+            key = tuple(field.to_python(kwargs[field.name]) for field in fields)
+            if None in key:
+                return None
+            try:
+                hash(key)
+            except TypeError:
+                return None
+            keys.append(key)
+        return fields, keys
+
+    @classmethod
+    def _get_or_create_batch(cls, model_class, arguments):
+        """Create a batch of instances with get_or_create() semantics.
+
+        Existing objects are fetched in as few queries as possible; missing
+        ones are then created, once per distinct lookup.
+        """
+        found = cls._get_or_create_keys(model_class, arguments)
+        if found is None:
+            return [cls._get_or_create(model_class, *args, **kwargs) for args, kwargs in arguments]
+        fields, keys = found
+
+        from django.db.models import Q
+
+        manager = cls._get_manager(model_class)
+        unique_keys = []
+        seen = set()
+        for key in keys:
+            if key not in seen:
+                seen.add(key)
+                unique_keys.append(key)
+
+        instances = {}
+        cache_keys = {}
+        for key, (_args, kwargs) in zip(keys, arguments):
+            cache_key = cls._get_or_create_cache_key(model_class, kwargs)
+            if cache_key is not None and key not in cache_keys:
+                cache_keys[key] = cache_key
+                instance = _GET_OR_CREATE_CACHE.get(cache_key)
+                if instance is not None:
+                    instances[key] = instance
+        unique_keys = [key for key in unique_keys if key not in instances]
+
+        for start in range(0, len(unique_keys), GET_OR_CREATE_LOOKUP_BATCH_SIZE):
+            chunk = unique_keys[start:start + GET_OR_CREATE_LOOKUP_BATCH_SIZE]
+            if len(fields) == 1:
+                queryset = manager.filter(**{'%s__in' % fields[0].name: [key[0] for key in chunk]})
+            else:
+                queryset = manager.filter(functools.reduce(operator.or_, [
+                    Q(**{field.name: value for field, value in zip(fields, key)})
+                    for key in chunk
+                ]))
+            for instance in queryset:
+                instances[tuple(getattr(instance, field.attname) for field in fields)] = instance
+
+        missing = []
+        missing_kwargs = []
+        for key, (_args, kwargs) in zip(keys, arguments):
+            if key not in instances and key in seen:
+                seen.discard(key)
+                missing.append(key)
+                missing_kwargs.append(kwargs)
+
+        if missing:
+            if cls._meta.django_bulk_create:
+                created = manager.bulk_create(
+                    [model_class(**kwargs) for kwargs in missing_kwargs],
+                    batch_size=cls._meta.django_bulk_create_batch_size,
+                )
+            else:
+                created = [manager.create(**kwargs) for kwargs in missing_kwargs]
+            instances.update(zip(missing, created))
+
+        for key, cache_key in cache_keys.items():
+            _GET_OR_CREATE_CACHE.set(cache_key, instances[key], using=cls._meta.database)
+
+        return [instances[key] for key in keys]
+
+    @classmethod
+    def _has_custom_create(cls):
+        """Whether _create() or _get_or_create() are customized; batches then call them for each row."""
+        return (
+            base.is_overridden(cls, DjangoModelFactory, '_create')
+            or base.is_overridden(cls, DjangoModelFactory, '_get_or_create')
+        )
+
+    @classmethod
+    def _create_batch(cls, model_class, arguments):
+        """Create a batch of instances, through bulk_create() if enabled."""
+        if cls._has_custom_create():
+            return super(DjangoModelFactory, cls)._create_batch(model_class, arguments)
+
+        if cls._meta.django_get_or_create:
+            return cls._get_or_create_batch(model_class, arguments)
+
+        if not cls._meta.django_bulk_create:
+            return super(DjangoModelFactory, cls)._create_batch(model_class, arguments)
+
+        manager = cls._get_manager(model_class)
+        instances = [model_class(*args, **kwargs) for args, kwargs in arguments]
+        return manager.bulk_create(instances, batch_size=cls._meta.django_bulk_create_batch_size)
+
     @classmethod
     def _after_postgeneration(cls, instance, create, results=None):
         """Save again the instance if creating and at least one hook ran."""
@@ -171,6 +418,37 @@ class DjangoModelFactory(base.Factory):
             # Some post-generation hooks ran, and may have modified us.
             instance.save()
 
+    @classmethod
+    def _after_batch_postgeneration(cls, instances, create, results):
+        """Save again, with a single bulk_update(), the instances of a bulk_create() batch."""
+        if (not create or not cls._meta.django_bulk_create or cls._has_custom_create()
+                or base.is_overridden(cls, DjangoModelFactory, '_after_postgeneration')):
+            return super(DjangoModelFactory, cls)._after_batch_postgeneration(instances, create, results)
+
+        to_save = []
+        seen = set()
+        for instance, instance_results in zip(instances, results):
+            # get_or_create batches may return the same instance several times.
+            if instance_results and id(instance) not in seen:
+                seen.add(id(instance))
+                to_save.append(instance)
+        if not to_save:
+            return
+
+        model_class = cls._meta.get_model_class()
+        manager = cls._get_manager(model_class)
+        if not hasattr(manager, 'bulk_update') or any(instance.pk is None for instance in to_save):
+            # Django < 2.2, or a backend not setting primary keys in bulk_create().
+            for instance in to_save:
+                instance.save()
+            return
+
+        manager.bulk_update(
+            to_save,
+            [field.name for field in model_class._meta.concrete_fields if not field.primary_key],
+            batch_size=cls._meta.django_bulk_create_batch_size,
+        )
+
 
 class FileField(declarations.Dict):
     """Helper to fill in django.db.models.FileField from a Factory."""
@@ -186,6 +464,9 @@ class FileField(declarations.Dict):
         return params.get('data', b'')
 
     def _make_content(self, params):
+        # Loading django.core.files is costly; only do it when needed.
+        from django.core import files as django_files
+
         path = ''
 
         _content_params = [params.get('from_path'), params.get('from_file'), params.get('from_func')]
@@ -226,6 +507,7 @@ class FileField(declarations.Dict):
         """Fill in the field."""
         params = super(FileField, self).generate(step, params)
         filename, content = self._make_content(params)
+        from django.core import files as django_files
         return django_files.File(content.file, filename)
 
 
@@ -302,19 +584,60 @@ class mute_signals(object):
     def copy(self):
         return mute_signals(*self.signals)
 
+    def _wrap_generate(self, generate_classmethod):
+        # Retrieve __func__, the *actual* callable object.
+        generate_method = generate_classmethod.__func__
+
+        @classmethod
+        @functools.wraps(generate_method)
+        def wrapped_generate(*args, **kwargs):
+            # A mute_signals() object is not reentrant; use a copy everytime.
+            with self.copy():
+                return generate_method(*args, **kwargs)
+
+        return wrapped_generate
+
+    def _wrap_generate_iter(self, generate_iter_classmethod):
+        generate_iter_method = generate_iter_classmethod.__func__
+
+        @classmethod
+        @functools.wraps(generate_iter_method)
+        def wrapped_generate_iter(*args, **kwargs):
+            iterator = generate_iter_method(*args, **kwargs)
+            return self._mute_iter(iterator)
+
+        return wrapped_generate_iter
+
+    def _wrap_agenerate(self, agenerate_classmethod):
+        agenerate_method = agenerate_classmethod.__func__
+
+        @classmethod
+        @functools.wraps(agenerate_method)
+        def wrapped_agenerate(*args, **kwargs):
+            from . import aio
+            # Signals stay muted until the returned awaitable completes.
+            return aio.within(self.copy(), agenerate_method(*args, **kwargs))
+
+        return wrapped_agenerate
+
+    def _mute_iter(self, iterator):
+        # Only mute signals while generating an object, not while the caller
+        # handles it.
+        while True:
+            with self.copy():
+                try:
+                    obj = next(iterator)
+                except StopIteration:
+                    return
+            yield obj
+
     def __call__(self, callable_obj):
         if isinstance(callable_obj, base.FactoryMetaClass):
-            # Retrieve __func__, the *actual* callable object.
-            generate_method = callable_obj._generate.__func__
-
-            @classmethod
-            @functools.wraps(generate_method)
-            def wrapped_generate(*args, **kwargs):
-                # A mute_signals() object is not reentrant; use a copy everytime.
-                with self.copy():
-                    return generate_method(*args, **kwargs)
-
-            callable_obj._generate = wrapped_generate
+            for method_name in ('_generate', '_generate_batch'):
+                setattr(callable_obj, method_name, self._wrap_generate(getattr(callable_obj, method_name)))
+            callable_obj._generate_iter = self._wrap_generate_iter(callable_obj._generate_iter)
+            for method_name in ('_agenerate', '_agenerate_batch'):
+                setattr(callable_obj, method_name, self._wrap_agenerate(getattr(callable_obj, method_name)))
             return callable_obj
 
         else:
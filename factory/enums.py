@@ -6,6 +6,10 @@ BUILD_STRATEGY = 'build'
 CREATE_STRATEGY = 'create'
 STUB_STRATEGY = 'stub'
 
+# Resolution modes
+LAZY_RESOLUTION = 'lazy'
+COMPILED_RESOLUTION = 'compiled'
+
 
 #: String for splitting an attribute name into a
 #: (subfactory_name, subfactory_field) tuple.
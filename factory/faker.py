@@ -19,10 +19,58 @@ from __future__ import unicode_literals
 
 import contextlib
 
-import faker
-import faker.config
-
 from . import declarations
+from . import random
+
+
+class FakerPool(object):
+    """A pool of values generated by a Faker provider.
+
+    The pool is filled as values are requested; once it holds ``size``
+    values, they are served again, in a loop.
+
+    Attributes:
+        size (int): the number of values to keep
+        values (list): the generated values
+        index (int): the position of the next value to serve, once full
+    """
+    def __init__(self, size):
+        self.size = size
+        self.values = []
+        self.index = 0
+
+    def next_value(self, generate, shuffler=None):
+        """Fetch the next value from the pool.
+
+        Args:
+            generate (callable): builds a new value, while the pool isn't full
+            shuffler (random.Random or None): if set, used to reshuffle the
+                values before each new pass over the pool
+        """
+        if len(self.values) < self.size:
+            value = generate()
+            self.values.append(value)
+            self.index = len(self.values)
+            return value
+
+        if self.index >= len(self.values):
+            self.index = 0
+            if shuffler is not None:
+                shuffler.shuffle(self.values)
+        value = self.values[self.index]
+        self.index += 1
+        return value
+
+
+class _LazyDefaultLocale(object):
+    """Resolve faker's default locale when first needed.
+
+    This avoids importing faker until a Faker declaration is actually used.
+    """
+
+    def __get__(self, instance, owner):
+        import faker.config
+        return faker.config.DEFAULT_LOCALE
 
 
 class Faker(declarations.BaseDeclaration):
@@ -31,6 +79,9 @@ class Faker(declarations.BaseDeclaration):
     Args:
         provider (str): the name of the Faker field
         locale (str): the locale to use for the faker
+        pool (int or None): if set, the number of distinct values to generate;
+            later values will be served again from that pool.
+        pool_shuffle (bool): whether to reshuffle the pool before each pass
 
         All other kwargs will be passed to the underlying provider
         (e.g ``factory.Faker('ean', length=10)``
@@ -38,24 +89,68 @@ class Faker(declarations.BaseDeclaration):
 
     Usage:
         >>> foo = factory.Faker('name')
+        >>> bar = factory.Faker('address', pool=10000)
     """
-    def __init__(self, provider, locale=None, **kwargs):
+    def __init__(self, provider, locale=None, pool=None, pool_shuffle=False, **kwargs):
         self.provider = provider
         self.provider_kwargs = kwargs
         self.locale = locale
+        self.pool = pool
+        self.pool_shuffle = pool_shuffle
 
     def generate(self, extra_kwargs):
-        kwargs = {}
-        kwargs.update(self.provider_kwargs)
-        kwargs.update(extra_kwargs)
+        if extra_kwargs:
+            kwargs = dict(self.provider_kwargs)
+            kwargs.update(extra_kwargs)
+        else:
+            kwargs = self.provider_kwargs
         subfaker = self._get_faker(self.locale)
-        return subfaker.format(self.provider, **kwargs)
+
+        pool = self._get_pool(kwargs) if self.pool else None
+        if pool is None:
+            return subfaker.format(self.provider, **kwargs)
+        return pool.next_value(
+            lambda: subfaker.format(self.provider, **kwargs),
+            shuffler=subfaker.random if self.pool_shuffle else None,
+        )
 
     def evaluate(self, instance, step, extra):
         return self.generate(extra or {})
 
+    def _get_pool(self, kwargs):
+        """Retrieve the shared pool for this provider, locale and kwargs.
+
+        Returns None if the kwargs can't be used as a registry key.
+        """
+        key = (self.locale or self._DEFAULT_LOCALE, self.provider, tuple(sorted(kwargs.items())))
+        try:
+            pool = self._POOL_REGISTRY.get(key)
+        except TypeError:
+            # Unhashable kwargs
+            return None
+
+        if pool is None:
+            pool = self._POOL_REGISTRY[key] = FakerPool(self.pool)
+        elif pool.size < self.pool:
+            pool.size = self.pool
+        return pool
+
     _FAKER_REGISTRY = {}
-    _DEFAULT_LOCALE = faker.config.DEFAULT_LOCALE
+    _POOL_REGISTRY = {}
+    _DEFAULT_LOCALE = _LazyDefaultLocale()
+
+    @classmethod
+    def reset_pools(cls):
+        """Drop all pooled values."""
+        cls._POOL_REGISTRY.clear()
+
+    @classmethod
+    def _reseed(cls, state):
+        """Load a new random state into all fakers; registered on factory.random."""
+        for subfaker in cls._FAKER_REGISTRY.values():
+            subfaker.random.setstate(state)
+        # Pooled values were generated with the previous seed.
+        cls.reset_pools()
 
     @classmethod
     @contextlib.contextmanager
@@ -73,6 +168,7 @@ class Faker(declarations.BaseDeclaration):
             locale = cls._DEFAULT_LOCALE
 
         if locale not in cls._FAKER_REGISTRY:
+            import faker
             subfaker = faker.Faker(locale=locale)
             cls._FAKER_REGISTRY[locale] = subfaker
 
@@ -82,3 +178,6 @@ class Faker(declarations.BaseDeclaration):
     def add_provider(cls, provider, locale=None):
         """Add a new Faker provider for the specified locale"""
         cls._get_faker(locale).add_provider(provider)
+
+
+random.register_reseed_hook(Faker._reseed)
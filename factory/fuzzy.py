@@ -15,6 +15,7 @@ from . import compat
 from . import declarations
 from . import random
 
+
 random_seed_warning = (
     "Setting a specific random seed for {} can still have varying results "
     "unless you also set a specific end date. For details and potential solutions "
@@ -52,16 +53,70 @@ def reseed_random(seed):
     random.reseed_random(seed)
 
 
+_LAZY_LOADS = {}
+
+
+def _get_numpy():
+    """Import numpy on first use; returns None if it isn't installed."""
+    if 'numpy' not in _LAZY_LOADS:
+        try:
+            import numpy
+        except ImportError:
+            numpy = None
+        _LAZY_LOADS['numpy'] = numpy
+    return _LAZY_LOADS['numpy']
+
+
+def _random_indices(count, size):
+    """Pick ``size`` random integers from range(count).
+
+    Uses a numpy random Generator, seeded from factory.random, if available.
+    """
+    if not size:
+        return []
+    if not count:
+        raise IndexError("Cannot choose from an empty sequence")
+    numpy = _get_numpy()
+    if numpy is not None and count <= 2 ** 63:
+        generator = numpy.random.default_rng(random.randgen.getrandbits(128))
+        return generator.integers(0, count, size).tolist()
+    if hasattr(random.randgen, 'choices') and count <= 2 ** 53:
+        return random.randgen.choices(compat.lazy_range(count), k=size)
+    return [random.randgen.randrange(count) for _i in compat.lazy_range(size)]
+
+
+# Maps BaseFuzzyAttribute subclasses to whether their fuzz_batch() may be used.
+_BATCHES_FUZZ = {}
+
+
 class BaseFuzzyAttribute(declarations.BaseDeclaration):
     """Base class for fuzzy attributes.
 
-    Custom fuzzers should override the `fuzz()` method.
+    Custom fuzzers should override the `fuzz()` method, and may override
+    `fuzz_batch()` to generate several values at once; batches only use
+    `fuzz_batch()` if `fuzz()` isn't overridden in a subclass.
     """
 
     def fuzz(self):  # pragma: no cover
         raise NotImplementedError()
 
+    def fuzz_batch(self, size):
+        """Generate a list of ``size`` random values."""
+        return [self.fuzz() for _i in range(size)]
+
+    @classmethod
+    def _batches_fuzz(cls):
+        """Whether fuzz_batch() matches fuzz(), i.e fuzz() wasn't overridden below fuzz_batch()."""
+        if cls not in _BATCHES_FUZZ:
+            fuzz_owner = next(klass for klass in cls.__mro__ if 'fuzz' in vars(klass))
+            batch_owner = next(klass for klass in cls.__mro__ if 'fuzz_batch' in vars(klass))
+            _BATCHES_FUZZ[cls] = fuzz_owner in batch_owner.__mro__
+        return _BATCHES_FUZZ[cls]
+
     def evaluate(self, instance, step, extra):
+        if step.builder.batch_size and self._batches_fuzz():
+            # Within a batch: use a block of values generated for the whole chunk.
+            return step.builder.next_batch_value(self, self.fuzz_batch)
         return self.fuzz()
 
 
@@ -109,6 +164,13 @@ class FuzzyText(BaseFuzzyAttribute):
         chars = [random.randgen.choice(self.chars) for _i in range(self.length)]
         return self.prefix + ''.join(chars) + self.suffix
 
+    def fuzz_batch(self, size):
+        chars = ''.join([self.chars[i] for i in _random_indices(len(self.chars), self.length * size)])
+        return [
+            self.prefix + chars[start:start + self.length] + self.suffix
+            for start in range(0, self.length * size, self.length)
+        ]
+
 
 class FuzzyChoice(BaseFuzzyAttribute):
     """Handles fuzzy choice of an attribute.
@@ -128,6 +190,11 @@ class FuzzyChoice(BaseFuzzyAttribute):
             self.choices = list(self.choices_generator)
         return random.randgen.choice(self.choices)
 
+    def fuzz_batch(self, size):
+        if self.choices is None:
+            self.choices = list(self.choices_generator)
+        return [self.choices[i] for i in _random_indices(len(self.choices), size)]
+
 
 class FuzzyInteger(BaseFuzzyAttribute):
     """Random integer within a given range."""
@@ -146,6 +213,17 @@ class FuzzyInteger(BaseFuzzyAttribute):
     def fuzz(self):
         return random.randgen.randrange(self.low, self.high + 1, self.step)
 
+    def fuzz_batch(self, size):
+        try:
+            values = compat.lazy_range(self.low, self.high + 1, self.step)
+            count = len(values)
+        except (TypeError, ValueError, OverflowError):
+            count = 0
+        if not count:
+            # Unusual bounds: let fuzz() handle them, or raise its usual error.
+            return super(FuzzyInteger, self).fuzz_batch(size)
+        return [values[i] for i in _random_indices(count, size)]
+
 
 class FuzzyDecimal(BaseFuzzyAttribute):
     """Random decimal within a given range."""
@@ -182,6 +260,13 @@ class FuzzyFloat(BaseFuzzyAttribute):
     def fuzz(self):
         return random.randgen.uniform(self.low, self.high)
 
+    def fuzz_batch(self, size):
+        numpy = _get_numpy()
+        if numpy is None:
+            return super(FuzzyFloat, self).fuzz_batch(size)
+        generator = numpy.random.default_rng(random.randgen.getrandbits(128))
+        return generator.uniform(self.low, self.high, size).tolist()
+
 
 class FuzzyDate(BaseFuzzyAttribute):
     """Random date within a given date range."""
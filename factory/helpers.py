@@ -9,6 +9,7 @@ import logging
 
 from . import base
 from . import declarations
+from . import profiling
 
 
 @contextlib.contextmanager
@@ -27,6 +28,33 @@ def debug(logger='factory', stream=None):
     logger_obj.removeHandler(handler)
 
 
+@contextlib.contextmanager
+def profile(stream=None, sort='cumulative', limit=None, dump=None):
+    """Measure the time spent in factory calls within the block.
+
+    Args:
+        stream (file): if set, print the report there when leaving the block
+        sort (str): the column to sort the printed report by
+        limit (int): the maximum number of rows in the printed report
+        dump (str): if set, save the timings to that file, in the cProfile format
+
+    Yields:
+        The profiling.Profiler collecting the timings.
+    """
+    profiler = profiling.Profiler()
+    previous = profiling.current
+    profiling.current = profiler
+    try:
+        yield profiler
+    finally:
+        profiling.current = previous
+
+    if stream is not None:
+        profiler.print_report(stream, sort=sort, limit=limit)
+    if dump is not None:
+        profiler.dump_stats(dump)
+
+
 def make_factory(klass, **kwargs):
     """Create a new, simple factory for the given class."""
     factory_name = '%sFactory' % klass.__name__
@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+# Copyright: See the LICENSE file.
+
+
+"""Hooks into the lifecycle of factory calls, e.g for metrics or tracing.
+
+Receivers are called with keyword arguments only:
+- event (str): the event name
+- factory (Factory class): the factory being called
+- strategy (str): the strategy of the call
+
+And, depending on the event:
+- pre_resolve: sequence, before declarations are resolved
+- post_instantiate: sequence, instance, elapsed, once _build()/_create()
+  (or their batch variants) returned
+- post_postgeneration: sequence, instance, elapsed, once post-generation
+  declarations ran
+- batch_start: size, before a batch (or a chunk of iter_build()...) is generated
+- batch_end: size, instances, elapsed, once it is fully generated
+
+``elapsed`` is the time since the matching pre_resolve or batch_start event,
+in seconds.
+
+When no receiver is connected, factory calls only pay for a check of
+``hooks.enabled``.
+"""
+
+from __future__ import unicode_literals
+
+import contextlib
+
+from . import compat
+
+
+PRE_RESOLVE = 'pre_resolve'
+POST_INSTANTIATE = 'post_instantiate'
+POST_POSTGENERATION = 'post_postgeneration'
+BATCH_START = 'batch_start'
+BATCH_END = 'batch_end'
+
+EVENTS = (PRE_RESOLVE, POST_INSTANTIATE, POST_POSTGENERATION, BATCH_START, BATCH_END)
+
+
+# Whether any receiver is connected.
+enabled = False
+
+# Maps an event to a tuple of receivers; tuples are replaced, never altered,
+# so that receivers may (dis)connect while an event is being sent.
+_receivers = {}
+
+timer = compat.perf_counter
+
+
+def _check_event(event):
+    if event not in EVENTS:
+        raise ValueError("Unknown event %r; choose among %s." % (event, ', '.join(EVENTS)))
+
+
+def connect(event, receiver):
+    """Call receiver whenever event is sent; returns the receiver."""
+    global enabled
+    _check_event(event)
+    _receivers[event] = _receivers.get(event, ()) + (receiver,)
+    enabled = True
+    return receiver
+
+
+def disconnect(event, receiver):
+    """Stop calling receiver for event; unknown receivers are ignored."""
+    global enabled
+    _check_event(event)
+    remaining = tuple(r for r in _receivers.get(event, ()) if r != receiver)
+    if remaining:
+        _receivers[event] = remaining
+    else:
+        _receivers.pop(event, None)
+    enabled = bool(_receivers)
+
+
+@contextlib.contextmanager
+def connected(event, receiver):
+    """Connect receiver to event for the duration of a block."""
+    connect(event, receiver)
+    try:
+        yield receiver
+    finally:
+        disconnect(event, receiver)
+
+
+def send(event, **kwargs):
+    """Call all receivers of an event."""
+    for receiver in _receivers.get(event, ()):
+        receiver(event=event, **kwargs)
@@ -0,0 +1,175 @@
+# -*- coding: utf-8 -*-
+# Copyright: See the LICENSE file.
+
+
+"""Generate large batches of objects across several processes.
+
+Objects are generated in fixed-size chunks; each chunk gets its own slice of
+the factory's sequence, and its own random seed drawn from factory.random:
+the output only depends on the random state and ``chunk_size``, not on the
+number of workers.
+
+Factories nested through SubFactory, RelatedFactory, ... get a block of
+sequence values as well, ``size`` times the number of references to them
+within the object graph, split across chunks the same way: values are
+disjoint across chunks, and objects using a nested factory once get the
+sequence values a serial batch would give them.  Factories with a
+``sequence_backend`` keep drawing from it.
+
+Factories (and the objects they build) must be importable from the worker
+processes, i.e defined at module level.
+"""
+
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+import multiprocessing
+
+from . import declarations
+from . import enums
+from . import errors
+from . import faker
+from . import random
+
+
+DEFAULT_CHUNK_SIZE = 1000
+
+# Number of random bits used to seed each chunk.
+SEED_BITS = 64
+
+
+def _count_nested_factories(factory_class, params):
+    """Count the references to each factory nested within factory_class's declarations, and params.
+
+    Both branches of a Maybe are counted; the declarations of a factory
+    nested within itself aren't walked again.
+
+    Returns:
+        (factory, int) list: the nested factories, and their number of references
+    """
+    uses = []
+
+    def walk(values, path):
+        pending = list(values)
+        while pending:
+            declaration = pending.pop()
+            if isinstance(declaration, declarations.Maybe):
+                pending.extend([declaration.yes, declaration.no])
+            elif isinstance(declaration, (declarations.SubFactory, declarations.RelatedFactory)):
+                pending.extend(declaration.defaults.values())
+                nested = declaration.get_factory()
+                if not getattr(declaration, 'FORCE_SEQUENCE', False):
+                    # Dict and List reuse their parent's sequence number.
+                    uses.append(nested)
+                if nested not in path:
+                    walk(nested._meta.declarations.values(), path + (nested,))
+
+    walk(list(params.values()) + list(factory_class._meta.declarations.values()), (factory_class,))
+    counts = []
+    for nested in uses:
+        if nested not in [counted for counted, _count in counts]:
+            counts.append((nested, uses.count(nested)))
+    return counts
+
+
+def _nested_counters(factory_class, params):
+    """List the factories owning the in-process counters used by nested factories.
+
+    This includes the root factory's counter, if nested factories share it.
+
+    Returns:
+        (factory, int) list: the owners, and the number of values drawn for each object
+    """
+    owners = []
+    uses = []
+    for nested, count in _count_nested_factories(factory_class, params):
+        meta = nested._meta.counter_reference
+        if meta.sequence_backend is not None:
+            continue
+        if meta.factory in owners:
+            uses[owners.index(meta.factory)] += count
+        else:
+            owners.append(meta.factory)
+            uses.append(count)
+    return list(zip(owners, uses))
+
+
+def _generate_chunk(task):
+    """Generate a chunk of objects; run within a worker process."""
+    factory_class, strategy, sequences, seed, counters, params = task
+    # Make sure the default faker exists, so that it gets reseeded as well.
+    faker.Faker._get_faker()
+    random.reseed_random(seed)
+    for nested_factory, next_value in counters:
+        nested_factory._meta.reset_sequence(next_value)
+    return [
+        factory_class._generate(strategy, dict(params, __sequence=sequence))
+        for sequence in sequences
+    ]
+
+
+def iter_batch(factory_class, strategy, size, workers=None, chunk_size=DEFAULT_CHUNK_SIZE, **kwargs):
+    """Generate a batch of objects across a pool of worker processes.
+
+    Args:
+        factory_class (factory.Factory): the factory to use
+        strategy (str): either factory.BUILD_STRATEGY or factory.STUB_STRATEGY
+        size (int): the number of objects to generate
+        workers (int): the number of worker processes; defaults to the number of CPUs
+        chunk_size (int): the number of objects generated by each task
+        kwargs: overrides for the factory's declarations
+
+    Yields:
+        The generated objects, in sequence order.
+    """
+    if strategy not in (enums.BUILD_STRATEGY, enums.STUB_STRATEGY):
+        raise errors.UnsupportedStrategy(
+            "Parallel generation doesn't support the %r strategy on %r." % (strategy, factory_class))
+
+    if size <= 0:
+        return
+
+    # Draw all sequences and seeds upfront, from the current process.
+    sequences = factory_class._meta.reserve_sequences(size)
+    nested_starts = [
+        (nested_factory, nested_factory._meta.reserve_sequences(size * uses)[0], uses)
+        for nested_factory, uses in _nested_counters(factory_class, kwargs)
+    ]
+    tasks = [
+        (
+            factory_class,
+            strategy,
+            sequences[start:start + chunk_size],
+            random.randgen.getrandbits(SEED_BITS),
+            [(nested_factory, first + start * uses) for nested_factory, first, uses in nested_starts],
+            kwargs,
+        )
+        for start in range(0, size, chunk_size)
+    ]
+
+    pool = multiprocessing.Pool(processes=min(workers or multiprocessing.cpu_count(), len(tasks)))
+    try:
+        for chunk in pool.imap(_generate_chunk, tasks):
+            for obj in chunk:
+                yield obj
+        pool.close()
+        pool.join()
+    finally:
+        pool.terminate()
+
+
+def generate_batch(factory_class, strategy, size, workers=None, chunk_size=DEFAULT_CHUNK_SIZE, **kwargs):
+    """Generate a list of objects across a pool of worker processes."""
+    return list(iter_batch(factory_class, strategy, size, workers=workers, chunk_size=chunk_size, **kwargs))
+
+
+def build_batch(factory_class, size, workers=None, chunk_size=DEFAULT_CHUNK_SIZE, **kwargs):
+    """Build a list of objects across a pool of worker processes."""
+    return generate_batch(
+        factory_class, enums.BUILD_STRATEGY, size, workers=workers, chunk_size=chunk_size, **kwargs)
+
+
+def stub_batch(factory_class, size, workers=None, chunk_size=DEFAULT_CHUNK_SIZE, **kwargs):
+    """Stub a list of objects across a pool of worker processes."""
+    return generate_batch(
+        factory_class, enums.STUB_STRATEGY, size, workers=workers, chunk_size=chunk_size, **kwargs)
@@ -0,0 +1,195 @@
+# -*- coding: utf-8 -*-
+# Copyright: See the LICENSE file.
+
+
+"""Measure the time spent generating objects, per factory and declaration.
+
+Timings are only recorded while a Profiler is installed as ``current``,
+typically through factory.profile(); otherwise, instrumented code only pays
+for a ``profiling.current is None`` check.
+"""
+
+from __future__ import unicode_literals
+
+import marshal
+import sys
+import threading
+
+from . import compat
+
+
+# The active Profiler, if any.
+current = None
+
+
+# Recorded event kinds.
+KIND_GENERATE = 'generate'
+KIND_ATTRIBUTE = 'attribute'
+KIND_INSTANTIATE = 'instantiate'
+KIND_POSTGENERATION = 'postgeneration'
+
+
+class ProfileEntry(object):
+    """Timings for a (factory, kind, name) triplet.
+
+    Attributes:
+        calls (int): the number of calls
+        primitive_calls (int): the number of calls not nested within
+            another call for the same entry
+        total_time (float): the time spent in the call itself, excluding
+            nested entries, in seconds
+        cumulative_time (float): the time spent in the call, including nested
+            entries, in seconds; nested calls for the same entry are only
+            counted once
+        callers (dict(key => ProfileEntry)): timings for each calling entry
+    """
+
+    def __init__(self):
+        self.calls = 0
+        self.primitive_calls = 0
+        self.total_time = 0.0
+        self.cumulative_time = 0.0
+        self.callers = {}
+
+    def add(self, elapsed, own, primitive):
+        self.calls += 1
+        self.total_time += own
+        if primitive:
+            self.primitive_calls += 1
+            self.cumulative_time += elapsed
+
+    def as_pstats(self):
+        return (self.primitive_calls, self.calls, self.total_time, self.cumulative_time)
+
+    def as_pstats_caller(self):
+        # pstats lists the calls of callers before their primitive calls.
+        return (self.calls, self.primitive_calls, self.total_time, self.cumulative_time)
+
+
+class Profiler(object):
+    """Collect timings for factory calls.
+
+    Entries are keyed by (factory, kind, name), where kind is one of:
+    - 'generate': a whole factory call (name is the strategy, or
+      '<strategy>_batch' for a chunk of a batch)
+    - 'attribute': the evaluation of a declaration
+    - 'instantiate': the call to ``_build``/``_create`` (or their ``_batch``
+      variants)
+    - 'postgeneration': a post-generation declaration
+
+    Attributes:
+        entries (dict((factory, kind, name) => ProfileEntry)): the timings
+    """
+
+    SORT_KEYS = {
+        'calls': lambda item: -item[1].calls,
+        'cumulative': lambda item: -item[1].cumulative_time,
+        'tottime': lambda item: -item[1].total_time,
+        'factory': lambda item: (_factory_label(item[0][0]), item[0][1], item[0][2]),
+        'name': lambda item: (item[0][2], _factory_label(item[0][0]), item[0][1]),
+    }
+
+    def __init__(self):
+        self.entries = {}
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def _get_stack(self):
+        try:
+            return self._local.stack
+        except AttributeError:
+            self._local.stack = []
+            self._local.active = {}
+            return self._local.stack
+
+    def start(self, factory, kind, name):
+        """Start timing an event; must be paired with a call to stop()."""
+        key = (factory, kind, name)
+        stack = self._get_stack()
+        active = self._local.active
+        active[key] = active.get(key, 0) + 1
+        # key, start time, time spent in nested events
+        stack.append([key, compat.perf_counter(), 0.0])
+
+    def stop(self):
+        """Stop timing the last started event."""
+        end = compat.perf_counter()
+        stack = self._local.stack
+        key, start, nested = stack.pop()
+        elapsed = end - start
+        active = self._local.active
+        active[key] -= 1
+        primitive = not active[key]
+        caller = stack[-1][0] if stack else None
+        if stack:
+            stack[-1][2] += elapsed
+
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                entry = self.entries[key] = ProfileEntry()
+            entry.add(elapsed, elapsed - nested, primitive)
+            if caller is not None:
+                caller_entry = entry.callers.get(caller)
+                if caller_entry is None:
+                    caller_entry = entry.callers[caller] = ProfileEntry()
+                caller_entry.add(elapsed, elapsed - nested, primitive)
+
+    def sorted_entries(self, sort='cumulative'):
+        """List (key, entry) pairs, sorted by one of SORT_KEYS."""
+        try:
+            sort_key = self.SORT_KEYS[sort]
+        except KeyError:
+            raise ValueError("Unknown sort key %r; choose among %s." % (sort, ', '.join(sorted(self.SORT_KEYS))))
+        return sorted(self.entries.items(), key=sort_key)
+
+    def report(self, sort='cumulative', limit=None):
+        """Render the timings as a text table.
+
+        Args:
+            sort (str): the column to sort by, from SORT_KEYS
+            limit (int): the maximum number of rows to include
+        """
+        lines = ['%8s  %12s  %12s  %s' % ('calls', 'cumtime (ms)', 'tottime (ms)', 'factory / declaration')]
+        for (factory, kind, name), entry in self.sorted_entries(sort)[:limit]:
+            calls = '%d' % entry.calls
+            if entry.primitive_calls != entry.calls:
+                calls = '%d/%d' % (entry.calls, entry.primitive_calls)
+            lines.append('%8s  %12.3f  %12.3f  %s %s %s' % (
+                calls,
+                entry.cumulative_time * 1000,
+                entry.total_time * 1000,
+                _factory_label(factory),
+                kind,
+                name,
+            ))
+        return '\n'.join(lines)
+
+    def print_report(self, stream=None, sort='cumulative', limit=None):
+        if stream is None:
+            stream = sys.stderr
+        stream.write(self.report(sort=sort, limit=limit) + '\n')
+
+    def get_pstats(self):
+        """Convert the timings to the format of pstats.Stats.stats."""
+        return {
+            _pstats_key(key): entry.as_pstats() + ({
+                _pstats_key(caller): caller_entry.as_pstats_caller()
+                for caller, caller_entry in entry.callers.items()
+            },)
+            for key, entry in self.entries.items()
+        }
+
+    def dump_stats(self, filename):
+        """Save the timings in the cProfile format, readable by pstats.Stats(filename)."""
+        with open(filename, 'wb') as f:
+            marshal.dump(self.get_pstats(), f)
+
+
+def _factory_label(factory):
+    return '%s.%s' % (factory.__module__, factory.__name__)
+
+
+def _pstats_key(key):
+    factory, kind, name = key
+    return (_factory_label(factory), 0, '%s %s' % (kind, name))
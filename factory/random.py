@@ -2,12 +2,22 @@ from __future__ import absolute_import
 
 import random
 
-from factory.faker import Faker
-
 randgen = random.Random()
 
 randgen.state_set = False
 
+# Callables receiving the new random state when reseed_random() is called.
+_reseed_hooks = []
+
+
+def register_reseed_hook(hook):
+    """Have ``hook(state)`` called whenever the random generator is reseeded.
+
+    This allows other random generators (e.g faker's) to follow reseed_random().
+    """
+    if hook not in _reseed_hooks:
+        _reseed_hooks.append(hook)
+
 
 def get_random_state():
     """Retrieve the state of factory.fuzzy's random generator."""
@@ -26,5 +36,5 @@ def reseed_random(seed):
     random_internal_state = r.getstate()
     set_random_state(random_internal_state)
 
-    for locale in Faker._FAKER_REGISTRY:
-        Faker._FAKER_REGISTRY[locale].random.setstate(random_internal_state)
+    for hook in _reseed_hooks:
+        hook(random_internal_state)
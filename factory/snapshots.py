@@ -0,0 +1,170 @@
+# -*- coding: utf-8 -*-
+# Copyright: See the LICENSE file.
+
+
+"""Reuse built objects as templates for later calls with the same arguments.
+
+Used by Factory.build_snapshot() and Factory.stub_snapshot(): the first call
+builds an object graph as usual, and keeps a deep copy of it; later calls
+return deep copies of that template, whose top-level sequence-based fields
+(and those computed from them) are computed again from a new sequence number.
+"""
+
+from __future__ import unicode_literals
+
+import copy
+
+from . import builder
+from . import declarations
+from . import random
+
+
+# Declarations evaluated again on copies of a template; they only depend on
+# the sequence number and the object's other fields.
+RECOMPUTED_DECLARATIONS = (declarations.Sequence, declarations.LazyAttribute, declarations.SelfAttribute)
+
+# Marks the keys whose templates can't be reused, e.g immutable objects.
+_REJECTED = object()
+
+
+class SnapshotCache(object):
+    """Templates, keyed by (factory, strategy, seed, overrides).
+
+    Attributes:
+        templates (dict(key => (object, dict))): the cached templates, and
+            the overrides they were built with
+    """
+
+    def __init__(self):
+        self.templates = {}
+
+    def get_key(self, factory_class, strategy, seed, params):
+        """Compute the cache key for a call; None if params can't be hashed."""
+        try:
+            key = (factory_class, strategy, seed, frozenset(params.items()))
+            hash(key)
+        except TypeError:
+            return None
+        return key
+
+    def get(self, key, params):
+        """Return a fresh copy of the template for a key, or None.
+
+        The template's references to the values of params are replaced by
+        those passed by this call, instead of copies.
+        """
+        entry = self.templates.get(key)
+        if entry is None or entry is _REJECTED:
+            return None
+        template, template_params = entry
+        memo = {id(template_params[name]): value for name, value in params.items()}
+        return copy.deepcopy(template, memo)
+
+    def set(self, key, obj, params):
+        """Store a copy of obj as the template for key, unless the key was rejected.
+
+        The values of params are kept as is in the template, rather than copied.
+        """
+        if self.templates.get(key) is not _REJECTED:
+            memo = {id(value): value for value in params.values()}
+            self.templates[key] = (copy.deepcopy(obj, memo), dict(params))
+
+    def reject(self, key):
+        """Stop caching templates for key."""
+        self.templates[key] = _REJECTED
+
+    def clear(self, factory_class=None):
+        """Drop all templates, or only those of factory_class (and its subclasses)."""
+        if factory_class is None:
+            self.templates.clear()
+            return
+        for key in list(self.templates):
+            if issubclass(key[0], factory_class):
+                del self.templates[key]
+
+
+_SNAPSHOTS = SnapshotCache()
+
+
+def clear_snapshots(factory_class=None):
+    """Drop the templates used by build_snapshot() and stub_snapshot()."""
+    _SNAPSHOTS.clear(factory_class)
+
+
+def generate_seeded(factory_class, strategy, params, seed):
+    """Generate an object, with factory.random reseeded if a seed is provided.
+
+    The state of factory.random is restored afterwards.
+    """
+    if seed is None:
+        return factory_class._generate(strategy, params)
+
+    state = random.get_random_state()
+    random.reseed_random(seed)
+    try:
+        return factory_class._generate(strategy, params)
+    finally:
+        random.set_random_state(state)
+
+
+def patch_sequences(factory_meta, strategy, obj, params, sequence):
+    """Recompute the sequence-dependent fields of a copied object for a new sequence number.
+
+    If the factory has Sequence declarations, its Sequence, LazyAttributeSequence,
+    LazyAttribute and SelfAttribute declarations are evaluated again, against
+    the values of the other fields in the copy; sub-factories, and other
+    declarations, keep the template's values.
+
+    Returns:
+        bool: whether obj could be updated; if not (e.g an immutable object),
+            the copy must not be used.
+    """
+    pre, _post, _plan = factory_meta.prepare_declarations(dict(params))
+    recomputed = [name for name in pre if isinstance(pre.declarations[name], RECOMPUTED_DECLARATIONS)]
+    if not any(isinstance(pre.declarations[name], declarations.Sequence) for name in recomputed):
+        return True
+
+    fields = [
+        name for name in pre
+        if name not in factory_meta.exclude and name not in factory_meta.parameters
+    ]
+    if any(name in factory_meta.inline_args for name in recomputed):
+        return False
+
+    values = {}
+    for name in fields:
+        if name in recomputed:
+            continue
+        try:
+            values[name] = _get_field(obj, factory_meta.rename.get(name, name))
+        except (AttributeError, LookupError):
+            # Evaluated again by the resolver.
+            pass
+
+    step = builder.BuildStep(builder.StepBuilder(factory_meta, dict(params), strategy), sequence=sequence)
+    step.stub = resolver = builder.Resolver(declarations=pre, step=step, sequence=sequence, values=values)
+    updates = [(name, getattr(resolver, name)) for name in recomputed if name in fields]
+    try:
+        for name, value in updates:
+            _set_field(obj, factory_meta.rename.get(name, name), value)
+    except (AttributeError, TypeError):
+        # Immutable object, e.g a namedtuple.
+        return False
+    return True
+
+
+def _get_field(obj, name):
+    if isinstance(obj, dict):
+        return obj[name]
+    elif isinstance(obj, list):
+        return obj[int(name)]
+    return getattr(obj, name)
+
+
+def _set_field(obj, name, value):
+    if isinstance(obj, dict):
+        obj[name] = value
+    elif isinstance(obj, list):
+        obj[int(name)] = value
+    else:
+        setattr(obj, name, value)
@@ -3,7 +3,21 @@
 
 from __future__ import unicode_literals
 
-import collections
+import functools
+import os
+import threading
+
+try:  # pragma: no cover
+    # Python >= 3.2
+    from concurrent import futures
+except ImportError:  # pragma: no cover
+    futures = None
+
+try:  # pragma: no cover
+    # Python >= 3.7
+    import contextvars
+except ImportError:  # pragma: no cover
+    contextvars = None
 
 from . import compat
 from . import enums
@@ -121,25 +135,83 @@ def log_repr(obj):
 
 
 class ResetableIterator(object):
-    """An iterator wrapper that can be 'reset()' to its start."""
-    def __init__(self, iterator, **kwargs):
+    """An iterator wrapper that can be 'reset()' to its start.
+
+    Sized, re-iterable sources (lists, tuples, querysets, ...) are read once
+    into a tuple, then walked through an index; values of other sources are
+    buffered as they are read, so that they can be replayed.
+
+    Attributes:
+        cycle (bool): whether to start again from the first value once the
+            source is exhausted
+        max_buffer (int or None): the maximum number of values to buffer; once
+            exceeded, values are no longer kept, and resetting requires
+            iterating again over a re-iterable source.
+        source (iterable or None): the source, if it can be iterated again
+        values (tuple or list): the materialized or buffered values
+        index (int): the position of the next value to read
+        overflowed (bool): whether more than max_buffer values were read
+    """
+    def __init__(self, iterator, cycle=False, max_buffer=None, **kwargs):
         super(ResetableIterator, self).__init__(**kwargs)
+        self.cycle = cycle
+        self.max_buffer = max_buffer
+        self.index = 0
+        self.overflowed = False
+
         self.iterator = iter(iterator)
-        self.past_elements = collections.deque()
-        self.next_elements = collections.deque()
+        self.source = None if self.iterator is iterator else iterator
+        if self.source is not None and hasattr(self.source, '__len__'):
+            self.values = tuple(self.iterator)
+            self.iterator = None
+        else:
+            self.values = []
+
+    def _read(self):
+        """Fetch a new value from the underlying iterator, buffering it if possible.
+
+        Raises:
+            StopIteration: the iterator is exhausted.
+        """
+        if self.iterator is None:
+            raise StopIteration()
+        try:
+            value = next(self.iterator)
+        except StopIteration:
+            self.iterator = None
+            raise
+
+        if not self.overflowed:
+            if self.max_buffer is not None and len(self.values) >= self.max_buffer:
+                self.overflowed = True
+                self.values = []
+            else:
+                self.values.append(value)
+        return value
 
     def __iter__(self):
         while True:
-            if self.next_elements:
-                yield self.next_elements.popleft()
+            if self.index < len(self.values):
+                value = self.values[self.index]
             else:
-                value = next(self.iterator)
-                self.past_elements.append(value)
-                yield value
+                try:
+                    value = self._read()
+                except StopIteration:
+                    if not self.cycle or self.index == 0:
+                        return
+                    # Raises ValueError if the values read can't be replayed.
+                    self.reset()
+                    continue
+            self.index += 1
+            yield value
 
     def reset(self):
-        self.next_elements.clear()
-        self.next_elements.extend(self.past_elements)
+        if self.overflowed:
+            if self.source is None:
+                raise ValueError(
+                    "Can't reset %r: more than %d values were read." % (self, self.max_buffer))
+            self.iterator = iter(self.source)
+        self.index = 0
 
 
 class OrderedBase(object):
@@ -174,3 +246,66 @@ def sort_ordered_objects(items, getter=lambda x: x):
         >>> sort_ordered_objects(v.items(), getter=lambda e: e[1])
     """
     return sorted(items, key=lambda x: getattr(getter(x), OrderedBase.CREATION_COUNTER_FIELD, -1))
+
+
+# The threads shared by all run_concurrently() calls.
+MAX_THREADS = 32
+_executor = None
+_executor_pid = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor():
+    global _executor, _executor_pid
+    with _executor_lock:
+        if _executor is None or _executor_pid != os.getpid():
+            # A forked process doesn't inherit its parent's threads.
+            _executor = futures.ThreadPoolExecutor(max_workers=MAX_THREADS)
+            _executor_pid = os.getpid()
+        return _executor
+
+
+def run_concurrently(calls, concurrency):
+    """Call functions, at most ``concurrency`` at a time, in a shared thread pool.
+
+    The calling thread runs the first function of each group itself, and any
+    function not yet started by the pool when its result is needed: nested
+    calls never wait for a pool thread.
+    Without concurrent.futures (Python 2), functions are called in turn.
+
+    Args:
+        calls (callable list): the functions to call, without arguments
+        concurrency (int): the maximum number of simultaneous calls
+
+    Returns:
+        list: the results, in the order of calls
+    """
+    if futures is None or concurrency <= 1 or len(calls) <= 1:
+        return [call() for call in calls]
+
+    executor = _get_executor()
+    results = []
+    for start in range(0, len(calls), concurrency):
+        group = calls[start:start + concurrency]
+        pending = [executor.submit(_with_context(call)) for call in group[1:]]
+        try:
+            results.append(group[0]())
+            for call, future in zip(group[1:], pending):
+                if future.cancel():
+                    results.append(call())
+                else:
+                    results.append(future.result())
+        except BaseException:
+            # Don't leave calls running in the background.
+            for future in pending:
+                future.cancel()
+            futures.wait(pending)
+            raise
+    return results
+
+
+def _with_context(call):
+    """Make a function run within a copy of the current context variables, if any."""
+    if contextvars is None:
+        return call
+    return functools.partial(contextvars.copy_context().run, call)
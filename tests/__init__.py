@@ -1,16 +1,25 @@
 # -*- coding: utf-8 -*-
 # Copyright: See the LICENSE file.
 
+import sys
+
 # factory.django needs a configured Django.
 from .test_django import *
 
 from .test_base import *
+from .test_counters import *
 from .test_declarations import *
 from .test_docs_internals import *
 from .test_faker import *
 from .test_fuzzy import *
 from .test_helpers import *
+from .test_hooks import *
+from .test_imports import *
+from .test_parallel import *
 from .test_using import *
 from .test_utils import *
 from .test_alchemy import *
 from .test_mongoengine import *
+
+if sys.version_info >= (3, 5):
+    from .test_aio import *
@@ -4,9 +4,9 @@
 
 """Helpers for testing SQLAlchemy apps."""
 
-from sqlalchemy import Column, Integer, Unicode, create_engine
+from sqlalchemy import Column, ForeignKey, Integer, Unicode, create_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import scoped_session, sessionmaker
+from sqlalchemy.orm import relationship, scoped_session, sessionmaker
 
 session = scoped_session(sessionmaker())
 engine = create_engine('sqlite://')
@@ -26,4 +26,19 @@ class NonIntegerPk(Base):
 
     id = Column(Unicode(20), primary_key=True)
 
+
+class Company(Base):
+    __tablename__ = 'Company'
+
+    id = Column(Integer(), primary_key=True)
+    name = Column(Unicode(20))
+
+
+class Employee(Base):
+    __tablename__ = 'Employee'
+
+    id = Column(Integer(), primary_key=True)
+    company_id = Column(Integer(), ForeignKey('Company.id'))
+    company = relationship(Company)
+
 Base.metadata.create_all(engine)
@@ -0,0 +1,278 @@
+# -*- coding: utf-8 -*-
+# Copyright: See the LICENSE file.
+
+"""Tests for Factory.acreate() and Factory.acreate_batch(); requires Python 3.5+."""
+
+import asyncio
+import threading
+
+import factory
+import factory.alchemy
+from factory import errors
+
+from .compat import unittest
+
+
+class TestObject(object):
+    def __init__(self, **kwargs):
+        for key, value in kwargs.items():
+            setattr(self, key, value)
+
+
+class AsyncStore(object):
+    """A fake asynchronous database, recording the threads it's used from."""
+
+    def __init__(self, delay=0):
+        self.delay = delay
+        self.saved = []
+        self.threads = set()
+        self.running = 0
+        self.max_running = 0
+
+    async def save(self, obj):
+        self.threads.add(threading.current_thread())
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.running -= 1
+        self.saved.append(obj)
+        return obj
+
+
+class AsyncFactory(factory.Factory):
+    class Meta:
+        model = TestObject
+
+    store = None
+    one = factory.Sequence(lambda n: n)
+
+    @classmethod
+    def _acreate(cls, model_class, *args, **kwargs):
+        store = kwargs.pop('store')
+        return store.save(model_class(*args, **kwargs))
+
+
+class AsyncFactoryTestCase(unittest.TestCase):
+    def setUp(self):
+        AsyncFactory.reset_sequence()
+        self.loop = asyncio.new_event_loop()
+        self.addCleanup(self.loop.close)
+        self.store = AsyncStore()
+
+    def run_async(self, awaitable):
+        return self.loop.run_until_complete(awaitable)
+
+    def test_acreate(self):
+        obj = self.run_async(AsyncFactory.acreate(store=self.store, two=2))
+        self.assertEqual(0, obj.one)
+        self.assertEqual(2, obj.two)
+        self.assertEqual([obj], self.store.saved)
+        # The awaitable ran on the event loop.
+        self.assertEqual({threading.main_thread()}, self.store.threads)
+
+    def test_acreate_sync_factory(self):
+        class SyncFactory(factory.Factory):
+            class Meta:
+                model = TestObject
+
+            one = 1
+
+            @classmethod
+            def _create(cls, model_class, *args, **kwargs):
+                return model_class(thread=threading.current_thread(), *args, **kwargs)
+
+        obj = self.run_async(SyncFactory.acreate(two=2))
+        self.assertEqual(1, obj.one)
+        self.assertEqual(2, obj.two)
+        # _create() ran in a worker thread.
+        self.assertNotEqual(threading.main_thread(), obj.thread)
+
+    def test_subfactory(self):
+        class ParentFactory(factory.Factory):
+            class Meta:
+                model = TestObject
+
+            child = factory.SubFactory(AsyncFactory, store=factory.SelfAttribute('..store'))
+
+            @classmethod
+            def _acreate(cls, model_class, *args, **kwargs):
+                return kwargs['store'].save(model_class(*args, **kwargs))
+
+        parent = self.run_async(ParentFactory.acreate(store=self.store))
+        self.assertEqual([parent.child, parent], self.store.saved)
+
+    def test_async_postgeneration(self):
+        store = self.store
+
+        class PostFactory(AsyncFactory):
+            @factory.post_generation
+            def saved_again(obj, create, extracted, **kwargs):
+                return store.save(obj)
+
+            @classmethod
+            def _after_postgeneration(cls, instance, create, results=None):
+                instance.results = results
+
+        obj = self.run_async(PostFactory.acreate(store=store))
+        self.assertEqual([obj, obj], store.saved)
+        self.assertEqual({'saved_again': obj}, obj.results)
+
+    def test_async_after_postgeneration(self):
+        store = self.store
+
+        class PostFactory(AsyncFactory):
+            @classmethod
+            def _after_postgeneration(cls, instance, create, results=None):
+                return store.save('done')
+
+        obj = self.run_async(PostFactory.acreate(store=store))
+        self.assertEqual([obj, 'done'], store.saved)
+
+    def test_acreate_batch(self):
+        objs = self.run_async(AsyncFactory.acreate_batch(4, store=self.store))
+        self.assertEqual([0, 1, 2, 3], [obj.one for obj in objs])
+        self.assertEqual(4, len(self.store.saved))
+        self.assertEqual(1, self.store.max_running)
+
+    def test_acreate_batch_concurrency(self):
+        class ConcurrentFactory(AsyncFactory):
+            class Meta:
+                async_concurrency = 3
+
+        store = AsyncStore(delay=0.05)
+        objs = self.run_async(ConcurrentFactory.acreate_batch(9, store=store))
+        self.assertEqual(list(range(9)), sorted(obj.one for obj in objs))
+        self.assertEqual(9, len(store.saved))
+        self.assertLessEqual(store.max_running, 3)
+        self.assertGreater(store.max_running, 1)
+
+    def test_concurrent_related_factories(self):
+        class ParentFactory(factory.Factory):
+            class Meta:
+                model = TestObject
+                postgeneration_concurrency = 3
+
+            first = factory.RelatedFactory(AsyncFactory, store=factory.SelfAttribute('..store'))
+            second = factory.RelatedFactory(AsyncFactory, store=factory.SelfAttribute('..store'))
+            third = factory.RelatedFactory(AsyncFactory, store=factory.SelfAttribute('..store'))
+
+        store = AsyncStore(delay=0.05)
+        self.run_async(ParentFactory.acreate(store=store))
+        self.assertEqual(3, len(store.saved))
+        self.assertGreater(store.max_running, 1)
+
+    def test_invalid_concurrency(self):
+        with self.assertRaises(TypeError):
+            class InvalidFactory(AsyncFactory):
+                class Meta:
+                    async_concurrency = 0
+
+    def test_error(self):
+        async def fail():
+            raise ValueError("Save failed")
+
+        class FailingFactory(factory.Factory):
+            class Meta:
+                model = TestObject
+
+            @classmethod
+            def _acreate(cls, model_class, *args, **kwargs):
+                return fail()
+
+        with self.assertRaises(ValueError):
+            self.run_async(FailingFactory.acreate())
+
+    def test_abstract(self):
+        class AbstractFactory(factory.Factory):
+            pass
+
+        with self.assertRaises(errors.FactoryError):
+            self.run_async(AbstractFactory.acreate())
+        with self.assertRaises(errors.FactoryError):
+            self.run_async(AbstractFactory.acreate_batch(2))
+
+    def test_custom_create(self):
+        class CustomFactory(AsyncFactory):
+            @classmethod
+            def create(cls, **kwargs):
+                obj = super(CustomFactory, cls).create(**kwargs)
+                obj.custom = True
+                return obj
+
+        obj = self.run_async(CustomFactory.acreate(store=self.store))
+        self.assertTrue(obj.custom)
+        objs = self.run_async(CustomFactory.acreate_batch(2, store=self.store))
+        self.assertEqual([True, True], [o.custom for o in objs])
+
+    def test_custom_generate(self):
+        class CustomFactory(AsyncFactory):
+            @classmethod
+            def _generate(cls, strategy, params):
+                obj = super(CustomFactory, cls)._generate(strategy, params)
+                obj.strategy = strategy
+                return obj
+
+        objs = self.run_async(CustomFactory.acreate_batch(2, store=self.store))
+        self.assertEqual([factory.CREATE_STRATEGY] * 2, [obj.strategy for obj in objs])
+
+    def test_stub_factory(self):
+        with self.assertRaises(errors.UnsupportedStrategy):
+            factory.StubFactory.acreate()
+        with self.assertRaises(errors.UnsupportedStrategy):
+            factory.StubFactory.acreate_batch(2)
+
+
+class FakeAsyncSession(object):
+    """Mimic the interface of sqlalchemy.ext.asyncio.AsyncSession."""
+
+    def __init__(self):
+        self.added = []
+        self.calls = []
+        self.threads = set()
+
+    def add(self, obj):
+        self.threads.add(threading.current_thread())
+        self.added.append(obj)
+
+    async def flush(self):
+        self.calls.append('flush')
+
+    async def commit(self):
+        self.calls.append('commit')
+
+
+class SQLAlchemyAsyncTestCase(unittest.TestCase):
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        self.addCleanup(self.loop.close)
+        self.session = FakeAsyncSession()
+
+    def make_factory(self, persistence):
+        class AsyncSessionFactory(factory.alchemy.SQLAlchemyModelFactory):
+            class Meta:
+                model = TestObject
+                sqlalchemy_session = self.session
+                sqlalchemy_session_persistence = persistence
+
+            foo = factory.Sequence(lambda n: 'foo%d' % n)
+
+        return AsyncSessionFactory
+
+    def test_flush(self):
+        obj = self.loop.run_until_complete(self.make_factory('flush').acreate())
+        self.assertEqual([obj], self.session.added)
+        self.assertEqual(['flush'], self.session.calls)
+        # The session is only used from the event loop.
+        self.assertEqual({threading.main_thread()}, self.session.threads)
+
+    def test_commit(self):
+        objs = self.loop.run_until_complete(self.make_factory('commit').acreate_batch(2))
+        self.assertEqual(objs, self.session.added)
+        self.assertEqual(['commit', 'commit'], self.session.calls)
+
+    def test_no_persistence(self):
+        obj = self.loop.run_until_complete(self.make_factory(None).acreate())
+        self.assertEqual([obj], self.session.added)
+        self.assertEqual([], self.session.calls)
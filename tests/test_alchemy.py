@@ -4,6 +4,7 @@
 """Tests for factory_boy/SQLAlchemy interactions."""
 
 import factory
+import factory.alchemy
 from .compat import unittest
 from .compat import mock
 import warnings
@@ -152,6 +153,219 @@ class SQLAlchemySessionPersistenceTestCase(unittest.TestCase):
         self.mock_session.flush.assert_called_once_with()
 
 
+class SQLAlchemyBatchPersistenceTestCase(unittest.TestCase):
+    def setUp(self):
+        super(SQLAlchemyBatchPersistenceTestCase, self).setUp()
+        self.mock_session = mock.NonCallableMagicMock(spec=models.session)
+
+    def test_flush_once(self):
+        class FlushingPersistenceFactory(StandardFactory):
+            class Meta:
+                sqlalchemy_session = self.mock_session
+                sqlalchemy_session_persistence = 'flush'
+
+        objs = FlushingPersistenceFactory.create_batch(5)
+        self.mock_session.add.assert_not_called()
+        self.mock_session.add_all.assert_called_once_with(objs)
+        self.mock_session.flush.assert_called_once_with()
+        self.mock_session.commit.assert_not_called()
+
+    def test_commit_per_chunk(self):
+        class CommittingPersistenceFactory(StandardFactory):
+            class Meta:
+                sqlalchemy_session = self.mock_session
+                sqlalchemy_session_persistence = 'commit'
+                sqlalchemy_batch_size = 2
+
+        objs = CommittingPersistenceFactory.create_batch(5)
+        self.assertEqual(
+            [mock.call(objs[0:2]), mock.call(objs[2:4]), mock.call(objs[4:])],
+            self.mock_session.add_all.call_args_list,
+        )
+        self.assertEqual(3, self.mock_session.commit.call_count)
+        self.mock_session.flush.assert_not_called()
+
+    def test_custom_create(self):
+        class CustomCreateFactory(StandardFactory):
+            class Meta:
+                sqlalchemy_session = self.mock_session
+                sqlalchemy_session_persistence = 'flush'
+                sqlalchemy_batch_size = 2
+
+            @classmethod
+            def _create(cls, model_class, *args, **kwargs):
+                obj = super(CustomCreateFactory, cls)._create(model_class, *args, **kwargs)
+                obj.custom = True
+                return obj
+
+        objs = CustomCreateFactory.create_batch(3)
+        self.assertEqual([True, True, True], [obj.custom for obj in objs])
+        self.assertEqual([mock.call(obj) for obj in objs], self.mock_session.add.call_args_list)
+        self.mock_session.add_all.assert_not_called()
+        self.assertEqual(3, self.mock_session.flush.call_count)
+
+    def test_bulk_save(self):
+        class BulkSaveFactory(StandardFactory):
+            class Meta:
+                sqlalchemy_session = self.mock_session
+                sqlalchemy_bulk_save = True
+
+        objs = BulkSaveFactory.create_batch(3)
+        self.mock_session.bulk_save_objects.assert_called_once_with(objs, return_defaults=True)
+        self.mock_session.add_all.assert_not_called()
+
+    def test_bulk_save_postgeneration(self):
+        class BulkSaveFactory(StandardFactory):
+            class Meta:
+                sqlalchemy_session = self.mock_session
+                sqlalchemy_bulk_save = True
+
+            @factory.post_generation
+            def touch(obj, create, extracted, **kwargs):
+                pass
+
+        objs = BulkSaveFactory.create_batch(3)
+        self.mock_session.bulk_save_objects.assert_not_called()
+        self.mock_session.add_all.assert_called_once_with(objs)
+
+    def test_bulk_save_database(self):
+        class BulkSaveFactory(StandardFactory):
+            class Meta:
+                sqlalchemy_bulk_save = True
+                sqlalchemy_batch_size = 2
+
+        session = models.session
+        StandardFactory.reset_sequence(1)
+        session.rollback()
+        try:
+            objs = BulkSaveFactory.create_batch(3)
+            self.assertEqual([1, 2, 3], [obj.id for obj in objs])
+            self.assertEqual(
+                ['foo1', 'foo2', 'foo3'],
+                [foo for foo, in session.query(models.StandardModel.foo).order_by(models.StandardModel.id)],
+            )
+        finally:
+            session.rollback()
+
+    def test_bulk_save_call_time_postgeneration(self):
+        class BulkSaveFactory(StandardFactory):
+            class Meta:
+                sqlalchemy_session = self.mock_session
+                sqlalchemy_bulk_save = True
+
+        objs = BulkSaveFactory.create_batch(3, touch=factory.PostGeneration(lambda obj, create, extracted: None))
+        self.mock_session.bulk_save_objects.assert_not_called()
+        self.mock_session.add_all.assert_called_once_with(objs)
+
+    def test_bulk_save_relationship(self):
+        class CompanyFactory(SQLAlchemyModelFactory):
+            class Meta:
+                model = models.Company
+                sqlalchemy_session = models.session
+
+            name = factory.Sequence(lambda n: 'company%d' % n)
+
+        class EmployeeFactory(SQLAlchemyModelFactory):
+            class Meta:
+                model = models.Employee
+                sqlalchemy_session = models.session
+                sqlalchemy_session_persistence = 'flush'
+                sqlalchemy_bulk_save = True
+
+            company = factory.SubFactory(CompanyFactory)
+
+        session = models.session
+        session.rollback()
+        try:
+            objs = EmployeeFactory.create_batch(3)
+            self.assertEqual(
+                sorted(obj.company.id for obj in objs),
+                sorted(company_id for company_id, in session.query(models.Employee.company_id)),
+            )
+            self.assertNotIn(None, [obj.company_id for obj in objs])
+        finally:
+            session.rollback()
+
+    def test_invalid_batch_size(self):
+        for batch_size in [0, -1, 1.5, True]:
+            with self.assertRaises(TypeError):
+                class InvalidFactory(StandardFactory):
+                    class Meta:
+                        sqlalchemy_batch_size = batch_size
+
+
+class SQLAlchemyDeferredPersistenceTestCase(unittest.TestCase):
+    def setUp(self):
+        super(SQLAlchemyDeferredPersistenceTestCase, self).setUp()
+        self.mock_session = mock.NonCallableMagicMock(spec=models.session)
+
+        class FlushingPersistenceFactory(StandardFactory):
+            class Meta:
+                sqlalchemy_session = self.mock_session
+                sqlalchemy_session_persistence = 'flush'
+
+        class CommittingPersistenceFactory(StandardFactory):
+            class Meta:
+                sqlalchemy_session = self.mock_session
+                sqlalchemy_session_persistence = 'commit'
+
+        self.flushing_factory = FlushingPersistenceFactory
+        self.committing_factory = CommittingPersistenceFactory
+
+    def test_single_flush(self):
+        with factory.alchemy.deferred_persistence(self.mock_session):
+            self.flushing_factory()
+            self.flushing_factory.create_batch(3)
+            self.flushing_factory()
+            self.mock_session.flush.assert_not_called()
+
+        self.mock_session.flush.assert_called_once_with()
+        self.mock_session.commit.assert_not_called()
+
+    def test_commit_wins(self):
+        with factory.alchemy.deferred_persistence(self.mock_session):
+            self.flushing_factory()
+            self.committing_factory()
+            self.flushing_factory()
+
+        self.mock_session.commit.assert_called_once_with()
+        self.mock_session.flush.assert_not_called()
+
+    def test_nothing_requested(self):
+        with factory.alchemy.deferred_persistence(self.mock_session):
+            pass
+
+        self.mock_session.commit.assert_not_called()
+        self.mock_session.flush.assert_not_called()
+
+    def test_error(self):
+        with self.assertRaises(ValueError):
+            with factory.alchemy.deferred_persistence(self.mock_session):
+                self.flushing_factory()
+                raise ValueError()
+
+        self.mock_session.flush.assert_not_called()
+        # Back to normal
+        self.flushing_factory()
+        self.mock_session.flush.assert_called_once_with()
+
+    def test_nested(self):
+        with factory.alchemy.deferred_persistence(self.mock_session):
+            with factory.alchemy.deferred_persistence(self.mock_session):
+                self.committing_factory()
+            self.mock_session.commit.assert_not_called()
+
+        self.mock_session.commit.assert_called_once_with()
+
+    def test_other_session(self):
+        other_session = mock.NonCallableMagicMock(spec=models.session)
+        with factory.alchemy.deferred_persistence(other_session):
+            self.flushing_factory()
+            self.mock_session.flush.assert_called_once_with()
+
+        other_session.flush.assert_not_called()
+
+
 class SQLAlchemyNonIntegerPkTestCase(unittest.TestCase):
     def setUp(self):
         super(SQLAlchemyNonIntegerPkTestCase, self).setUp()
@@ -197,3 +411,7 @@ class SQLAlchemyNoSessionTestCase(unittest.TestCase):
         inst1 = NoSessionFactory.build()
         self.assertEqual(inst0.id, 0)
         self.assertEqual(inst1.id, 1)
+
+    def test_create_batch_raises_exception_when_no_session_was_set(self):
+        with self.assertRaises(RuntimeError):
+            NoSessionFactory.create_batch(2)
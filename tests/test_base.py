@@ -1,12 +1,18 @@
 # -*- coding: utf-8 -*-
 # Copyright: See the LICENSE file.
 
+import collections
+import sys
+import threading
+import time
 import warnings
 
 from factory import base
 from factory import declarations
 from factory import enums
 from factory import errors
+from factory import random
+from factory import snapshots
 
 from .compat import unittest
 
@@ -221,6 +227,129 @@ class DeclarationParsingTests(unittest.TestCase):
         self.assertEqual(TestObject, obj.__class__)
 
 
+class DeclarationsCacheTestCase(unittest.TestCase):
+    def test_same_names(self):
+        class TestObjectFactory(base.Factory):
+            class Meta:
+                model = TestObject
+
+            one = 1
+            two = declarations.Dict({'x': 1})
+
+        for i in range(3):
+            obj = TestObjectFactory.build(one=i, two__x=i)
+            self.assertEqual(i, obj.one)
+            self.assertEqual({'x': i}, obj.two)
+
+        self.assertEqual(1, len(TestObjectFactory._meta._declarations_cache.routes))
+        # Base declarations are untouched
+        self.assertEqual({'one': 1, 'two': TestObjectFactory._meta.pre_declarations['two'].declaration},
+                         TestObjectFactory._meta.pre_declarations.as_dict())
+
+    def test_postgeneration_routing(self):
+        class TestObjectFactory(base.Factory):
+            class Meta:
+                model = TestObject
+
+            one = declarations.PostGeneration(lambda obj, create, extracted, **kwargs: (extracted, kwargs))
+
+            @classmethod
+            def _after_postgeneration(cls, instance, create, results=None):
+                instance.results = results
+
+        for i in range(2):
+            obj = TestObjectFactory.build(one=i, one__x=i, two=i)
+            self.assertEqual({'one': (i, {'x': i})}, obj.results)
+            self.assertEqual(i, obj.two)
+            self.assertIsNone(obj.one)
+
+        self.assertEqual({'one': (None, {})}, TestObjectFactory.build().results)
+
+    def test_same_names_other_kind(self):
+        class TestObjectFactory(base.Factory):
+            class Meta:
+                model = TestObject
+
+            one = 1
+
+        obj = TestObjectFactory.build(two=2)
+        self.assertEqual(2, obj.two)
+        obj = TestObjectFactory.build(two=declarations.PostGeneration(lambda obj, create, extracted: 3))
+        self.assertIsNone(obj.two)
+
+    def test_invalid_names(self):
+        class TestObjectFactory(base.Factory):
+            class Meta:
+                model = TestObject
+
+            one = 1
+
+        for _i in range(2):
+            self.assertRaises(errors.InvalidDeclarationError, TestObjectFactory.build, two__x=1)
+        self.assertEqual({}, TestObjectFactory._meta._declarations_cache.routes)
+
+
+class CompiledResolutionTestCase(unittest.TestCase):
+    def test_invalid_option(self):
+        with self.assertRaises(TypeError):
+            class TestObjectFactory(base.Factory):
+                class Meta:
+                    model = TestObject
+                    resolution = 'eager'
+
+    def test_inherited(self):
+        class TestObjectFactory(base.Factory):
+            class Meta:
+                model = TestObject
+                resolution = enums.COMPILED_RESOLUTION
+
+        class OtherFactory(TestObjectFactory):
+            pass
+
+        self.assertEqual(enums.COMPILED_RESOLUTION, OtherFactory._meta.resolution)
+
+    def test_values(self):
+        class TestObjectFactory(base.Factory):
+            class Meta:
+                model = TestObject
+                resolution = enums.COMPILED_RESOLUTION
+
+            one = declarations.LazyAttribute(lambda o: o.two + 1)
+            two = declarations.SelfAttribute('three')
+            three = 3
+            four = declarations.Sequence(lambda n: n)
+
+        obj = TestObjectFactory.build(three=5)
+        self.assertEqual((6, 5, 5, 0), (obj.one, obj.two, obj.three, obj.four))
+        obj = TestObjectFactory.build(three=declarations.LazyFunction(lambda: 7))
+        self.assertEqual((8, 7, 7, 1), (obj.one, obj.two, obj.three, obj.four))
+
+    def test_plan(self):
+        class TestObjectFactory(base.Factory):
+            class Meta:
+                model = TestObject
+                resolution = enums.COMPILED_RESOLUTION
+
+            one = declarations.SelfAttribute('two.real')
+            two = declarations.LazyFunction(lambda: 2)
+            three = 3
+
+        _pre, _post, plan = TestObjectFactory._meta.prepare_declarations({})
+        self.assertEqual(['three'], plan.values)
+        self.assertEqual(['two', 'one'], plan.order)
+
+    def test_cyclic(self):
+        class TestObjectFactory(base.Factory):
+            class Meta:
+                model = TestObject
+                resolution = enums.COMPILED_RESOLUTION
+
+            one = declarations.SelfAttribute('two')
+            two = declarations.SelfAttribute('one')
+
+        self.assertRaises(errors.CyclicDefinitionError, TestObjectFactory.build)
+
+
 class FactoryTestCase(unittest.TestCase):
     def test_magic_happens(self):
         """Calling a FooFactory doesn't yield a FooFactory instance."""
@@ -348,6 +477,77 @@ class FactorySequenceTestCase(unittest.TestCase):
         o4 = self.TestObjectFactory()
         self.assertEqual(1, o4.one)
 
+    def _run_threads(self, target, count=8):
+        if hasattr(sys, 'setswitchinterval'):  # Python 3
+            # Switch threads as often as possible.
+            self.addCleanup(sys.setswitchinterval, sys.getswitchinterval())
+            sys.setswitchinterval(1e-6)
+
+        threads = [threading.Thread(target=target) for _i in range(count)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    def test_threads(self):
+        sequences = []
+
+        def draw():
+            sequences.extend([self.TestObjectFactory._meta.next_sequence() for _i in range(2000)])
+
+        self._run_threads(draw)
+        self.assertEqual(list(range(8 * 2000)), sorted(sequences))
+
+    def test_reserve_sequences(self):
+        class SubTestObjectFactory(self.TestObjectFactory):
+            pass
+
+        self.assertEqual(0, self.TestObjectFactory().one)
+        self.assertEqual([1, 2, 3], list(self.TestObjectFactory._meta.reserve_sequences(3)))
+        # The counter is shared with subclasses.
+        self.assertEqual([4, 5], list(SubTestObjectFactory._meta.reserve_sequences(2)))
+        self.assertEqual([], list(SubTestObjectFactory._meta.reserve_sequences(0)))
+        self.assertEqual(6, SubTestObjectFactory().one)
+        self.assertEqual([7, 8], [obj.one for obj in self.TestObjectFactory.build_batch(2)])
+
+    def test_threads_reserve_sequences(self):
+        sequences = []
+        blocks = []
+
+        def draw():
+            for _i in range(200):
+                sequences.append(self.TestObjectFactory._meta.next_sequence())
+                block = list(self.TestObjectFactory._meta.reserve_sequences(5))
+                blocks.append(block)
+                sequences.extend(block)
+
+        self._run_threads(draw)
+        # Values may be skipped under contention, but never drawn twice.
+        self.assertEqual(len(sequences), len(set(sequences)))
+        for block in blocks:
+            self.assertEqual(list(range(block[0], block[0] + 5)), block)
+
+    def test_threads_initialization(self):
+        setups = []
+
+        class SlowSetupFactory(self.TestObjectFactory):
+            class Meta:
+                model = TestModel
+
+            @classmethod
+            def _setup_next_sequence(cls):
+                setups.append(cls)
+                time.sleep(0.01)
+                return 0
+
+        sequences = []
+
+        def draw():
+            sequences.append(SlowSetupFactory._meta.next_sequence())
+
+        self._run_threads(draw)
+        self.assertEqual([SlowSetupFactory], setups)
+        self.assertEqual(list(range(8)), sorted(sequences))
 
 
 class FactoryDefaultStrategyTestCase(unittest.TestCase):
@@ -514,6 +714,360 @@ class FactoryCreationTestCase(unittest.TestCase):
         self.assertTrue(Test._meta.abstract)
 
 
+class FactoryBatchTestCase(unittest.TestCase):
+    def test_build_batch_single_instantiation(self):
+        calls = []
+
+        class TestObjectFactory(base.Factory):
+            class Meta:
+                model = TestObject
+
+            one = declarations.Sequence(lambda n: n)
+
+            @classmethod
+            def _build_batch(cls, model_class, arguments):
+                calls.append(arguments)
+                return super(TestObjectFactory, cls)._build_batch(model_class, arguments)
+
+        objs = TestObjectFactory.build_batch(3, two=2)
+        self.assertEqual([0, 1, 2], [obj.one for obj in objs])
+        self.assertEqual([2, 2, 2], [obj.two for obj in objs])
+        self.assertEqual(
+            [[((), {'one': 0, 'two': 2}), ((), {'one': 1, 'two': 2}), ((), {'one': 2, 'two': 2})]],
+            calls,
+        )
+
+    def test_create_batch_uses_create(self):
+        class TestModelFactory(FakeModelFactory):
+            class Meta:
+                model = TestModel
+
+            one = declarations.Sequence(lambda n: n)
+
+        objs = TestModelFactory.create_batch(3)
+        self.assertEqual([0, 1, 2], [obj.one for obj in objs])
+        self.assertEqual([1, 1, 1], [obj.id for obj in objs])
+
+    def test_batch_postgeneration_after_instantiation(self):
+        events = []
+
+        class TestObjectFactory(base.Factory):
+            class Meta:
+                model = TestObject
+
+            one = declarations.Sequence(lambda n: n)
+
+            @classmethod
+            def _build(cls, model_class, *args, **kwargs):
+                events.append(('build', kwargs['one']))
+                return model_class(*args, **kwargs)
+
+            two = declarations.PostGeneration(lambda obj, create, extracted: events.append(('post', obj.one)))
+
+        TestObjectFactory.build_batch(2)
+        self.assertEqual([('build', 0), ('build', 1), ('post', 0), ('post', 1)], events)
+
+    def test_empty_batch(self):
+        class TestObjectFactory(base.Factory):
+            class Meta:
+                model = TestObject
+
+        self.assertEqual([], TestObjectFactory.build_batch(0))
+
+    def test_stub_factory_batch(self):
+        class TestObjectFactory(base.StubFactory):
+            one = 1
+
+        objs = TestObjectFactory.build_batch(2)
+        self.assertEqual([1, 1], [obj.one for obj in objs])
+        self.assertTrue(all(isinstance(obj, base.StubObject) for obj in objs))
+        self.assertRaises(errors.UnsupportedStrategy, TestObjectFactory.create_batch, 2)
+
+    def test_abstract_batch(self):
+        class TestObjectFactory(base.Factory):
+            class Meta:
+                abstract = True
+
+        self.assertRaises(errors.FactoryError, TestObjectFactory.build_batch, 2)
+
+    def test_overridden_build(self):
+        calls = []
+
+        class TestObjectFactory(base.Factory):
+            class Meta:
+                model = TestObject
+
+            one = declarations.Sequence(lambda n: n)
+
+            @classmethod
+            def build(cls, **kwargs):
+                calls.append(kwargs)
+                return super(TestObjectFactory, cls).build(**kwargs)
+
+        objs = TestObjectFactory.build_batch(3, two=2)
+        self.assertEqual([0, 1, 2], [obj.one for obj in objs])
+        self.assertEqual([{'two': 2}] * 3, calls)
+
+    def test_overridden_generate(self):
+        calls = []
+
+        class TestModelFactory(FakeModelFactory):
+            class Meta:
+                model = TestModel
+
+            @classmethod
+            def _generate(cls, strategy, params):
+                calls.append(strategy)
+                return super(TestModelFactory, cls)._generate(strategy, params)
+
+        TestModelFactory.create_batch(2)
+        TestModelFactory.stub_batch(1)
+        self.assertEqual([enums.CREATE_STRATEGY] * 2 + [enums.STUB_STRATEGY], calls)
+
+
+class FactoryIterTestCase(unittest.TestCase):
+    def test_iter_build(self):
+        class TestObjectFactory(base.Factory):
+            class Meta:
+                model = TestObject
+
+            one = declarations.Sequence(lambda n: n)
+
+        objs = TestObjectFactory.iter_build(3, two=2)
+        self.assertFalse(isinstance(objs, list))
+        self.assertEqual([(0, 2), (1, 2), (2, 2)], [(obj.one, obj.two) for obj in objs])
+
+    def test_lazy_sequences(self):
+        class TestObjectFactory(base.Factory):
+            class Meta:
+                model = TestObject
+
+            one = declarations.Sequence(lambda n: n)
+
+        objs = TestObjectFactory.iter_build()
+        self.assertEqual(0, next(objs).one)
+        self.assertEqual(1, next(objs).one)
+        # Only consumed sequences were drawn.
+        self.assertEqual(2, TestObjectFactory.build().one)
+        self.assertEqual(3, next(objs).one)
+
+    def test_chunks(self):
+        calls = []
+
+        class TestObjectFactory(base.Factory):
+            class Meta:
+                model = TestObject
+
+            one = declarations.Sequence(lambda n: n)
+
+            @classmethod
+            def _build_batch(cls, model_class, arguments):
+                calls.append([kwargs['one'] for _args, kwargs in arguments])
+                return super(TestObjectFactory, cls)._build_batch(model_class, arguments)
+
+        objs = list(TestObjectFactory.iter_build(5, chunk_size=2))
+        self.assertEqual([0, 1, 2, 3, 4], [obj.one for obj in objs])
+        self.assertEqual([[0, 1], [2, 3], [4]], calls)
+
+    def test_invalid_chunk_size(self):
+        class TestObjectFactory(base.Factory):
+            class Meta:
+                model = TestObject
+
+        self.assertRaises(ValueError, TestObjectFactory.iter_build, 5, chunk_size=0)
+        self.assertRaises(ValueError, TestObjectFactory.iter_build, chunk_size=-1)
+
+    def test_iter_create(self):
+        class TestModelFactory(FakeModelFactory):
+            class Meta:
+                model = TestModel
+
+            one = declarations.Sequence(lambda n: n)
+
+        objs = list(TestModelFactory.iter_create(2))
+        self.assertEqual([0, 1], [obj.one for obj in objs])
+        self.assertEqual([1, 1], [obj.id for obj in objs])
+
+    def test_iter_stub(self):
+        class TestObjectFactory(base.Factory):
+            class Meta:
+                model = TestObject
+
+            one = 1
+
+        objs = list(TestObjectFactory.iter_stub(2))
+        self.assertEqual([1, 1], [obj.one for obj in objs])
+        self.assertTrue(all(isinstance(obj, base.StubObject) for obj in objs))
+
+    def test_stub_factory(self):
+        class TestObjectFactory(base.StubFactory):
+            one = 1
+
+        objs = list(TestObjectFactory.iter_build(2))
+        self.assertTrue(all(isinstance(obj, base.StubObject) for obj in objs))
+        self.assertRaises(errors.UnsupportedStrategy, TestObjectFactory.iter_create, 2)
+
+    def test_abstract(self):
+        class TestObjectFactory(base.Factory):
+            class Meta:
+                abstract = True
+
+        self.assertRaises(errors.FactoryError, TestObjectFactory.iter_build, 2)
+
+
+class FactorySnapshotTestCase(unittest.TestCase):
+    def setUp(self):
+        snapshots.clear_snapshots()
+
+        class TestObjectFactory(base.Factory):
+            class Meta:
+                model = TestObject
+
+            one = declarations.Sequence(lambda n: n)
+            two = declarations.LazyAttributeSequence(lambda o, n: (o.four, n))
+            four = 'four'
+
+            @declarations.PostGeneration
+            def three(obj, create, extracted, **kwargs):
+                calls.append(obj)
+                obj.three = [TestObject(one=obj) for _i in range(2)]
+
+        calls = []
+        self.calls = calls
+        self.TestObjectFactory = TestObjectFactory
+
+    def test_copies(self):
+        template = self.TestObjectFactory.build_snapshot()
+        obj = self.TestObjectFactory.build_snapshot()
+
+        self.assertEqual([template], self.calls)
+        self.assertIsNot(template, obj)
+        self.assertEqual((0, ('four', 0)), (template.one, template.two))
+        self.assertEqual((1, ('four', 1)), (obj.one, obj.two))
+        # The copy keeps the shape of the object graph.
+        self.assertEqual(2, len(obj.three))
+        self.assertIsNot(template.three[0], obj.three[0])
+        self.assertIs(obj, obj.three[0].one)
+
+    def test_template_unaltered(self):
+        template = self.TestObjectFactory.build_snapshot()
+        template.four = 'changed'
+        obj = self.TestObjectFactory.build_snapshot()
+        self.assertEqual('four', obj.four)
+
+    def test_overrides(self):
+        obj1 = self.TestObjectFactory.build_snapshot(four=4)
+        obj2 = self.TestObjectFactory.build_snapshot()
+        obj3 = self.TestObjectFactory.build_snapshot(four=4)
+
+        self.assertEqual(2, len(self.calls))
+        self.assertEqual([4, 'four', 4], [obj1.four, obj2.four, obj3.four])
+        self.assertEqual((4, 2), obj3.two)
+
+    def test_override_identity(self):
+        four = TestObject()
+        self.TestObjectFactory.build_snapshot(four=four)
+        obj = self.TestObjectFactory.build_snapshot(four=four)
+        self.assertIs(four, obj.four)
+
+        # Equal overrides are swapped for those of the current call.
+        class Value(object):
+            def __eq__(self, other):
+                return isinstance(other, Value)
+
+            def __hash__(self):
+                return 0
+
+        self.TestObjectFactory.build_snapshot(four=Value())
+        value = Value()
+        self.assertIs(value, self.TestObjectFactory.build_snapshot(four=value).four)
+
+    def test_unhashable_overrides(self):
+        self.TestObjectFactory.build_snapshot(four=[])
+        self.TestObjectFactory.build_snapshot(four=[])
+        self.assertEqual(2, len(self.calls))
+
+    def test_seed(self):
+        class RandomFactory(base.Factory):
+            class Meta:
+                model = TestObject
+
+            one = declarations.LazyFunction(lambda: random.randgen.random())
+
+        state = random.get_random_state()
+        obj1 = RandomFactory.build_snapshot(snapshot_seed=1)
+        obj2 = RandomFactory.build_snapshot(snapshot_seed=2)
+        self.assertEqual(state, random.get_random_state())
+        self.assertNotEqual(obj1.one, obj2.one)
+
+        snapshots.clear_snapshots(RandomFactory)
+        self.assertEqual(obj1.one, RandomFactory.build_snapshot(snapshot_seed=1).one)
+
+    def test_clear(self):
+        self.TestObjectFactory.build_snapshot()
+        snapshots.clear_snapshots(self.TestObjectFactory)
+        self.TestObjectFactory.build_snapshot()
+        self.assertEqual(2, len(self.calls))
+
+    def test_stub(self):
+        self.TestObjectFactory.stub_snapshot()
+        obj = self.TestObjectFactory.stub_snapshot()
+        self.assertTrue(isinstance(obj, base.StubObject))
+        self.assertEqual(1, obj.one)
+        self.assertRaises(
+            errors.UnsupportedStrategy,
+            self.TestObjectFactory._generate_snapshot, enums.CREATE_STRATEGY, None, {},
+        )
+
+    def test_derived_fields(self):
+        class TestObjectFactory(base.Factory):
+            class Meta:
+                model = TestObject
+                rename = {'email': 'two'}
+
+            one = declarations.Sequence(lambda n: n)
+            email = declarations.LazyAttribute(lambda o: 'u%d@%s' % (o.one, o.four))
+            three = declarations.SelfAttribute('email')
+            four = declarations.LazyFunction(lambda: random.randgen.choice(['x', 'y']))
+
+        template = TestObjectFactory.build_snapshot()
+        obj = TestObjectFactory.build_snapshot()
+        self.assertEqual(template.one + 1, obj.one)
+        self.assertEqual(template.four, obj.four)
+        self.assertEqual('u%d@%s' % (obj.one, obj.four), obj.two)
+        self.assertEqual(obj.two, obj.three)
+
+    def test_immutable(self):
+        Point = collections.namedtuple('Point', ['x', 'y'])
+
+        class PointFactory(base.Factory):
+            class Meta:
+                model = Point
+
+            x = declarations.Sequence(lambda n: n)
+            y = declarations.LazyAttribute(lambda o: -o.x)
+
+        objs = [PointFactory.build_snapshot() for _i in range(3)]
+        first = objs[0].x
+        self.assertEqual([(first + i, -first - i) for i in range(3)], objs)
+
+    def test_dict_factory(self):
+        class TestDictFactory(base.DictFactory):
+            one = declarations.Sequence(lambda n: n)
+            two = declarations.LazyAttributeSequence(lambda o, n: o.one + n)
+
+        # DictFactory subclasses share their sequence counter.
+        first = TestDictFactory.build_snapshot()['one']
+        self.assertEqual({'one': first + 1, 'two': 2 * (first + 1)}, TestDictFactory.build_snapshot())
+
+    def test_abstract(self):
+        class TestObjectFactory(base.Factory):
+            class Meta:
+                abstract = True
+
+        self.assertRaises(errors.FactoryError, TestObjectFactory.build_snapshot)
+
+
 class PostGenerationParsingTestCase(unittest.TestCase):
 
     def test_extraction(self):
@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+# Copyright: See the LICENSE file.
+
+import multiprocessing
+import os
+import shutil
+import tempfile
+
+import factory
+from factory import counters
+
+from .compat import mock, unittest
+
+
+class CountedObject(object):
+    def __init__(self, n):
+        self.n = n
+
+
+def make_factory(path, block_size=counters.DEFAULT_BLOCK_SIZE, check_interval=counters.DEFAULT_CHECK_INTERVAL):
+    class CountedObjectFactory(factory.Factory):
+        class Meta:
+            model = CountedObject
+            sequence_backend = counters.SQLiteCounterBackend(
+                path, block_size=block_size, check_interval=check_interval)
+
+        n = factory.Sequence(lambda n: n)
+
+    return CountedObjectFactory
+
+
+def draw_sequences(path):
+    """Run within a worker process."""
+    CountedObjectFactory = make_factory(path, block_size=10)
+    return [obj.n for obj in CountedObjectFactory.build_batch(25)] + [CountedObjectFactory().n for _i in range(25)]
+
+
+class SQLiteCounterBackendTestCase(unittest.TestCase):
+    def setUp(self):
+        super(SQLiteCounterBackendTestCase, self).setUp()
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        self.path = os.path.join(directory, 'sequences.sqlite3')
+
+    def test_sequences(self):
+        CountedObjectFactory = make_factory(self.path)
+        self.assertEqual([0, 1], [CountedObjectFactory().n, CountedObjectFactory().n])
+        self.assertEqual([2, 3, 4], [obj.n for obj in CountedObjectFactory.build_batch(3)])
+
+    def test_blocks(self):
+        factory1 = make_factory(self.path, block_size=10)
+        factory2 = make_factory(self.path, block_size=10)
+
+        # Both factories share the same counter name: they get disjoint blocks.
+        self.assertEqual(0, factory1().n)
+        self.assertEqual(10, factory2().n)
+        self.assertEqual(1, factory1().n)
+        self.assertEqual([2, 3, 4], list(factory1._meta.reserve_sequences(3)))
+        # Reservations larger than the block size go directly to the backend.
+        self.assertEqual(list(range(20, 35)), list(factory1._meta.reserve_sequences(15)))
+        self.assertEqual(5, factory1().n)
+        # Not enough values left in the block: a new one is reserved.
+        self.assertEqual([35 + i for i in range(6)], list(factory1._meta.reserve_sequences(6)))
+
+    def test_initial_value(self):
+        class CountedObjectFactory(factory.Factory):
+            class Meta:
+                model = CountedObject
+                sequence_backend = counters.SQLiteCounterBackend(self.path)
+
+            n = factory.Sequence(lambda n: n)
+
+            @classmethod
+            def _setup_next_sequence(cls):
+                return 42
+
+        self.assertEqual(42, CountedObjectFactory().n)
+
+    def test_reset(self):
+        factory1 = make_factory(self.path, block_size=10, check_interval=0)
+        factory2 = make_factory(self.path, block_size=10, check_interval=0)
+        self.assertEqual(0, factory1().n)
+
+        factory2.reset_sequence(100)
+        self.assertEqual(100, factory2().n)
+        # The block reserved before the reset is dropped.
+        self.assertEqual(110, factory1().n)
+        self.assertEqual(101, factory2().n)
+
+    def test_check_interval(self):
+        factory1 = make_factory(self.path, block_size=10, check_interval=3600)
+        factory2 = make_factory(self.path, block_size=10)
+        self.assertEqual(0, factory1().n)
+
+        factory2.reset_sequence(100)
+        with mock.patch.object(factory1._meta.sequence_backend, 'get_epoch') as get_epoch:
+            # The reset is only seen at the next block boundary.
+            self.assertEqual(list(range(1, 10)), [factory1().n for _i in range(9)])
+            get_epoch.assert_not_called()
+        self.assertEqual(100, factory1().n)
+
+    def test_clear(self):
+        backend = counters.SQLiteCounterBackend(self.path)
+        self.assertEqual((0, 0), backend.reserve('foo', 5, initial=0))
+        self.assertEqual((5, 0), backend.reserve('foo', 5, initial=0))
+        backend.clear()
+        self.assertEqual((3, 1), backend.reserve('foo', 5, initial=3))
+
+    def test_clear_blocks(self):
+        CountedObjectFactory = make_factory(self.path, block_size=10, check_interval=0)
+        self.assertEqual(0, CountedObjectFactory().n)
+        CountedObjectFactory._meta.sequence_backend.clear()
+        self.assertEqual(0, CountedObjectFactory().n)
+
+    def test_processes(self):
+        pool = multiprocessing.Pool(3)
+        try:
+            results = pool.map(draw_sequences, [self.path] * 3)
+        finally:
+            pool.close()
+            pool.join()
+
+        sequences = sum(results, [])
+        self.assertEqual(150, len(sequences))
+        self.assertEqual(len(sequences), len(set(sequences)))
@@ -110,6 +110,27 @@ class IteratorTestCase(unittest.TestCase):
         self.assertEqual(2, utils.evaluate_declaration(it, force_sequence=1))
         self.assertRaises(StopIteration, utils.evaluate_declaration, it, force_sequence=2)
 
+    def test_cycle_generator(self):
+        it = declarations.Iterator(n for n in [1, 2])
+        self.assertEqual(1, utils.evaluate_declaration(it, force_sequence=0))
+        self.assertEqual(2, utils.evaluate_declaration(it, force_sequence=1))
+        self.assertEqual(1, utils.evaluate_declaration(it, force_sequence=2))
+        it.reset()
+        self.assertEqual(1, utils.evaluate_declaration(it, force_sequence=3))
+
+    def test_max_buffer(self):
+        it = declarations.Iterator(itertools.count(), max_buffer=2)
+        self.assertEqual(0, utils.evaluate_declaration(it, force_sequence=0))
+        self.assertEqual(1, utils.evaluate_declaration(it, force_sequence=1))
+        self.assertEqual(2, utils.evaluate_declaration(it, force_sequence=2))
+        self.assertRaises(ValueError, it.reset)
+
+    def test_max_buffer_cycle_exhausted(self):
+        it = declarations.Iterator((n for n in range(5)), cycle=True, max_buffer=2)
+        for n in range(5):
+            self.assertEqual(n, utils.evaluate_declaration(it, force_sequence=n))
+        self.assertRaises(ValueError, utils.evaluate_declaration, it, force_sequence=5)
+
     def test_getter(self):
         it = declarations.Iterator([(1, 2), (1, 3)], getter=lambda p: p[1])
         self.assertEqual(2, utils.evaluate_declaration(it, force_sequence=0))
@@ -16,6 +16,7 @@ django.setup()
 from django import test as django_test
 from django.conf import settings
 from django.db import models as django_models
+from django.db import transaction
 from django.test.runner import DiscoverRunner as DjangoTestSuiteRunner
 from django.test import utils as django_test_utils
 from django.db.models import signals
@@ -219,6 +220,236 @@ class DjangoGetOrCreateTests(django_test.TestCase):
         self.assertEqual(2, models.MultifieldModel.objects.count())
 
 
+class DjangoGetOrCreateBatchTests(django_test.TestCase):
+    def test_lookup_single_query(self):
+        existing = MultifieldModelFactory(slug='main', text='existing')
+
+        # One lookup, one INSERT per missing slug
+        with self.assertNumQueries(3):
+            objs = MultifieldModelFactory.create_batch(
+                6,
+                slug=factory.Iterator(['main', 'alt', 'other']),
+                text='new',
+            )
+
+        self.assertEqual(['main', 'alt', 'other'] * 2, [obj.slug for obj in objs])
+        self.assertEqual(existing, objs[0])
+        self.assertEqual('existing', objs[0].text)
+        self.assertIs(objs[1], objs[4])
+        self.assertEqual(3, models.MultifieldModel.objects.count())
+
+    def test_bulk_insert(self):
+        class BulkMultifieldModelFactory(MultifieldModelFactory):
+            class Meta:
+                django_bulk_create = True
+
+        MultifieldModelFactory(slug='main')
+
+        with self.assertNumQueries(2):
+            objs = BulkMultifieldModelFactory.create_batch(4, slug=factory.Iterator(['main', 'alt', 'other']))
+
+        self.assertEqual(3, models.MultifieldModel.objects.count())
+        self.assertEqual(objs[0], objs[3])
+        self.assertEqual(
+            set(models.MultifieldModel.objects.values_list('pk', flat=True)),
+            set(obj.pk for obj in objs),
+        )
+
+    def test_multiple_fields(self):
+        class MultiKeyFactory(factory.django.DjangoModelFactory):
+            class Meta:
+                model = models.MultifieldModel
+                django_get_or_create = ('slug', 'text')
+
+            text = 'text'
+
+        MultiKeyFactory(slug='main')
+
+        with self.assertNumQueries(2):
+            objs = MultiKeyFactory.create_batch(3, slug=factory.Iterator(['main', 'alt']))
+        self.assertEqual(objs[0], objs[2])
+        self.assertEqual(2, models.MultifieldModel.objects.count())
+
+    def test_fallback(self):
+        objs = StandardFactoryWithPKField.create_batch(3)
+        self.assertEqual(3, len(set(obj.pk for obj in objs)))
+
+    def test_custom_create(self):
+        calls = []
+
+        class CustomMultifieldModelFactory(MultifieldModelFactory):
+            @classmethod
+            def _create(cls, model_class, *args, **kwargs):
+                calls.append(kwargs['slug'])
+                return super(CustomMultifieldModelFactory, cls)._create(model_class, *args, **kwargs)
+
+        objs = CustomMultifieldModelFactory.create_batch(3, slug=factory.Iterator(['main', 'alt']))
+        self.assertEqual(['main', 'alt', 'main'], calls)
+        self.assertEqual(objs[0], objs[2])
+        self.assertEqual(2, models.MultifieldModel.objects.count())
+
+
+class DjangoBulkCreateTests(django_test.TestCase):
+    def test_create_batch(self):
+        class BulkStandardFactory(StandardFactory):
+            class Meta:
+                django_bulk_create = True
+
+        with self.assertNumQueries(1):
+            objs = BulkStandardFactory.create_batch(5)
+
+        self.assertEqual(5, models.StandardModel.objects.count())
+        self.assertEqual(5, len(set(obj.pk for obj in objs)))
+        self.assertEqual(
+            sorted(obj.foo for obj in objs),
+            sorted(models.StandardModel.objects.values_list('foo', flat=True)),
+        )
+
+    def test_batch_size(self):
+        class BulkStandardFactory(StandardFactory):
+            class Meta:
+                django_bulk_create = True
+                django_bulk_create_batch_size = 2
+
+        with self.assertNumQueries(3):
+            BulkStandardFactory.create_batch(5)
+        self.assertEqual(5, models.StandardModel.objects.count())
+
+    def test_single_create(self):
+        class BulkStandardFactory(StandardFactory):
+            class Meta:
+                django_bulk_create = True
+
+        obj = BulkStandardFactory()
+        self.assertIsNotNone(obj.pk)
+
+    def test_postgeneration(self):
+        class BulkStandardFactory(StandardFactory):
+            class Meta:
+                django_bulk_create = True
+
+            @factory.post_generation
+            def rename(obj, create, extracted, **kwargs):
+                obj.foo = 'renamed%d' % obj.pk
+
+        # One INSERT, one UPDATE for the whole batch
+        with self.assertNumQueries(2):
+            objs = BulkStandardFactory.create_batch(3)
+        self.assertEqual(
+            sorted('renamed%d' % obj.pk for obj in objs),
+            sorted(models.StandardModel.objects.values_list('foo', flat=True)),
+        )
+
+    def test_custom_after_postgeneration(self):
+        saved = []
+
+        class BulkStandardFactory(StandardFactory):
+            class Meta:
+                django_bulk_create = True
+
+            @factory.post_generation
+            def rename(obj, create, extracted, **kwargs):
+                obj.foo = 'renamed'
+
+            @classmethod
+            def _after_postgeneration(cls, instance, create, results=None):
+                saved.append(instance)
+                instance.save()
+
+        objs = BulkStandardFactory.create_batch(3)
+        self.assertEqual(objs, saved)
+        self.assertEqual(['renamed'] * 3, list(models.StandardModel.objects.values_list('foo', flat=True)))
+
+
+class CachedMultifieldModelFactory(MultifieldModelFactory):
+    class Meta:
+        django_get_or_create_cache = True
+
+
+class DjangoGetOrCreateCacheTests(django_test.TestCase):
+    def setUp(self):
+        super(DjangoGetOrCreateCacheTests, self).setUp()
+        factory.django.clear_get_or_create_cache()
+
+    def test_cache_hit(self):
+        obj1 = CachedMultifieldModelFactory(slug='slug1')
+
+        with self.assertNumQueries(0):
+            obj2 = CachedMultifieldModelFactory(slug='slug1')
+        self.assertIs(obj1, obj2)
+
+        obj3 = CachedMultifieldModelFactory(slug='slug2')
+        self.assertNotEqual(obj1, obj3)
+        self.assertEqual(2, models.MultifieldModel.objects.count())
+
+    def test_disabled(self):
+        obj1 = MultifieldModelFactory(slug='slug1')
+        with self.assertNumQueries(1):
+            obj2 = MultifieldModelFactory(slug='slug1')
+        self.assertEqual(obj1, obj2)
+        self.assertIsNot(obj1, obj2)
+
+    def test_batch(self):
+        obj = CachedMultifieldModelFactory(slug='main')
+
+        with self.assertNumQueries(2):
+            objs = CachedMultifieldModelFactory.create_batch(4, slug=factory.Iterator(['main', 'alt']))
+        self.assertIs(obj, objs[0])
+        self.assertIs(objs[1], objs[3])
+
+        with self.assertNumQueries(0):
+            self.assertIs(objs[1], CachedMultifieldModelFactory(slug='alt'))
+
+    def test_rollback(self):
+        with self.assertRaises(RuntimeError):
+            with transaction.atomic():
+                CachedMultifieldModelFactory(slug='slug1')
+                with self.assertNumQueries(0):
+                    CachedMultifieldModelFactory(slug='slug1')
+                raise RuntimeError()
+
+        self.assertEqual(0, models.MultifieldModel.objects.count())
+        obj = CachedMultifieldModelFactory(slug='slug1')
+        self.assertEqual(1, models.MultifieldModel.objects.count())
+        self.assertEqual(obj, models.MultifieldModel.objects.get())
+
+    def test_savepoint_commit(self):
+        with transaction.atomic():
+            obj = CachedMultifieldModelFactory(slug='slug1')
+
+        with self.assertNumQueries(0):
+            self.assertIs(obj, CachedMultifieldModelFactory(slug='slug1'))
+
+    def test_clear(self):
+        CachedMultifieldModelFactory(slug='slug1')
+        factory.django.clear_get_or_create_cache()
+        with self.assertNumQueries(1):
+            CachedMultifieldModelFactory(slug='slug1')
+
+
+class DjangoGetOrCreateCacheTransactionTests(django_test.TransactionTestCase):
+    def setUp(self):
+        super(DjangoGetOrCreateCacheTransactionTests, self).setUp()
+        factory.django.clear_get_or_create_cache()
+
+    def test_autocommit(self):
+        CachedMultifieldModelFactory(slug='slug1')
+        models.MultifieldModel.objects.all().delete()
+
+        obj = CachedMultifieldModelFactory(slug='slug1')
+        self.assertEqual(obj, models.MultifieldModel.objects.get())
+
+    def test_commit(self):
+        with transaction.atomic():
+            obj = CachedMultifieldModelFactory(slug='slug1')
+            with self.assertNumQueries(0):
+                self.assertIs(obj, CachedMultifieldModelFactory(slug='slug1'))
+
+        models.MultifieldModel.objects.all().delete()
+        obj = CachedMultifieldModelFactory(slug='slug1')
+        self.assertEqual(obj, models.MultifieldModel.objects.get())
+
+
 class DjangoPkForceTestCase(django_test.TestCase):
     def setUp(self):
         super(DjangoPkForceTestCase, self).setUp()
@@ -773,6 +1004,59 @@ class PreventSignalsTestCase(unittest.TestCase):
 
         self.assertSignalsReactivated()
 
+    def test_class_decorator_batch(self):
+        @factory.django.mute_signals(signals.pre_save, signals.post_save)
+        class WithSignalsDecoratedFactory(factory.django.DjangoModelFactory):
+            class Meta:
+                model = models.WithSignals
+
+        WithSignalsDecoratedFactory.create_batch(2)
+
+        self.assertEqual(self.handlers.pre_init.call_count, 2)
+        self.assertFalse(self.handlers.pre_save.called)
+        self.assertFalse(self.handlers.post_save.called)
+
+        self.assertSignalsReactivated()
+
+    @unittest.skipIf(is_python2, "acreate() requires Python 3.5+")
+    def test_class_decorator_async(self):
+        import asyncio
+
+        @factory.django.mute_signals(signals.pre_init)
+        class WithSignalsDecoratedFactory(factory.django.DjangoModelFactory):
+            class Meta:
+                model = models.WithSignals
+
+            @classmethod
+            def _create(cls, model_class, *args, **kwargs):
+                # Only instantiate, from the executor's thread.
+                return model_class(*args, **kwargs)
+
+        loop = asyncio.new_event_loop()
+        self.addCleanup(loop.close)
+        loop.run_until_complete(WithSignalsDecoratedFactory.acreate())
+        loop.run_until_complete(WithSignalsDecoratedFactory.acreate_batch(2))
+        self.assertFalse(self.handlers.pre_init.called)
+
+        models.WithSignals()
+        self.assertEqual(1, self.handlers.pre_init.call_count)
+
+    def test_class_decorator_iter(self):
+        @factory.django.mute_signals(signals.pre_save, signals.post_save)
+        class WithSignalsDecoratedFactory(factory.django.DjangoModelFactory):
+            class Meta:
+                model = models.WithSignals
+
+        objs = WithSignalsDecoratedFactory.iter_create(2)
+        next(objs)
+
+        # Signals are only muted while generating objects
+        self.assertSignalsReactivated()
+
+        next(objs)
+        self.assertEqual(self.handlers.pre_init.call_count, 3)
+        self.assertEqual(self.handlers.pre_save.call_count, 1)
+
     def test_class_decorator_with_subfactory(self):
         @factory.django.mute_signals(signals.pre_save, signals.post_save)
         class WithSignalsDecoratedFactory(factory.django.DjangoModelFactory):
@@ -2,6 +2,8 @@
 # Copyright: See the LICENSE file.
 
 import random
+import subprocess
+import sys
 import unittest
 
 import faker.providers
@@ -18,13 +20,27 @@ class MockFaker(object):
         return self.expected[provider]
 
 
+class CountingFaker(MockFaker):
+    """Generates '<provider><n>', with n increasing for each call."""
+    def __init__(self):
+        super(CountingFaker, self).__init__({})
+        self.calls = []
+
+    def format(self, provider, **kwargs):
+        self.calls.append((provider, kwargs))
+        return '%s%d' % (provider, len(self.calls) - 1)
+
+
 class FakerTests(unittest.TestCase):
     def setUp(self):
         self._real_fakers = factory.Faker._FAKER_REGISTRY
+        self._real_pools = factory.Faker._POOL_REGISTRY
         factory.Faker._FAKER_REGISTRY = {}
+        factory.Faker._POOL_REGISTRY = {}
 
     def tearDown(self):
         factory.Faker._FAKER_REGISTRY = self._real_fakers
+        factory.Faker._POOL_REGISTRY = self._real_pools
 
     def _setup_mock_faker(self, locale=None, **definitions):
         if locale is None:
@@ -115,3 +131,76 @@ class FakerTests(unittest.TestCase):
         face = FaceFactory()
         self.assertEqual(":)", face.smiley)
         self.assertEqual("(:", face.french_smiley)
+
+    def test_pool(self):
+        fake = factory.Faker._FAKER_REGISTRY[factory.Faker._DEFAULT_LOCALE] = CountingFaker()
+        faker_field = factory.Faker('name', pool=3)
+
+        values = [faker_field.generate({}) for _i in range(7)]
+        self.assertEqual(['name0', 'name1', 'name2', 'name0', 'name1', 'name2', 'name0'], values)
+        self.assertEqual(3, len(fake.calls))
+
+    def test_pool_shared(self):
+        fake = factory.Faker._FAKER_REGISTRY[factory.Faker._DEFAULT_LOCALE] = CountingFaker()
+        fr_fake = factory.Faker._FAKER_REGISTRY['fr_FR'] = CountingFaker()
+        field1 = factory.Faker('name', pool=2)
+        field2 = factory.Faker('name', pool=2)
+        field3 = factory.Faker('name', pool=2, max_chars=10)
+        field4 = factory.Faker('name', locale='fr_FR', pool=2)
+
+        self.assertEqual(['name0', 'name1'], [field1.generate({}), field2.generate({})])
+        self.assertEqual('name0', field1.generate({}))
+        self.assertEqual('name2', field3.generate({}))
+        self.assertEqual('name3', field2.generate({'max_chars': 10}))
+        self.assertEqual('name2', field3.generate({}))
+        self.assertEqual('name0', field4.generate({}))
+        self.assertEqual(4, len(fake.calls))
+        self.assertEqual(1, len(fr_fake.calls))
+
+    def test_pool_unhashable(self):
+        fake = factory.Faker._FAKER_REGISTRY[factory.Faker._DEFAULT_LOCALE] = CountingFaker()
+        faker_field = factory.Faker('words', pool=2, ext_word_list=['a', 'b'])
+
+        values = [faker_field.generate({}) for _i in range(3)]
+        self.assertEqual(['words0', 'words1', 'words2'], values)
+        self.assertEqual(3, len(fake.calls))
+
+    def test_pool_shuffle(self):
+        factory.Faker._FAKER_REGISTRY[factory.Faker._DEFAULT_LOCALE] = CountingFaker()
+        faker_field = factory.Faker('name', pool=10, pool_shuffle=True)
+
+        first = [faker_field.generate({}) for _i in range(10)]
+        second = [faker_field.generate({}) for _i in range(10)]
+        self.assertEqual(['name%d' % i for i in range(10)], first)
+        self.assertEqual(sorted(first), sorted(second))
+        self.assertNotEqual(first, second)
+
+    def test_pool_reseed(self):
+        fake = factory.Faker._FAKER_REGISTRY[factory.Faker._DEFAULT_LOCALE] = CountingFaker()
+        faker_field = factory.Faker('name', pool=1)
+
+        self.assertEqual('name0', faker_field.generate({}))
+        self.assertEqual('name0', faker_field.generate({}))
+        factory.random.reseed_random(42)
+        self.assertEqual('name1', faker_field.generate({}))
+        self.assertEqual(2, len(fake.calls))
+
+    def test_reseed(self):
+        fake = factory.Faker._FAKER_REGISTRY['en_US'] = MockFaker({})
+        factory.random.reseed_random(42)
+        state = fake.random.getstate()
+        fake.random.random()
+
+        factory.random.reseed_random(42)
+        self.assertEqual(state, fake.random.getstate())
+
+    def test_lazy_import(self):
+        output = subprocess.check_output([
+            sys.executable, '-c',
+            "import sys, factory; "
+            "factory.random.reseed_random(42); "
+            "print('faker' in sys.modules); "
+            "factory.Faker('name').generate({}); "
+            "print('faker' in sys.modules)",
+        ])
+        self.assertEqual(['False', 'True'], output.decode().split())
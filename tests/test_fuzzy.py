@@ -6,6 +6,7 @@ import datetime
 import decimal
 import warnings
 
+import factory
 from factory import compat
 from factory import fuzzy
 from factory import random
@@ -547,3 +548,88 @@ class FuzzyRandomTestCase(unittest.TestCase):
         random.set_random_state(state)
         value2 = utils.evaluate_declaration(fuzz)
         self.assertEqual(value, value2)
+
+
+class FuzzyBatchTestCase(unittest.TestCase):
+    def check_batches(self, fuzz, check):
+        """Check fuzz_batch() results, with and without numpy."""
+        for numpy in [fuzzy._get_numpy(), None]:
+            with mock.patch('factory.fuzzy._get_numpy', lambda: numpy):
+                values = fuzz.fuzz_batch(50)
+                self.assertEqual(50, len(values))
+                for value in values:
+                    check(value)
+                self.assertEqual([], fuzz.fuzz_batch(0))
+
+    def test_text(self):
+        fuzz = fuzzy.FuzzyText(prefix='pre', suffix='post', chars='abc', length=5)
+
+        def check(value):
+            self.assertEqual('pre', value[:3])
+            self.assertEqual('post', value[-4:])
+            self.assertEqual(3 + 5 + 4, len(value))
+            self.assertTrue(set(value[3:-4]) <= set('abc'))
+
+        self.check_batches(fuzz, check)
+        self.assertGreater(len(set(fuzz.fuzz_batch(20))), 1)
+
+    def test_integer(self):
+        fuzz = fuzzy.FuzzyInteger(2, 20, step=3)
+        self.check_batches(fuzz, lambda value: self.assertIn(value, [2, 5, 8, 11, 14, 17, 20]))
+
+    def test_integer_huge(self):
+        fuzz = fuzzy.FuzzyInteger(0, 2 ** 100)
+        self.check_batches(fuzz, lambda value: self.assertTrue(0 <= value <= 2 ** 100))
+
+    def test_float(self):
+        fuzz = fuzzy.FuzzyFloat(-1.5, 1.5)
+        self.check_batches(fuzz, lambda value: self.assertTrue(-1.5 <= value <= 1.5))
+
+    def test_choice(self):
+        fuzz = fuzzy.FuzzyChoice(x for x in [1, 2, 3])
+        self.check_batches(fuzz, lambda value: self.assertIn(value, [1, 2, 3]))
+
+    def test_empty_choice(self):
+        fuzz = fuzzy.FuzzyChoice([])
+        self.assertRaises(IndexError, fuzz.fuzz_batch, 2)
+
+    def test_build_batch(self):
+        fuzz = fuzzy.FuzzyInteger(0, 10)
+
+        class FuzzyFactory(factory.DictFactory):
+            value = fuzz
+
+        with mock.patch.object(fuzz, 'fuzz_batch', wraps=fuzz.fuzz_batch) as fuzz_batch:
+            with mock.patch.object(fuzz, 'fuzz', wraps=fuzz.fuzz) as fuzz_single:
+                objs = FuzzyFactory.build_batch(4)
+                list(FuzzyFactory.iter_build(5, chunk_size=3))
+                FuzzyFactory.build()
+
+        self.assertEqual(4, len(objs))
+        self.assertTrue(all(0 <= obj['value'] <= 10 for obj in objs))
+        self.assertEqual([mock.call(4), mock.call(3), mock.call(2)], fuzz_batch.call_args_list)
+        fuzz_single.assert_called_once_with()
+
+    def test_custom_fuzz(self):
+        class EvenInteger(fuzzy.FuzzyInteger):
+            def fuzz(self):
+                return 2 * super(EvenInteger, self).fuzz()
+
+        class FuzzyFactory(factory.DictFactory):
+            value = EvenInteger(0, 10)
+
+        objs = FuzzyFactory.build_batch(20)
+        self.assertTrue(all(obj['value'] % 2 == 0 for obj in objs))
+        self.assertTrue(all(0 <= obj['value'] <= 20 for obj in objs))
+
+    def test_seeding(self):
+        class FuzzyFactory(factory.DictFactory):
+            value = fuzzy.FuzzyInteger(1, 1000)
+            text = fuzzy.FuzzyText()
+
+        random.reseed_random(42)
+        objs = FuzzyFactory.build_batch(10)
+
+        random.reseed_random(42)
+        objs2 = FuzzyFactory.build_batch(10)
+        self.assertEqual(objs, objs2)
@@ -2,10 +2,15 @@
 # Copyright: See the LICENSE file.
 
 import logging
+import os
+import pstats
+import tempfile
 
+import factory
 from factory import helpers
+from factory import profiling
 
-from .compat import io, unittest
+from .compat import io, mock, unittest
 
 
 class DebugTest(unittest.TestCase):
@@ -55,3 +60,124 @@ class DebugTest(unittest.TestCase):
         self.assertEqual("", stream1.getvalue())
         self.assertEqual("Test2\n", stream2.getvalue())
 
+    def test_no_formatting_without_debug(self):
+        class LazyFactory(factory.DictFactory):
+            one = factory.LazyFunction(int)
+
+        with mock.patch('factory.utils.log_repr') as log_repr:
+            LazyFactory()
+            self.assertFalse(log_repr.called)
+
+            with helpers.debug(stream=io.StringIO()):
+                LazyFactory()
+            self.assertTrue(log_repr.called)
+
+
+class ProfiledObject(object):
+    def __init__(self, **kwargs):
+        for key, value in kwargs.items():
+            setattr(self, key, value)
+
+
+class ProfileTest(unittest.TestCase):
+    """Tests for the 'factory.profile()' helper."""
+
+    def setUp(self):
+        class LeafFactory(factory.Factory):
+            class Meta:
+                model = ProfiledObject
+
+            one = factory.Sequence(lambda n: n)
+
+        class RootFactory(factory.Factory):
+            class Meta:
+                model = ProfiledObject
+
+            leaf = factory.SubFactory(LeafFactory)
+            two = factory.LazyAttribute(lambda o: o.leaf.one)
+
+            @factory.post_generation
+            def three(obj, create, extracted, **kwargs):
+                pass
+
+        self.LeafFactory = LeafFactory
+        self.RootFactory = RootFactory
+
+    def test_entries(self):
+        with helpers.profile() as profiler:
+            self.RootFactory()
+            self.RootFactory.build_batch(3)
+
+        self.assertIsNone(profiling.current)
+        calls = {key: entry.calls for key, entry in profiler.entries.items()}
+        self.assertEqual({
+            (self.RootFactory, 'generate', 'create'): 1,
+            (self.RootFactory, 'generate', 'build_batch'): 1,
+            (self.RootFactory, 'attribute', 'leaf'): 4,
+            (self.RootFactory, 'attribute', 'two'): 4,
+            (self.RootFactory, 'instantiate', 'create'): 1,
+            (self.RootFactory, 'instantiate', 'build_batch'): 1,
+            (self.RootFactory, 'postgeneration', 'three'): 4,
+            (self.LeafFactory, 'generate', 'create'): 1,
+            (self.LeafFactory, 'generate', 'build'): 3,
+            (self.LeafFactory, 'attribute', 'one'): 4,
+            (self.LeafFactory, 'instantiate', 'create'): 1,
+            (self.LeafFactory, 'instantiate', 'build'): 3,
+        }, calls)
+
+        leaf = profiler.entries[(self.RootFactory, 'attribute', 'leaf')]
+        self.assertEqual(
+            {(self.RootFactory, 'generate', 'create'), (self.RootFactory, 'generate', 'build_batch')},
+            set(leaf.callers),
+        )
+        self.assertGreaterEqual(leaf.cumulative_time, leaf.total_time)
+
+    def test_inactive(self):
+        with helpers.profile() as profiler:
+            pass
+        self.RootFactory()
+        self.assertEqual({}, profiler.entries)
+
+    def test_report(self):
+        stream = io.StringIO()
+        with helpers.profile(stream=stream, sort='calls', limit=2):
+            self.RootFactory.build_batch(2)
+
+        lines = stream.getvalue().splitlines()
+        self.assertEqual(3, len(lines))
+        self.assertIn('cumtime', lines[0])
+        self.assertEqual('2', lines[1].split()[0])
+
+    def test_report_unknown_sort(self):
+        with helpers.profile() as profiler:
+            self.RootFactory()
+        with self.assertRaises(ValueError):
+            profiler.report(sort='foo')
+
+    def test_dump(self):
+        handle, path = tempfile.mkstemp()
+        os.close(handle)
+        self.addCleanup(os.remove, path)
+
+        with helpers.profile(dump=path):
+            self.RootFactory()
+
+        stats = pstats.Stats(path).stats
+        self.assertIn(('tests.test_helpers.RootFactory', 0, 'attribute leaf'), stats)
+        leaf = stats[('tests.test_helpers.LeafFactory', 0, 'generate create')]
+        primitive_calls, calls, _total, _cumulative, callers = leaf
+        self.assertEqual((1, 1), (primitive_calls, calls))
+        self.assertEqual([('tests.test_helpers.RootFactory', 0, 'attribute leaf')], list(callers))
+
+    def test_pstats_callers(self):
+        profiler = profiling.Profiler()
+        entry = profiling.ProfileEntry()
+        entry.add(elapsed=2.0, own=1.0, primitive=True)
+        caller_entry = entry.callers[(self.RootFactory, 'attribute', 'leaf')] = profiling.ProfileEntry()
+        caller_entry.add(elapsed=2.0, own=1.0, primitive=True)
+        caller_entry.add(elapsed=1.0, own=0.5, primitive=False)
+        profiler.entries[(self.LeafFactory, 'generate', 'create')] = entry
+
+        callers = profiler.get_pstats()[('tests.test_helpers.LeafFactory', 0, 'generate create')][4]
+        # Callers list (calls, primitive calls, total time, cumulative time).
+        self.assertEqual((2, 1, 1.5, 2.0), callers[('tests.test_helpers.RootFactory', 0, 'attribute leaf')])
@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+# Copyright: See the LICENSE file.
+
+import collections
+
+import factory
+from factory import hooks
+
+from .compat import unittest
+
+
+class HookedObject(object):
+    def __init__(self, **kwargs):
+        for key, value in kwargs.items():
+            setattr(self, key, value)
+
+
+class LeafFactory(factory.Factory):
+    class Meta:
+        model = HookedObject
+
+    one = factory.Sequence(lambda n: n)
+
+
+class RootFactory(factory.Factory):
+    class Meta:
+        model = HookedObject
+
+    leaf = factory.SubFactory(LeafFactory)
+
+
+class Recorder(object):
+    """Record received events as (event, factory, kwargs) tuples."""
+
+    def __init__(self):
+        self.events = []
+
+    def __call__(self, event, factory, **kwargs):
+        self.events.append((event, factory, kwargs))
+
+    def connect(self, test_case, *events):
+        for event in events or hooks.EVENTS:
+            hooks.connect(event, self)
+            test_case.addCleanup(hooks.disconnect, event, self)
+
+
+class HooksTestCase(unittest.TestCase):
+    def setUp(self):
+        LeafFactory.reset_sequence()
+        RootFactory.reset_sequence()
+
+    def test_build(self):
+        recorder = Recorder()
+        recorder.connect(self)
+
+        obj = RootFactory.build()
+
+        self.assertEqual([
+            ('pre_resolve', RootFactory),
+            ('pre_resolve', LeafFactory),
+            ('post_instantiate', LeafFactory),
+            ('post_postgeneration', LeafFactory),
+            ('post_instantiate', RootFactory),
+            ('post_postgeneration', RootFactory),
+        ], [(event, factory_class) for event, factory_class, _kwargs in recorder.events])
+
+        _event, _factory, kwargs = recorder.events[-1]
+        self.assertEqual('build', kwargs['strategy'])
+        self.assertEqual(0, kwargs['sequence'])
+        self.assertIs(obj, kwargs['instance'])
+        self.assertGreaterEqual(kwargs['elapsed'], 0)
+
+    def test_batch(self):
+        recorder = Recorder()
+        recorder.connect(self)
+
+        objs = LeafFactory.create_batch(2)
+
+        self.assertEqual([
+            ('batch_start', {'strategy': 'create', 'size': 2}),
+            ('pre_resolve', {'strategy': 'create', 'sequence': 0}),
+            ('pre_resolve', {'strategy': 'create', 'sequence': 1}),
+            ('post_instantiate', {'strategy': 'create', 'sequence': 0, 'instance': objs[0]}),
+            ('post_instantiate', {'strategy': 'create', 'sequence': 1, 'instance': objs[1]}),
+            ('post_postgeneration', {'strategy': 'create', 'sequence': 0, 'instance': objs[0]}),
+            ('post_postgeneration', {'strategy': 'create', 'sequence': 1, 'instance': objs[1]}),
+            ('batch_end', {'strategy': 'create', 'size': 2, 'instances': objs}),
+        ], [
+            (event, {key: value for key, value in kwargs.items() if key != 'elapsed'})
+            for event, _factory, kwargs in recorder.events
+        ])
+
+    def test_counters(self):
+        """Hooks can feed metrics counters."""
+        counters = collections.Counter()
+
+        def count(event, factory, strategy, **kwargs):
+            counters['%s.%s.%s' % (factory.__name__, strategy, event)] += 1
+
+        with hooks.connected('post_postgeneration', count):
+            RootFactory.create()
+            LeafFactory.build_batch(3)
+
+        self.assertEqual({
+            'RootFactory.create.post_postgeneration': 1,
+            'LeafFactory.create.post_postgeneration': 1,
+            'LeafFactory.build.post_postgeneration': 3,
+        }, dict(counters))
+
+    def test_disconnect(self):
+        recorder = Recorder()
+        with hooks.connected('pre_resolve', recorder):
+            self.assertTrue(hooks.enabled)
+            LeafFactory()
+
+        self.assertFalse(hooks.enabled)
+        LeafFactory()
+        self.assertEqual(1, len(recorder.events))
+
+    def test_unknown_event(self):
+        with self.assertRaises(ValueError):
+            hooks.connect('pre_build', Recorder())
+        self.assertFalse(hooks.enabled)
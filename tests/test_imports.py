@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+# Copyright: See the LICENSE file.
+
+"""Tests for the import cost of factory_boy."""
+
+import subprocess
+import sys
+
+from .compat import unittest
+
+
+def loaded_modules(code):
+    """Run some code in a fresh interpreter, and list the top-level modules it loaded."""
+    output = subprocess.check_output([
+        sys.executable, '-c',
+        "import sys; %s; print(' '.join(sorted(set(m.split('.')[0] for m in sys.modules))))" % code,
+    ])
+    return output.decode().split()
+
+
+@unittest.skipIf(sys.version_info < (3, 7), "Lazy loading requires module-level __getattr__")
+class LazyImportTestCase(unittest.TestCase):
+    HEAVY_MODULES = ['django', 'faker', 'mongoengine', 'numpy', 'sqlalchemy']
+
+    def test_import_factory(self):
+        modules = loaded_modules("import factory")
+        self.assertIn('factory', modules)
+        for module in self.HEAVY_MODULES:
+            self.assertNotIn(module, modules)
+
+    def test_import_fuzzy(self):
+        modules = loaded_modules("import factory.fuzzy")
+        self.assertNotIn('numpy', modules)
+
+    def test_lazy_attributes(self):
+        modules = loaded_modules("import factory; factory.django; factory.DjangoModelFactory")
+        self.assertIn('django', modules)
+        self.assertNotIn('faker', modules)
+
+    def test_unknown_attribute(self):
+        import factory
+        with self.assertRaises(AttributeError):
+            factory.not_a_module
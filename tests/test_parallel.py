@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+# Copyright: See the LICENSE file.
+
+
+import factory
+from factory import errors
+from factory import fuzzy
+from factory import parallel
+from factory import random
+
+from .compat import unittest
+
+
+class ParallelObject(object):
+    def __init__(self, n, value, text):
+        self.n = n
+        self.value = value
+        self.text = text
+
+
+class ParallelObjectFactory(factory.Factory):
+    class Meta:
+        model = ParallelObject
+
+    n = factory.Sequence(lambda n: n)
+    value = fuzzy.FuzzyInteger(0, 1000000)
+    text = factory.Faker('word')
+
+
+class NestedObjectFactory(factory.Factory):
+    class Meta:
+        model = ParallelObject
+
+    n = factory.Sequence(lambda n: n)
+    value = factory.SubFactory(ParallelObjectFactory)
+    text = factory.Sequence(lambda n: 'nested%d' % n)
+
+
+class TagFactory(factory.DictFactory):
+    code = factory.Sequence(lambda n: 'tag%d' % n)
+
+
+class TaggedObjectFactory(factory.Factory):
+    class Meta:
+        model = ParallelObject
+
+    n = factory.Sequence(lambda n: n)
+    value = factory.SubFactory(TagFactory)
+    text = factory.SubFactory(TagFactory)
+
+
+class ChildObjectFactory(ParallelObjectFactory):
+    value = factory.SubFactory(ParallelObjectFactory)
+    text = factory.Dict({'n': factory.Sequence(lambda n: n)})
+
+
+def as_tuples(objs):
+    return [(obj.n, obj.value, obj.text) for obj in objs]
+
+
+class ParallelBatchTestCase(unittest.TestCase):
+    def setUp(self):
+        super(ParallelBatchTestCase, self).setUp()
+        ParallelObjectFactory.reset_sequence()
+
+    def test_build(self):
+        objs = parallel.build_batch(ParallelObjectFactory, 10, workers=2, chunk_size=3)
+        self.assertEqual(10, len(objs))
+        self.assertEqual(list(range(10)), [obj.n for obj in objs])
+        self.assertTrue(all(isinstance(obj, ParallelObject) for obj in objs))
+
+        # The sequence was consumed.
+        self.assertEqual(10, ParallelObjectFactory.build().n)
+
+    def test_stub(self):
+        objs = parallel.stub_batch(ParallelObjectFactory, 4, workers=2, chunk_size=3, text='foo')
+        self.assertEqual([0, 1, 2, 3], [obj.n for obj in objs])
+        self.assertEqual(['foo'] * 4, [obj.text for obj in objs])
+        self.assertFalse(any(isinstance(obj, ParallelObject) for obj in objs))
+
+    def test_reproducible(self):
+        random.reseed_random(42)
+        objs1 = parallel.build_batch(ParallelObjectFactory, 12, workers=1, chunk_size=4)
+
+        ParallelObjectFactory.reset_sequence()
+        random.reseed_random(42)
+        objs2 = parallel.build_batch(ParallelObjectFactory, 12, workers=3, chunk_size=4)
+
+        self.assertEqual(as_tuples(objs1), as_tuples(objs2))
+        # Chunks don't repeat each other.
+        self.assertNotEqual([obj.value for obj in objs1[:4]], [obj.value for obj in objs1[4:8]])
+
+    def test_subfactory(self):
+        NestedObjectFactory.reset_sequence()
+        objs1 = parallel.build_batch(NestedObjectFactory, 8, workers=1, chunk_size=2)
+        self.assertEqual(list(range(8)), [obj.value.n for obj in objs1])
+
+        NestedObjectFactory.reset_sequence()
+        ParallelObjectFactory.reset_sequence()
+        objs2 = parallel.build_batch(NestedObjectFactory, 8, workers=4, chunk_size=2)
+        self.assertEqual([obj.value.n for obj in objs1], [obj.value.n for obj in objs2])
+
+        # The nested sequence was consumed as well.
+        self.assertEqual(8, ParallelObjectFactory.build().n)
+
+    def test_subfactory_used_twice(self):
+        objs = parallel.build_batch(TaggedObjectFactory, 6, workers=3, chunk_size=2)
+        codes = [obj.value['code'] for obj in objs] + [obj.text['code'] for obj in objs]
+        self.assertEqual(12, len(set(codes)))
+        # The nested sequence was consumed past every value used.
+        self.assertNotIn(TagFactory.build()['code'], codes)
+
+    def test_shared_counter(self):
+        # ChildObjectFactory shares its counter with ParallelObjectFactory.
+        objs = parallel.build_batch(ChildObjectFactory, 6, workers=3, chunk_size=2)
+        sequences = [obj.n for obj in objs] + [obj.value.n for obj in objs]
+        self.assertEqual(12, len(set(sequences)))
+        self.assertNotIn(ParallelObjectFactory.build().n, sequences)
+        # Dict declarations reuse the sequence number of their parent.
+        self.assertEqual([obj.n for obj in objs], [obj.text['n'] for obj in objs])
+
+    def test_iter_batch(self):
+        objs = parallel.iter_batch(ParallelObjectFactory, factory.BUILD_STRATEGY, 5, workers=2, chunk_size=2)
+        self.assertEqual([0, 1, 2, 3, 4], [obj.n for obj in objs])
+
+    def test_empty(self):
+        self.assertEqual([], parallel.build_batch(ParallelObjectFactory, 0))
+
+    def test_create(self):
+        with self.assertRaises(errors.UnsupportedStrategy):
+            parallel.generate_batch(ParallelObjectFactory, factory.CREATE_STRATEGY, 2)
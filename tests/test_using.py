@@ -8,6 +8,8 @@ import datetime
 import functools
 import os
 import sys
+import threading
+import time
 import warnings
 
 import factory
@@ -2293,6 +2295,87 @@ class RelatedFactoryExtractionTestCase(unittest.TestCase):
         self.assertFalse(hasattr(o, 'related'))
 
 
+
+@unittest.skipIf(is_python2, "Requires concurrent.futures")
+class PostGenerationConcurrencyTestCase(unittest.TestCase):
+    def setUp(self):
+        self.events = []
+        lock = threading.Lock()
+        events = self.events
+
+        class SlowObject(object):
+            def __init__(self, parent, name):
+                with lock:
+                    events.append(('start', name, threading.current_thread()))
+                time.sleep(0.05)
+                with lock:
+                    events.append(('end', name, threading.current_thread()))
+
+        class SlowObjectFactory(factory.Factory):
+            class Meta:
+                model = SlowObject
+
+        class ParentFactory(factory.Factory):
+            class Meta:
+                model = TestObject
+                postgeneration_concurrency = 3
+
+            first = factory.RelatedFactory(SlowObjectFactory, 'parent', name='first')
+            second = factory.RelatedFactory(SlowObjectFactory, 'parent', name='second')
+
+            @factory.post_generation
+            def barrier(obj, create, extracted, **kwargs):
+                events.append(('barrier', None, threading.current_thread()))
+
+            third = factory.RelatedFactory(SlowObjectFactory, 'parent', name='third')
+            fourth = factory.RelatedFactory(SlowObjectFactory, 'parent', name='fourth')
+
+            @classmethod
+            def _after_postgeneration(cls, instance, create, results=None):
+                instance.results = results
+
+        self.ParentFactory = ParentFactory
+
+    def test_concurrent(self):
+        obj = self.ParentFactory()
+        self.assertEqual(
+            ['barrier', 'first', 'fourth', 'second', 'third'],
+            sorted(obj.results),
+        )
+        kinds = [kind for kind, _name, _thread in self.events]
+        # Related factories overlap, but not across the barrier.
+        self.assertEqual(['start', 'start', 'end', 'end', 'barrier', 'start', 'start', 'end', 'end'], kinds)
+        self.assertEqual(
+            {'first', 'second'},
+            set(name for _kind, name, _thread in self.events[:4]),
+        )
+        self.assertGreater(len(set(thread for _kind, _name, thread in self.events)), 1)
+
+    def test_sequential(self):
+        class SequentialFactory(self.ParentFactory):
+            class Meta:
+                postgeneration_concurrency = 1
+
+        SequentialFactory()
+        self.assertEqual(
+            [
+                ('start', 'first'), ('end', 'first'),
+                ('start', 'second'), ('end', 'second'),
+                ('barrier', None),
+                ('start', 'third'), ('end', 'third'),
+                ('start', 'fourth'), ('end', 'fourth'),
+            ],
+            [(kind, name) for kind, name, _thread in self.events],
+        )
+        self.assertEqual({threading.current_thread()}, set(thread for _kind, _name, thread in self.events))
+
+    def test_invalid_concurrency(self):
+        with self.assertRaises(TypeError):
+            class InvalidFactory(factory.Factory):
+                class Meta:
+                    model = TestObject
+                    postgeneration_concurrency = 0
+
 class CircularTestCase(unittest.TestCase):
     def test_example(self):
         sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
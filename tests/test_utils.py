@@ -5,6 +5,8 @@ from __future__ import unicode_literals
 
 
 import itertools
+import threading
+import time
 
 from factory import utils
 
@@ -366,3 +368,99 @@ class ResetableIteratorTestCase(unittest.TestCase):
         self.assertEqual(3, next(iterator))
         self.assertEqual(4, next(iterator))
 
+
+    def test_materialized(self):
+        i = utils.ResetableIterator([1, 2, 3])
+        self.assertEqual((1, 2, 3), i.values)
+        self.assertIsNone(i.iterator)
+
+    def test_generator(self):
+        i = utils.ResetableIterator(n for n in [1, 2, 3])
+        iterator = iter(i)
+        self.assertEqual(1, next(iterator))
+        self.assertEqual(2, next(iterator))
+
+        i.reset()
+        self.assertEqual([1, 2, 3], list(iterator))
+
+    def test_cycle(self):
+        i = utils.ResetableIterator((n for n in [1, 2, 3]), cycle=True)
+        iterator = iter(i)
+        values = [next(iterator) for _i in range(7)]
+        self.assertEqual([1, 2, 3, 1, 2, 3, 1], values)
+        self.assertEqual([1, 2, 3], i.values)
+
+    def test_cycle_empty(self):
+        i = utils.ResetableIterator([], cycle=True)
+        self.assertEqual([], list(i))
+
+    def test_max_buffer(self):
+        i = utils.ResetableIterator(itertools.count(), max_buffer=3)
+        iterator = iter(i)
+        self.assertEqual([0, 1, 2], [next(iterator) for _i in range(3)])
+        i.reset()
+        self.assertEqual([0, 1, 2, 3, 4], [next(iterator) for _i in range(5)])
+        self.assertEqual([], i.values)
+
+        self.assertRaises(ValueError, i.reset)
+        self.assertEqual(5, next(iterator))
+
+    def test_max_buffer_cycle_exhausted(self):
+        i = utils.ResetableIterator((n for n in range(5)), max_buffer=2, cycle=True)
+        iterator = iter(i)
+        self.assertEqual([0, 1, 2, 3, 4], [next(iterator) for _i in range(5)])
+        self.assertRaises(ValueError, next, iterator)
+
+    def test_max_buffer_reiterable(self):
+        class Source(object):
+            def __iter__(self):
+                return iter([1, 2, 3])
+
+        i = utils.ResetableIterator(Source(), max_buffer=1, cycle=True)
+        iterator = iter(i)
+        self.assertEqual([1, 2, 3, 1, 2, 3, 1], [next(iterator) for _i in range(7)])
+        i.reset()
+        self.assertEqual([1, 2], [next(iterator) for _i in range(2)])
+
+
+class RunConcurrentlyTestCase(unittest.TestCase):
+    def test_results_order(self):
+        calls = [lambda i=i: i * 2 for i in range(7)]
+        self.assertEqual([0, 2, 4, 6, 8, 10, 12], utils.run_concurrently(calls, 3))
+
+    def test_sequential(self):
+        threads = []
+        calls = [lambda: threads.append(threading.current_thread()) for _i in range(3)]
+        utils.run_concurrently(calls, 1)
+        self.assertEqual([threading.current_thread()] * 3, threads)
+
+    @unittest.skipIf(utils.futures is None, "Requires concurrent.futures")
+    def test_concurrent(self):
+        lock = threading.Lock()
+        state = {'running': 0, 'max_running': 0}
+
+        def call():
+            with lock:
+                state['running'] += 1
+                state['max_running'] = max(state['max_running'], state['running'])
+            time.sleep(0.05)
+            with lock:
+                state['running'] -= 1
+
+        utils.run_concurrently([call] * 6, 3)
+        self.assertLessEqual(state['max_running'], 3)
+        self.assertGreater(state['max_running'], 1)
+
+    def test_nested(self):
+        def outer(i):
+            return sum(utils.run_concurrently([lambda: i] * 4, 4))
+
+        calls = [lambda i=i: outer(i) for i in range(utils.MAX_THREADS * 2)]
+        self.assertEqual([4 * i for i in range(utils.MAX_THREADS * 2)], utils.run_concurrently(calls, len(calls)))
+
+    def test_error(self):
+        def fail():
+            raise ValueError("Failed")
+
+        with self.assertRaises(ValueError):
+            utils.run_concurrently([lambda: 1, fail, lambda: 3], 3)